@@ -9,12 +9,26 @@
  * GET /api/luci/datalake - List sectors and stats
  * GET /api/luci/datalake?sector=plumbers_hvac - Get sector details
  *
+ * Several blocks (and header.csv) can go in one multipart request; each
+ * gets its own result in the response.
+ *
+ * Blocks can also be re-sharded by state (and SIC code or zip3) before
+ * upload (upload-datalake.py --partition-by); partition files land under
+ * partitions/ and partitions.json lists them, so /api/luci/scan reads only
+ * the partitions its filters select. The manifest records the ETag of the
+ * partitions.json it describes; plain blocks uploaded later drop that
+ * entry, and scans go back to reading every block.
+ *
  * Storage structure:
  *   datalake/usbizdata/{sector}/
  *   ├── manifest.json (index with state/city counts)
  *   ├── header.csv
- *   └── blocks/
- *       ├── block_0001.csv
+ *   ├── blocks/
+ *   │   ├── block_0001.csv
+ *   │   └── ...
+ *   ├── partitions.json (partition values, files and row counts)
+ *   └── partitions/
+ *       ├── state=TX/sic=6531/part_0001.csv
  *       └── ...
  *
  * ═══════════════════════════════════════════════════════════════════════════════
@@ -28,6 +42,13 @@ import {
   ListObjectsV2Command,
 } from "@aws-sdk/client-s3";
 import { parse } from "csv-parse/sync";
+import {
+  BodyTooLargeError,
+  decodeRequestBody,
+  InvalidEncodingError,
+  SUPPORTED_ENCODINGS,
+  UnsupportedEncodingError,
+} from "@/lib/datalake/content-encoding";
 
 const SPACES_ENDPOINT = process.env.DO_SPACES_ENDPOINT || "https://nyc3.digitaloceanspaces.com";
 const SPACES_BUCKET = process.env.SPACES_BUCKET || process.env.DO_SPACES_BUCKET || "nextier";
@@ -93,12 +114,189 @@ interface BlockManifest {
     name: string;
     records: number;
     uploadedAt: string;
+    // This block's share of indexes, taken back out when it is uploaded again
+    byState?: Record<string, number>;
+    byCity?: Record<string, number>;
   }>;
   indexes: {
     byState: Record<string, number>;
     byCity: Record<string, number>;
     bySicCode: Record<string, number>;
   };
+  partitions?: PartitionSummary;
+}
+
+interface PartitionSummary {
+  by: string[];
+  partitions: number;
+  files: number;
+  records: number;
+  uploadedAt: string;
+  // ETag of the partitions.json this summary describes; scans skip any other version
+  etag?: string;
+}
+
+/**
+ * partitions.json as written by upload-datalake.py --partition-by
+ */
+interface PartitionManifest {
+  by: string[];
+  columns: string[];
+  partitions: Array<{
+    key: string;
+    values: Record<string, string>;
+    rows: number;
+    files: Array<{ name: string; rows: number; bytes: number }>;
+  }>;
+  totals: { partitions: number; files: number; rows: number; bytes: number };
+}
+
+// "state=TX" or "state=TX/sic=6531": also the object prefix under partitions/
+const PARTITION_KEY = /^[a-z0-9]+=[A-Za-z0-9_]+(\/[a-z0-9]+=[A-Za-z0-9_]+)*$/;
+const PARTITION_FILE = /^part_\d+\.csv$/;
+
+type S3 = NonNullable<ReturnType<typeof getS3Client>>;
+
+interface StoredFile {
+  name: string;
+  path: string;
+  fileName: string;
+  records: number;
+  isHeader: boolean;
+  partition?: string;
+  success: boolean;
+  error?: string;
+}
+
+async function getObjectText(
+  client: S3,
+  key: string
+): Promise<string | undefined> {
+  const res = await client.send(
+    new GetObjectCommand({ Bucket: SPACES_BUCKET, Key: key })
+  );
+  return res.Body?.transformToString();
+}
+
+// Conditional manifest.json writes lost to a concurrent upload before giving up
+const MANIFEST_WRITE_ATTEMPTS = 8;
+
+function isWriteConflict(err: unknown): boolean {
+  const status = (err as { $metadata?: { httpStatusCode?: number } })?.$metadata?.httpStatusCode;
+  return status === 412 || status === 409;
+}
+
+/**
+ * Read-modify-write of a sector's manifest.json that is safe with several
+ * uploads in flight: the write only succeeds if the object is still the
+ * version that was read (If-Match on its ETag, If-None-Match when there was
+ * none). When another request wrote it in between, the manifest is read
+ * again and `apply` re-runs on the fresh copy, so neither request's blocks
+ * are lost.
+ */
+async function updateManifest(
+  client: S3,
+  key: string,
+  create: () => BlockManifest,
+  apply: (manifest: BlockManifest) => void
+): Promise<BlockManifest> {
+  for (let attempt = 1; ; attempt++) {
+    let etag: string | undefined;
+    let content: string | undefined;
+    try {
+      const res = await client.send(
+        new GetObjectCommand({ Bucket: SPACES_BUCKET, Key: key })
+      );
+      etag = res.ETag;
+      content = await res.Body?.transformToString();
+    } catch {
+      // No manifest yet
+    }
+    let manifest: BlockManifest;
+    try {
+      manifest = content ? JSON.parse(content) : create();
+    } catch {
+      manifest = create(); // unreadable: replaced, still conditional on its ETag
+    }
+    apply(manifest);
+
+    try {
+      await client.send(
+        new PutObjectCommand({
+          Bucket: SPACES_BUCKET,
+          Key: key,
+          Body: JSON.stringify(manifest, null, 2),
+          ContentType: "application/json",
+          ...(etag ? { IfMatch: etag } : { IfNoneMatch: "*" }),
+        })
+      );
+      return manifest;
+    } catch (err) {
+      if (attempt >= MANIFEST_WRITE_ATTEMPTS || !isWriteConflict(err)) throw err;
+    }
+  }
+}
+
+/**
+ * Add (sign 1) or remove (sign -1) a block's counts; counts that reach zero are dropped
+ */
+function mergeCounts(
+  target: Record<string, number>,
+  counts: Record<string, number> | undefined,
+  sign: 1 | -1
+) {
+  for (const [key, count] of Object.entries(counts || {})) {
+    const total = (target[key] || 0) + sign * count;
+    if (total > 0) target[key] = total;
+    else delete target[key];
+  }
+}
+
+function blockFileName(file: File): string {
+  // Extract block number from filename or generate one
+  const match = file.name.match(/block_(\d+)/i);
+  const blockNum = match ? match[1] : String(Date.now());
+  return `block_${blockNum.padStart(4, "0")}.csv`;
+}
+
+/**
+ * Record count plus state/city counts of one block
+ */
+function indexBlock(content: string, headerRow: string[]) {
+  const stateIndex: Record<string, number> = {};
+  const cityIndex: Record<string, number> = {};
+
+  // Parse block with headers
+  const records = parse(content, {
+    columns: headerRow.length > 0 ? headerRow : true,
+    skip_empty_lines: true,
+    relax_column_count: true,
+  });
+
+  // Build indexes
+  const stateCol = headerRow.find((h: string) =>
+    ["state", "State", "STATE"].includes(h)
+  );
+  const cityCol = headerRow.find((h: string) =>
+    ["city", "City", "CITY"].includes(h)
+  );
+
+  for (const row of records) {
+    if (stateCol && row[stateCol]) {
+      const state = String(row[stateCol]).toUpperCase().trim();
+      if (state.length === 2) {
+        stateIndex[state] = (stateIndex[state] || 0) + 1;
+      }
+    }
+    if (cityCol && row[cityCol] && stateCol && row[stateCol]) {
+      const city = String(row[cityCol]).toLowerCase().trim();
+      const state = String(row[stateCol]).toUpperCase().trim();
+      const key = `${city}-${state}`;
+      cityIndex[key] = (cityIndex[key] || 0) + 1;
+    }
+  }
+
+  return { recordCount: records.length, stateIndex, cityIndex };
 }
 
 /**
@@ -107,9 +305,25 @@ interface BlockManifest {
  *
  * FormData:
  *   - sector: string (required)
- *   - file: File (CSV block)
+ *   - file: File (CSV block); repeat the field to upload several blocks in
+ *     one request (upload-datalake.py --batch)
+ *   - header: File (optional, header.csv sent along with a batch)
  *   - blockNumber: number (optional, auto-detected from filename)
  *   - isHeader: boolean (optional, for header.csv)
+ *   - batch: "true" (optional, batch response shape even for one file)
+ *   - partition: string (optional, repeated once per file in the same
+ *     order): the file is a partition file (part_NNNN.csv) stored under
+ *     partitions/{partition}/ instead of blocks/
+ *   - partitionManifest: File (optional, partitions.json, sent after the
+ *     partition files; the response then carries `partitions`)
+ *
+ * A single file gets the original response shape. With batch, several
+ * files or a header part, `uploaded` is an array with one entry per file, in the
+ * order sent, each with its own success/error and record count; the
+ * manifest is read and written once per request.
+ *
+ * The multipart body may be sent with Content-Encoding: gzip
+ * (upload-datalake.py --compress gzip).
  */
 export async function POST(req: NextRequest) {
   try {
@@ -121,10 +335,41 @@ export async function POST(req: NextRequest) {
       );
     }
 
-    const formData = await req.formData();
+    let formData: FormData;
+    try {
+      formData = await (await decodeRequestBody(req)).formData();
+    } catch (err) {
+      if (err instanceof UnsupportedEncodingError) {
+        return NextResponse.json(
+          { error: err.message, supportedEncodings: SUPPORTED_ENCODINGS },
+          { status: 415 }
+        );
+      }
+      if (err instanceof BodyTooLargeError) {
+        return NextResponse.json({ error: err.message }, { status: 413 });
+      }
+      if (err instanceof InvalidEncodingError) {
+        return NextResponse.json({ error: err.message }, { status: 400 });
+      }
+      throw err;
+    }
     const sectorId = formData.get("sector") as string;
-    const file = formData.get("file") as File;
+    const files = formData
+      .getAll("file")
+      .filter((f): f is File => typeof f !== "string");
+    const headerPart = formData.get("header");
+    const headerFile = headerPart && typeof headerPart !== "string" ? headerPart : null;
     const isHeader = formData.get("isHeader") === "true";
+    const partitionKeys = formData.getAll("partition").map(String);
+    const manifestPart = formData.get("partitionManifest");
+    const partitionManifestFile =
+      manifestPart && typeof manifestPart !== "string" ? manifestPart : null;
+    const batch =
+      formData.get("batch") === "true" ||
+      files.length > 1 ||
+      headerFile !== null ||
+      partitionKeys.length > 0 ||
+      partitionManifestFile !== null;
 
     if (!sectorId || !SECTORS[sectorId as SectorId]) {
       return NextResponse.json(
@@ -136,124 +381,212 @@ export async function POST(req: NextRequest) {
       );
     }
 
-    if (!file) {
+    if (files.length === 0 && !headerFile && !partitionManifestFile) {
       return NextResponse.json({ error: "No file provided" }, { status: 400 });
     }
 
+    if (
+      partitionKeys.length > 0 &&
+      (partitionKeys.length !== files.length ||
+        !partitionKeys.every((key) => PARTITION_KEY.test(key)))
+    ) {
+      return NextResponse.json(
+        {
+          error:
+            "partition must be sent once per file, as dim=value[/dim=value] (e.g. state=TX/sic=6531)",
+        },
+        { status: 400 }
+      );
+    }
+
     const sector = SECTORS[sectorId as SectorId];
     const basePath = `datalake/usbizdata/${sectorId}`;
-    const content = await file.text();
     const now = new Date().toISOString();
 
-    // Determine file path
-    let filePath: string;
-    let fileName: string;
-
-    if (isHeader) {
-      filePath = `${basePath}/header.csv`;
-      fileName = "header.csv";
-    } else {
-      // Extract block number from filename or generate one
-      const match = file.name.match(/block_(\d+)/i);
-      const blockNum = match ? match[1] : String(Date.now());
-      fileName = `block_${blockNum.padStart(4, "0")}.csv`;
-      filePath = `${basePath}/blocks/${fileName}`;
-    }
+    const uploaded: StoredFile[] = [];
+    const stateIndex: Record<string, number> = {};
+    const cityIndex: Record<string, number> = {};
+    let columns: string[] = [];
 
-    // Upload file
-    await client.send(
-      new PutObjectCommand({
-        Bucket: SPACES_BUCKET,
-        Key: filePath,
-        Body: content,
-        ContentType: "text/csv",
-      })
-    );
+    // Header: a header part, or a lone file flagged isHeader
+    const headerUpload = headerFile || (isHeader && !batch ? files[0] : null);
+    if (headerUpload) {
+      const filePath = `${basePath}/header.csv`;
+      const content = await headerUpload.text();
+      await client.send(
+        new PutObjectCommand({
+          Bucket: SPACES_BUCKET,
+          Key: filePath,
+          Body: content,
+          ContentType: "text/csv",
+        })
+      );
+      // Header file - extract columns
+      const parsed = parse(content, { columns: false });
+      columns = parsed[0] || [];
+      uploaded.push({
+        name: headerUpload.name,
+        path: filePath,
+        fileName: "header.csv",
+        records: 0,
+        isHeader: true,
+        success: true,
+      });
+    }
 
-    // Parse CSV to get stats (for non-header files)
-    let recordCount = 0;
-    let stateIndex: Record<string, number> = {};
-    let cityIndex: Record<string, number> = {};
-    let columns: string[] = [];
+    const blocks = headerUpload === files[0] ? [] : files;
+    let headerRow: string[] | null = columns.length > 0 ? columns : null;
+    if (blocks.length > 0 && !headerRow) {
+      // Get header once for the whole request
+      try {
+        const headerContent = await getObjectText(
+          client,
+          `${basePath}/header.csv`
+        );
+        headerRow = headerContent
+          ? parse(headerContent, { columns: false })[0] || []
+          : [];
+      } catch {
+        headerRow = null; // No header, each block uses its first row
+      }
+    }
 
-    if (!isHeader) {
+    const stored: Array<{
+      fileName: string;
+      records: number;
+      byState: Record<string, number>;
+      byCity: Record<string, number>;
+    }> = [];
+    for (const [n, file] of blocks.entries()) {
+      const partition = partitionKeys.length > 0 ? partitionKeys[n] : undefined;
+      const fileName = partition ? file.name : blockFileName(file);
+      const filePath = partition
+        ? `${basePath}/partitions/${partition}/${fileName}`
+        : `${basePath}/blocks/${fileName}`;
       try {
-        // Get header first
-        let headerRow: string[] = [];
-        try {
-          const headerRes = await client.send(
-            new GetObjectCommand({
-              Bucket: SPACES_BUCKET,
-              Key: `${basePath}/header.csv`,
-            })
-          );
-          const headerContent = await headerRes.Body?.transformToString();
-          if (headerContent) {
-            const parsed = parse(headerContent, { columns: false });
-            headerRow = parsed[0] || [];
-          }
-        } catch {
-          // No header, use first row
-          const parsed = parse(content, { columns: false });
-          headerRow = parsed[0] || [];
+        if (partition && !PARTITION_FILE.test(fileName)) {
+          throw new Error(`Partition files must be named part_NNNN.csv, got ${fileName}`);
         }
+        const content = await file.text();
 
-        columns = headerRow;
-
-        // Parse block with headers
-        const records = parse(content, {
-          columns: headerRow.length > 0 ? headerRow : true,
-          skip_empty_lines: true,
-          relax_column_count: true,
-        });
-
-        recordCount = records.length;
-
-        // Build indexes
-        const stateCol = headerRow.find((h: string) =>
-          ["state", "State", "STATE"].includes(h)
-        );
-        const cityCol = headerRow.find((h: string) =>
-          ["city", "City", "CITY"].includes(h)
+        // Upload file
+        await client.send(
+          new PutObjectCommand({
+            Bucket: SPACES_BUCKET,
+            Key: filePath,
+            Body: content,
+            ContentType: "text/csv",
+          })
         );
 
-        for (const row of records) {
-          if (stateCol && row[stateCol]) {
-            const state = String(row[stateCol]).toUpperCase().trim();
-            if (state.length === 2) {
-              stateIndex[state] = (stateIndex[state] || 0) + 1;
+        // Parse CSV to get stats
+        let recordCount = 0;
+        let blockStates: Record<string, number> = {};
+        let blockCities: Record<string, number> = {};
+        try {
+          const blockHeader =
+            headerRow ?? (parse(content, { columns: false })[0] || []);
+          if (!columns.length) columns = blockHeader;
+          const index = indexBlock(content, blockHeader);
+          recordCount = index.recordCount;
+          // Partition files hold the same rows as the blocks: counted in partitions.json, not the indexes
+          if (!partition) {
+            blockStates = index.stateIndex;
+            blockCities = index.cityIndex;
+            for (const [state, count] of Object.entries(index.stateIndex)) {
+              stateIndex[state] = (stateIndex[state] || 0) + count;
+            }
+            for (const [city, count] of Object.entries(index.cityIndex)) {
+              cityIndex[city] = (cityIndex[city] || 0) + count;
             }
           }
-          if (cityCol && row[cityCol] && stateCol && row[stateCol]) {
-            const city = String(row[cityCol]).toLowerCase().trim();
-            const state = String(row[stateCol]).toUpperCase().trim();
-            const key = `${city}-${state}`;
-            cityIndex[key] = (cityIndex[key] || 0) + 1;
-          }
+        } catch (parseErr) {
+          console.error("[Datalake] CSV parse error:", parseErr);
         }
-      } catch (parseErr) {
-        console.error("[Datalake] CSV parse error:", parseErr);
+
+        if (!partition) {
+          stored.push({ fileName, records: recordCount, byState: blockStates, byCity: blockCities });
+        }
+        uploaded.push({
+          name: file.name,
+          path: filePath,
+          fileName,
+          records: recordCount,
+          isHeader: false,
+          partition,
+          success: true,
+        });
+      } catch (err) {
+        if (!batch) throw err;
+        // One bad block doesn't fail the rest of the batch
+        console.error(`[Datalake Upload] ${file.name}:`, err);
+        uploaded.push({
+          name: file.name,
+          path: filePath,
+          fileName,
+          records: 0,
+          isHeader: false,
+          partition,
+          success: false,
+          error: err instanceof Error ? err.message : "Upload failed",
+        });
       }
-    } else {
-      // Header file - extract columns
-      const parsed = parse(content, { columns: false });
-      columns = parsed[0] || [];
     }
 
-    // Update manifest
-    let manifest: BlockManifest;
-    try {
-      const manifestRes = await client.send(
-        new GetObjectCommand({
+    // partitions.json: checked, stored as is, summarized in the manifest
+    let partitionManifest: PartitionManifest | null = null;
+    let partitionEtag: string | undefined;
+    if (partitionManifestFile) {
+      const content = await partitionManifestFile.text();
+      try {
+        partitionManifest = JSON.parse(content);
+      } catch {
+        partitionManifest = null;
+      }
+      if (
+        !partitionManifest ||
+        !Array.isArray(partitionManifest.by) ||
+        !Array.isArray(partitionManifest.partitions) ||
+        !partitionManifest.partitions.every(
+          (p) =>
+            PARTITION_KEY.test(p.key) &&
+            Array.isArray(p.files) &&
+            p.files.every((f) => PARTITION_FILE.test(f.name))
+        )
+      ) {
+        return NextResponse.json(
+          { error: "partitionManifest is not a valid partitions.json" },
+          { status: 400 }
+        );
+      }
+      const filePath = `${basePath}/partitions.json`;
+      const put = await client.send(
+        new PutObjectCommand({
           Bucket: SPACES_BUCKET,
-          Key: `${basePath}/manifest.json`,
+          Key: filePath,
+          Body: content,
+          ContentType: "application/json",
         })
       );
-      const manifestContent = await manifestRes.Body?.transformToString();
-      manifest = manifestContent ? JSON.parse(manifestContent) : null;
-    } catch {
-      // Create new manifest
-      manifest = {
+      partitionEtag = put.ETag;
+      if (!columns.length && partitionManifest.columns?.length) {
+        columns = partitionManifest.columns;
+      }
+      uploaded.push({
+        name: partitionManifestFile.name,
+        path: filePath,
+        fileName: "partitions.json",
+        records: 0,
+        isHeader: false,
+        success: true,
+      });
+    }
+
+    // Update manifest (re-read and re-applied if a concurrent upload wrote it first)
+    const manifest = await updateManifest(
+      client,
+      `${basePath}/manifest.json`,
+      () => ({
         sectorId,
         sectorName: sector.name,
         sicCodes: [...sector.sicCodes],
@@ -264,75 +597,113 @@ export async function POST(req: NextRequest) {
         columns: [],
         blocks: [],
         indexes: { byState: {}, byCity: {}, bySicCode: {} },
-      };
-    }
+      }),
+      (manifest) => {
+        manifest.updatedAt = now;
+        if (columns.length > 0) {
+          manifest.columns = columns;
+        }
 
-    // Update manifest
-    manifest.updatedAt = now;
-    if (columns.length > 0) {
-      manifest.columns = columns;
-    }
+        if (stored.length > 0) {
+          if (manifest.partitions && !partitionManifest) {
+            // partitions.json doesn't hold these blocks' rows: scans read the blocks again
+            if (manifest.blocks.length === 0) {
+              manifest.indexes.byState = {}; // it counted the partitions, not blocks
+            }
+            delete manifest.partitions;
+          }
 
-    if (!isHeader) {
-      // Add block to manifest
-      const existingBlock = manifest.blocks.find((b) => b.name === fileName);
-      if (existingBlock) {
-        existingBlock.records = recordCount;
-        existingBlock.uploadedAt = now;
-      } else {
-        manifest.blocks.push({
-          name: fileName,
-          records: recordCount,
-          uploadedAt: now,
-        });
-        manifest.totalBlocks++;
-      }
+          // Add blocks to manifest, and their counts to the indexes. A block
+          // uploaded again (or a retried request) replaces its earlier counts
+          // rather than adding to them.
+          for (const { fileName, records, byState, byCity } of stored) {
+            const existingBlock = manifest.blocks.find((b) => b.name === fileName);
+            if (existingBlock) {
+              mergeCounts(manifest.indexes.byState, existingBlock.byState, -1);
+              mergeCounts(manifest.indexes.byCity, existingBlock.byCity, -1);
+              existingBlock.records = records;
+              existingBlock.uploadedAt = now;
+              existingBlock.byState = byState;
+              existingBlock.byCity = byCity;
+            } else {
+              manifest.blocks.push({
+                name: fileName,
+                records,
+                uploadedAt: now,
+                byState,
+                byCity,
+              });
+            }
+            mergeCounts(manifest.indexes.byState, byState, 1);
+            mergeCounts(manifest.indexes.byCity, byCity, 1);
+          }
 
-      // Update totals
-      manifest.totalRecords = manifest.blocks.reduce(
-        (sum, b) => sum + b.records,
-        0
-      );
+          // Update totals
+          manifest.totalBlocks = manifest.blocks.length;
+          manifest.totalRecords = manifest.blocks.reduce(
+            (sum, b) => sum + b.records,
+            0
+          );
+        }
 
-      // Merge indexes
-      for (const [state, count] of Object.entries(stateIndex)) {
-        manifest.indexes.byState[state] =
-          (manifest.indexes.byState[state] || 0) + count;
-      }
-      for (const [city, count] of Object.entries(cityIndex)) {
-        manifest.indexes.byCity[city] =
-          (manifest.indexes.byCity[city] || 0) + count;
+        if (partitionManifest) {
+          const totals = partitionManifest.totals;
+          manifest.partitions = {
+            by: partitionManifest.by,
+            partitions: partitionManifest.partitions.length,
+            files: totals?.files ?? 0,
+            records: totals?.rows ?? 0,
+            uploadedAt: now,
+            etag: partitionEtag,
+          };
+          if (manifest.totalBlocks === 0) {
+            // Only partitions uploaded: they are the sector's records and state index
+            manifest.totalRecords = manifest.partitions.records;
+            manifest.indexes.byState = {};
+            for (const p of partitionManifest.partitions) {
+              const state = p.values.state;
+              if (state && state.length === 2) {
+                manifest.indexes.byState[state] = (manifest.indexes.byState[state] || 0) + p.rows;
+              }
+            }
+          }
+        }
       }
-    }
-
-    // Save manifest
-    await client.send(
-      new PutObjectCommand({
-        Bucket: SPACES_BUCKET,
-        Key: `${basePath}/manifest.json`,
-        Body: JSON.stringify(manifest, null, 2),
-        ContentType: "application/json",
-      })
     );
 
+    const sectorStats = {
+      id: sectorId,
+      name: sector.name,
+      totalRecords: manifest.totalRecords,
+      totalBlocks: manifest.totalBlocks,
+    };
+    const indexStats = {
+      states: Object.keys(stateIndex).length,
+      cities: Object.keys(cityIndex).length,
+    };
+
+    if (batch) {
+      return NextResponse.json({
+        success: uploaded.every((u) => u.success),
+        uploaded,
+        records: uploaded.reduce((sum, u) => sum + u.records, 0),
+        sector: sectorStats,
+        indexes: indexStats,
+        ...(partitionManifest ? { partitions: manifest.partitions } : {}),
+      });
+    }
+
+    const { path, fileName, records } = uploaded[0];
     return NextResponse.json({
       success: true,
       uploaded: {
-        path: filePath,
+        path,
         fileName,
-        records: recordCount,
+        records,
         isHeader,
       },
-      sector: {
-        id: sectorId,
-        name: sector.name,
-        totalRecords: manifest.totalRecords,
-        totalBlocks: manifest.totalBlocks,
-      },
-      indexes: {
-        states: Object.keys(stateIndex).length,
-        cities: Object.keys(cityIndex).length,
-      },
+      sector: sectorStats,
+      indexes: indexStats,
     });
   } catch (error) {
     console.error("[Datalake Upload] Error:", error);
@@ -420,12 +791,14 @@ export async function GET(req: NextRequest) {
             updatedAt: manifest.updatedAt,
           },
           columns: manifest.columns,
+          partitions: manifest.partitions || null,
           topStates,
           indexes: {
             statesCount: Object.keys(manifest.indexes.byState).length,
             citiesCount: Object.keys(manifest.indexes.byCity).length,
           },
-          blocks: manifest.blocks.slice(-10), // Last 10 blocks
+          // Last 10 blocks, without their index counts
+          blocks: manifest.blocks.slice(-10).map(({ name, records, uploadedAt }) => ({ name, records, uploadedAt })),
         });
       } catch {
         return NextResponse.json({
@@ -11,6 +11,8 @@
  *   "sector": "plumbers_hvac",
  *   "state": "TX",           // optional
  *   "city": "Houston",       // optional
+ *   "sicCode": "6531",       // optional
+ *   "zip": "750",            // optional - zip prefix
  *   "limit": 500,            // default: 500, max: 2000
  *   "hasEmail": true,        // optional - only records with email
  *   "hasPhone": true         // optional - only records with phone
@@ -21,9 +23,17 @@
  *   "scanId": "scan_123456",
  *   "matches": 523,
  *   "preview": [...first 10 records...],
- *   "cost": { "skipTrace": 10.46, "phoneValidate": 15.69, "total": 26.15 }
+ *   "cost": { "skipTrace": 10.46, "phoneValidate": 15.69, "total": 26.15 },
+ *   "scanned": { "partitioned": true, "objects": 5, "totalObjects": 225, "records": 48854 }
  * }
  *
+ * A sector uploaded with upload-datalake.py --partition-by has a
+ * partitions.json listing its files per state (and SIC code or zip3); only
+ * the partitions the filters select are read, e.g. a TX scan reads the TX
+ * files instead of every block. Without it every block is scanned, and so
+ * when partitions.json isn't the version the manifest lists (blocks were
+ * uploaded after it) or names a key or file outside partitions/.
+ *
  * ═══════════════════════════════════════════════════════════════════════════════
  */
 
@@ -76,6 +86,8 @@ interface ScanRequest {
   sector: SectorId;
   state?: string;
   city?: string;
+  sicCode?: string;
+  zip?: string;
   limit?: number;
   hasEmail?: boolean;
   hasPhone?: boolean;
@@ -87,6 +99,8 @@ interface ScanResult {
   filters: {
     state?: string;
     city?: string;
+    sicCode?: string;
+    zip?: string;
     hasEmail?: boolean;
     hasPhone?: boolean;
   };
@@ -99,9 +113,77 @@ interface ScanResult {
     combined: number;
     perLead: typeof PRICING;
   };
+  scanned: {
+    partitioned: boolean;
+    objects: number;
+    totalObjects: number;
+    records: number;
+  };
   expiresAt: string;
 }
 
+/**
+ * partitions.json as written by upload-datalake.py --partition-by
+ */
+interface PartitionManifest {
+  by: string[];
+  partitions: Array<{
+    key: string;
+    values: Record<string, string>;
+    rows: number;
+    files: Array<{ name: string; rows: number }>;
+  }>;
+}
+
+// "state=TX/sic=6531" and "part_0001.csv", as the datalake route accepts them
+const PARTITION_KEY = /^[a-z0-9]+=[A-Za-z0-9_]+(\/[a-z0-9]+=[A-Za-z0-9_]+)*$/;
+const PARTITION_FILE = /^part_\d+\.csv$/;
+
+/**
+ * partitions.json parsed and checked: every key and file name must be one
+ * the datalake route stores, since they become object keys; null otherwise
+ */
+function parsePartitions(content: string | undefined): PartitionManifest | null {
+  let partitions: PartitionManifest | null;
+  try {
+    partitions = content ? JSON.parse(content) : null;
+  } catch {
+    return null;
+  }
+  const valid =
+    partitions &&
+    Array.isArray(partitions.by) &&
+    Array.isArray(partitions.partitions) &&
+    partitions.partitions.every(
+      (p) =>
+        typeof p.key === "string" &&
+        PARTITION_KEY.test(p.key) &&
+        Array.isArray(p.files) &&
+        p.files.every((f) => typeof f.name === "string" && PARTITION_FILE.test(f.name))
+    );
+  return valid ? partitions : null;
+}
+
+/**
+ * Partitions that can hold matches: a filter on a partitioned dimension
+ * keeps only its value, every other dimension keeps all values
+ */
+function selectPartitions(
+  partitions: PartitionManifest,
+  filters: { state?: string; sicCode?: string; zip?: string }
+) {
+  const sic = (filters.sicCode || "").replace(/\D/g, "");
+  const zip = (filters.zip || "").replace(/\D/g, "");
+  const wanted: Record<string, string | undefined> = {
+    state: filters.state?.toUpperCase().trim() || undefined,
+    sic: sic.length >= 4 ? sic.slice(0, 4) : undefined,
+    zip3: zip.length >= 3 ? zip.slice(0, 3) : undefined,
+  };
+  return partitions.partitions.filter((p) =>
+    partitions.by.every((dim) => !wanted[dim] || p.values[dim] === wanted[dim])
+  );
+}
+
 /**
  * POST /api/luci/scan
  * Scan datalake for matching records
@@ -117,7 +199,7 @@ export async function POST(req: NextRequest) {
     }
 
     const body: ScanRequest = await req.json();
-    const { sector, state, city, hasEmail, hasPhone } = body;
+    const { sector, state, city, sicCode, zip, hasEmail, hasPhone } = body;
     const limit = Math.min(body.limit || DEFAULT_LIMIT, MAX_SCAN_LIMIT);
 
     // Validate sector
@@ -154,7 +236,28 @@ export async function POST(req: NextRequest) {
       );
     }
 
-    if (!manifest || manifest.totalBlocks === 0) {
+    // Partition layout, if the sector was uploaded re-sharded and no blocks came after it
+    let partitions: PartitionManifest | null = null;
+    if (manifest?.partitions) {
+      try {
+        const partitionsRes = await client.send(
+          new GetObjectCommand({
+            Bucket: SPACES_BUCKET,
+            Key: `${basePath}/partitions.json`,
+          })
+        );
+        if (partitionsRes.ETag === manifest.partitions.etag) {
+          partitions = parsePartitions(await partitionsRes.Body?.transformToString());
+          if (!partitions) {
+            console.error(`[Scan] ${basePath}/partitions.json is invalid, scanning blocks`);
+          }
+        }
+      } catch {
+        partitions = null; // Blocks only
+      }
+    }
+
+    if (!manifest || (manifest.totalBlocks === 0 && !partitions)) {
       return NextResponse.json(
         { error: `Sector ${sector} is empty` },
         { status: 404 }
@@ -195,25 +298,43 @@ export async function POST(req: NextRequest) {
     const emailCol = headers.find((h) =>
       ["email", "Email", "EMAIL", "Email Address"].includes(h)
     );
+    const sicCol = headers.find((h) =>
+      ["sic_code", "SIC Code", "SIC", "sic"].includes(h)
+    );
+    const zipCol = headers.find((h) =>
+      ["zip", "Zip", "ZIP", "Zip Code", "zip_code", "zipcode"].includes(h)
+    );
 
     // Scan blocks for matches
     const matches: Record<string, unknown>[] = [];
     let totalScanned = 0;
     let totalMatches = 0;
 
-    // Sort blocks to scan
-    const blocksToScan = [...manifest.blocks].sort((a: any, b: any) =>
-      a.name.localeCompare(b.name)
-    );
+    // Objects to scan: the selected partitions' files, or every block in order
+    const totalObjects = partitions
+      ? partitions.partitions.reduce((sum, p) => sum + p.files.length, 0)
+      : manifest.blocks.length;
+    const blocksToScan: Array<{ name: string; key: string }> = partitions
+      ? selectPartitions(partitions, { state, sicCode, zip }).flatMap((p) =>
+          p.files.map((f) => ({
+            name: `${p.key}/${f.name}`,
+            key: `${basePath}/partitions/${p.key}/${f.name}`,
+          }))
+        )
+      : [...manifest.blocks]
+          .sort((a: any, b: any) => a.name.localeCompare(b.name))
+          .map((b: any) => ({ name: b.name, key: `${basePath}/blocks/${b.name}` }));
+    let objectsRead = 0;
 
     for (const block of blocksToScan) {
       if (matches.length >= limit) break;
 
       try {
+        objectsRead++;
         const blockRes = await client.send(
           new GetObjectCommand({
             Bucket: SPACES_BUCKET,
-            Key: `${basePath}/blocks/${block.name}`,
+            Key: block.key,
           })
         );
         const blockContent = await blockRes.Body?.transformToString();
@@ -239,6 +360,16 @@ export async function POST(req: NextRequest) {
             if (!recordCity.includes(city.toLowerCase())) continue;
           }
 
+          if (sicCode && sicCol) {
+            const recordSic = String(record[sicCol] || "").replace(/\D/g, "");
+            if (!recordSic.startsWith(sicCode.replace(/\D/g, ""))) continue;
+          }
+
+          if (zip && zipCol) {
+            const recordZip = String(record[zipCol] || "").replace(/\D/g, "");
+            if (!recordZip.startsWith(zip.replace(/\D/g, ""))) continue;
+          }
+
           if (hasEmail && emailCol) {
             const recordEmail = String(record[emailCol] || "").trim();
             if (!recordEmail || !recordEmail.includes("@")) continue;
@@ -285,6 +416,8 @@ export async function POST(req: NextRequest) {
       filters: {
         state: state?.toUpperCase(),
         city,
+        sicCode,
+        zip,
         hasEmail,
         hasPhone,
       },
@@ -297,6 +430,12 @@ export async function POST(req: NextRequest) {
         combined: Math.round(matches.length * PRICING.combined * 100) / 100,
         perLead: PRICING,
       },
+      scanned: {
+        partitioned: partitions !== null,
+        objects: objectsRead,
+        totalObjects,
+        records: totalScanned,
+      },
       expiresAt,
     };
 
@@ -358,6 +497,8 @@ export async function GET(req: NextRequest) {
         sector: "Required - Sector to scan (plumbers_hvac, business_consultants, realtors, etc.)",
         state: "Optional - 2-letter state code (TX, NY, CA, etc.)",
         city: "Optional - City name (partial match)",
+        sicCode: "Optional - SIC code (prefix match)",
+        zip: "Optional - Zip code or prefix (e.g. 750)",
         limit: `Optional - Max records (default: ${DEFAULT_LIMIT}, max: ${MAX_SCAN_LIMIT} per campaign block)`,
         hasEmail: "Optional - Only records with valid email",
         hasPhone: "Optional - Only records with phone number",
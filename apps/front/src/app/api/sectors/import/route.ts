@@ -2,6 +2,18 @@ import { NextRequest, NextResponse } from "next/server";
 import { S3Client, PutObjectCommand, GetObjectCommand } from "@aws-sdk/client-s3";
 import { randomUUID } from "crypto";
 import { apiAuth } from "@/lib/api-auth";
+import {
+  BodyTooLargeError,
+  decodeRequestBody,
+  InvalidEncodingError,
+  SUPPORTED_ENCODINGS,
+  UnsupportedEncodingError,
+} from "@/lib/datalake/content-encoding";
+import {
+  ColumnarPayloadError,
+  decodeColumnar,
+  isColumnarPayload,
+} from "@/lib/datalake/columnar";
 
 // DO Spaces configuration
 const SPACES_ENDPOINT = "https://nyc3.digitaloceanspaces.com";
@@ -19,6 +31,69 @@ function getS3Client(): S3Client | null {
   });
 }
 
+// Conditional index.json writes lost to a concurrent import before giving up
+const INDEX_WRITE_ATTEMPTS = 8;
+
+function isWriteConflict(err: unknown): boolean {
+  const status = (err as { $metadata?: { httpStatusCode?: number } })?.$metadata?.httpStatusCode;
+  return status === 412 || status === 409;
+}
+
+/**
+ * Read-modify-write of a sector's index.json that is safe with several
+ * imports in flight (import-blocks.py --concurrency): the write only
+ * succeeds if the object is still the version that was read (If-Match on
+ * its ETag, If-None-Match when there was none). When another request wrote
+ * it in between, the index is read again and `apply` re-runs on the fresh
+ * copy, so no request's counts are lost. `apply` returns false when there
+ * is nothing to write.
+ */
+async function updateIndex(
+  client: S3Client,
+  key: string,
+  create: () => any,
+  apply: (index: any) => boolean
+): Promise<any> {
+  for (let attempt = 1; ; attempt++) {
+    let etag: string | undefined;
+    let content: string | undefined;
+    try {
+      const res = await client.send(
+        new GetObjectCommand({ Bucket: SPACES_BUCKET, Key: key })
+      );
+      etag = res.ETag;
+      content = await res.Body?.transformToString();
+    } catch {
+      // No index yet
+    }
+    let index: any;
+    try {
+      index = content ? JSON.parse(content) : create();
+    } catch {
+      index = create(); // unreadable: replaced, still conditional on its ETag
+    }
+    if (!apply(index)) return index;
+
+    try {
+      await client.send(
+        new PutObjectCommand({
+          Bucket: SPACES_BUCKET,
+          Key: key,
+          Body: JSON.stringify(index, null, 2),
+          ContentType: "application/json",
+          ...(etag ? { IfMatch: etag } : { IfNoneMatch: "*" }),
+        })
+      );
+      return index;
+    } catch (err) {
+      if (attempt >= INDEX_WRITE_ATTEMPTS || !isWriteConflict(err)) throw err;
+    }
+  }
+}
+
+// Idempotency-Key values the uploadId can be built from
+const IDEMPOTENCY_KEY = /^[A-Za-z0-9_-]{8,128}$/;
+
 // Sector definitions - map sector IDs to storage paths and names
 const SECTORS: Record<string, { name: string; storagePath: string; sicCodes: string[]; recordCount?: number }> = {
   // ═══════════════════════════════════════════════════════════════════════════
@@ -75,13 +150,35 @@ const SECTORS: Record<string, { name: string; storagePath: string; sicCodes: str
  *   records: Array<Record>,  // Array of records to import
  *   source?: string,         // e.g. "usbizdata_import"
  *   chunk?: number,          // Current chunk number
- *   totalChunks?: number     // Total chunks expected
+ *   totalChunks?: number,    // Total chunks expected
+ *   part?: number            // Request within the chunk, when the script splits it by size
  * }
+ *
+ * Instead of records the body may carry them columnar (scripts/*.py --wire
+ * columnar): columns: string[], dicts: { column: string[] }, rows: any[][],
+ * see @/lib/datalake/columnar.
+ *
+ * The body may be sent with Content-Encoding: gzip (scripts/*.py --compress gzip).
+ *
+ * With an Idempotency-Key header (sent by the import scripts, the same on
+ * every retry of a request) the upload is stored under that key and counted
+ * in the sector index once: a repeat of a request that was already imported
+ * gets the same answer, with replayed: true, instead of adding the records
+ * again. The sector index is written conditionally on the version read, so
+ * concurrent requests neither lose each other's counts nor both count a
+ * retried key.
  */
 export async function POST(request: NextRequest) {
   try {
     // Auth - check header or skip for now (Python script)
     const teamId = request.headers.get("x-team-id") || "tm_nextiertech";
+    const idempotencyKey = request.headers.get("idempotency-key");
+    if (idempotencyKey !== null && !IDEMPOTENCY_KEY.test(idempotencyKey)) {
+      return NextResponse.json(
+        { error: "Idempotency-Key must be 8-128 letters, digits, '-' or '_'" },
+        { status: 400 }
+      );
+    }
 
     const client = getS3Client();
     if (!client) {
@@ -91,8 +188,36 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    const body = await request.json();
-    const { sectorId, records, source = "api_import", chunk = 1, totalChunks = 1 } = body;
+    let body;
+    try {
+      body = await (await decodeRequestBody(request)).json();
+    } catch (err) {
+      if (err instanceof UnsupportedEncodingError) {
+        return NextResponse.json(
+          { error: err.message, supportedEncodings: SUPPORTED_ENCODINGS },
+          { status: 415 }
+        );
+      }
+      if (err instanceof BodyTooLargeError) {
+        return NextResponse.json({ error: err.message }, { status: 413 });
+      }
+      if (err instanceof InvalidEncodingError) {
+        return NextResponse.json({ error: err.message }, { status: 400 });
+      }
+      throw err;
+    }
+    const { sectorId, source = "api_import", chunk = 1, totalChunks = 1, part } = body;
+    let records = body.records;
+    if (isColumnarPayload(body)) {
+      try {
+        records = decodeColumnar(body);
+      } catch (err) {
+        if (err instanceof ColumnarPayloadError) {
+          return NextResponse.json({ error: `Invalid columnar payload: ${err.message}` }, { status: 400 });
+        }
+        throw err;
+      }
+    }
 
     // Validate sector
     if (!sectorId || !SECTORS[sectorId]) {
@@ -115,7 +240,7 @@ export async function POST(request: NextRequest) {
 
     const sector = SECTORS[sectorId];
     const now = new Date().toISOString();
-    const uploadId = `import-${Date.now()}-chunk${chunk}`;
+    const uploadId = `import-${idempotencyKey ?? Date.now()}-chunk${chunk}${part ? `-part${part}` : ""}`;
 
     // Normalize and process records
     const processedRecords = records.map((record: any, index: number) => ({
@@ -184,6 +309,7 @@ export async function POST(request: NextRequest) {
       source,
       chunk,
       totalChunks,
+      ...(part ? { part } : {}),
       uploadedAt: now,
       teamId,
       stats,
@@ -200,69 +326,59 @@ export async function POST(request: NextRequest) {
       })
     );
 
-    // Update sector index
-    let sectorIndex: any = {
-      sectorId,
-      name: sector.name,
-      storagePath: sector.storagePath,
-      sicCodes: sector.sicCodes,
-      createdAt: now,
-      updatedAt: now,
-      totalRecords: 0,
-      enrichedRecords: 0,
-      imports: [],
-      indexes: { byState: {}, byCity: {} },
-    };
-
-    // Try to get existing index
-    try {
-      const response = await client.send(
-        new GetObjectCommand({
-          Bucket: SPACES_BUCKET,
-          Key: `${sector.storagePath}index.json`,
-        })
-      );
-      const existingContent = await response.Body?.transformToString();
-      if (existingContent) {
-        sectorIndex = JSON.parse(existingContent);
-      }
-    } catch {
-      // No existing index
-    }
-
-    // Update index
-    sectorIndex.updatedAt = now;
-    sectorIndex.totalRecords += stats.total;
-    sectorIndex.imports = sectorIndex.imports || [];
-    sectorIndex.imports.push({
-      uploadId,
-      chunk,
-      totalChunks,
-      source,
-      uploadedAt: now,
-      recordCount: stats.total,
-      stats,
-    });
+    // Update sector index (re-read and re-applied if a concurrent import wrote it first)
+    let replayed = false;
+    const sectorIndex = await updateIndex(
+      client,
+      `${sector.storagePath}index.json`,
+      () => ({
+        sectorId,
+        name: sector.name,
+        storagePath: sector.storagePath,
+        sicCodes: sector.sicCodes,
+        createdAt: now,
+        updatedAt: now,
+        totalRecords: 0,
+        enrichedRecords: 0,
+        imports: [],
+        indexes: { byState: {}, byCity: {} },
+      }),
+      (sectorIndex) => {
+        // A retry of a request that was already imported: its upload (same key) was just rewritten, the index has it
+        sectorIndex.imports = sectorIndex.imports || [];
+        replayed =
+          idempotencyKey !== null &&
+          sectorIndex.imports.some((i: { uploadId?: string }) => i.uploadId === uploadId);
+        if (replayed) return false;
 
-    // Merge state indexes
-    for (const [state, count] of Object.entries(indexes.byState)) {
-      sectorIndex.indexes.byState[state] = (sectorIndex.indexes.byState[state] || 0) + count;
-    }
+        // Update index
+        sectorIndex.updatedAt = now;
+        sectorIndex.totalRecords += stats.total;
+        sectorIndex.imports.push({
+          uploadId,
+          chunk,
+          totalChunks,
+          ...(part ? { part } : {}),
+          source,
+          uploadedAt: now,
+          recordCount: stats.total,
+          stats,
+        });
 
-    await client.send(
-      new PutObjectCommand({
-        Bucket: SPACES_BUCKET,
-        Key: `${sector.storagePath}index.json`,
-        Body: JSON.stringify(sectorIndex, null, 2),
-        ContentType: "application/json",
-      })
+        // Merge state indexes
+        for (const [state, count] of Object.entries(indexes.byState)) {
+          sectorIndex.indexes.byState[state] = (sectorIndex.indexes.byState[state] || 0) + count;
+        }
+        return true;
+      }
     );
 
-    console.log(`[Sector Import] ${sectorId}: Imported ${stats.total} records (chunk ${chunk}/${totalChunks})`);
+    console.log(`[Sector Import] ${sectorId}: ${replayed ? "Replayed" : "Imported"} ${stats.total} records (chunk ${chunk}/${totalChunks}${part ? ` part ${part}` : ""})`);
 
     return NextResponse.json({
       success: true,
       imported: stats.total,
+      ...(replayed ? { replayed } : {}),
       uploadId,
       sector: {
         id: sectorId,
@@ -0,0 +1,78 @@
+/**
+ * @jest-environment node
+ */
+import {
+  ColumnarPayloadError,
+  decodeColumnar,
+  isColumnarPayload,
+} from "@/lib/datalake/columnar";
+
+// As scripts/usbiz/columnar.py Table.encode() writes it: state dictionary-encoded, city plain
+const payload = {
+  columns: ["company", "state", "city"],
+  dicts: { state: ["TX", "CA"] },
+  rows: [
+    ["Acme LLC", 0, "Austin"],
+    ["Bolt Inc", 1, null],
+    ["Cog Co", 0, "Dallas"],
+  ],
+};
+
+describe("decodeColumnar", () => {
+  test("expands rows back into records", () => {
+    expect(isColumnarPayload(payload)).toBe(true);
+    expect(decodeColumnar(payload)).toEqual([
+      { company: "Acme LLC", state: "TX", city: "Austin" },
+      { company: "Bolt Inc", state: "CA" },
+      { company: "Cog Co", state: "TX", city: "Dallas" },
+    ]);
+  });
+
+  test("leaves null cells out of the record, coded or not", () => {
+    const records = decodeColumnar({
+      columns: ["company", "state"],
+      dicts: { state: ["TX"] },
+      rows: [[null, null], ["Acme LLC", null]],
+    });
+    expect(records).toEqual([{}, { company: "Acme LLC" }]);
+  });
+
+  test("accepts payloads without dicts", () => {
+    expect(decodeColumnar({ columns: ["company"], rows: [["Acme LLC"]] })).toEqual([
+      { company: "Acme LLC" },
+    ]);
+  });
+
+  test("rejects codes outside the dictionary", () => {
+    for (const code of [2, -1, 0.5, "0"]) {
+      expect(() =>
+        decodeColumnar({ ...payload, rows: [["Acme LLC", code, null]] })
+      ).toThrow(ColumnarPayloadError);
+    }
+  });
+
+  test("rejects rows of the wrong length", () => {
+    for (const row of [["Acme LLC", 0], ["Acme LLC", 0, "Austin", "extra"]]) {
+      expect(() => decodeColumnar({ ...payload, rows: [row] })).toThrow(
+        "rows[0] must have 3 values"
+      );
+    }
+    expect(() => decodeColumnar({ ...payload, rows: ["Acme LLC" as any] })).toThrow(
+      ColumnarPayloadError
+    );
+  });
+
+  test("rejects dictionaries that aren't arrays of strings", () => {
+    for (const state of [["TX", 7], ["TX", null], ["TX", { a: 1 }], "TX"]) {
+      expect(() => decodeColumnar({ ...payload, dicts: { state: state as any } })).toThrow(
+        ColumnarPayloadError
+      );
+    }
+  });
+
+  test("ignores inherited properties of dicts", () => {
+    expect(
+      decodeColumnar({ columns: ["constructor"], dicts: {}, rows: [["x"]] })
+    ).toEqual([{ constructor: "x" }]);
+  });
+});
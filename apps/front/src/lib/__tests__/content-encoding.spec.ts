@@ -0,0 +1,89 @@
+/**
+ * @jest-environment node
+ */
+import { gzipSync } from "zlib";
+import {
+  BodyTooLargeError,
+  decodeRequestBody,
+  InvalidEncodingError,
+  MAX_ENCODED_BYTES,
+  UnsupportedEncodingError,
+} from "@/lib/datalake/content-encoding";
+
+describe("decodeRequestBody", () => {
+  test("passes uncompressed requests through", async () => {
+    const req = new Request("http://localhost/api/sectors/import", {
+      method: "POST",
+      body: JSON.stringify({ sectorId: "realtors" }),
+    });
+    expect(await decodeRequestBody(req)).toBe(req);
+  });
+
+  test("decodes gzip JSON bodies", async () => {
+    const payload = { sectorId: "realtors", records: [{ company: "Acme" }] };
+    const req = new Request("http://localhost/api/sectors/import", {
+      method: "POST",
+      headers: { "content-encoding": "gzip", "content-type": "application/json" },
+      body: gzipSync(Buffer.from(JSON.stringify(payload))),
+    });
+    const decoded = await decodeRequestBody(req);
+    expect(decoded.headers.get("content-encoding")).toBeNull();
+    expect(await decoded.json()).toEqual(payload);
+  });
+
+  test("decodes gzip multipart bodies", async () => {
+    const multipart =
+      '--B\r\nContent-Disposition: form-data; name="sector"\r\n\r\nrealtors\r\n' +
+      '--B\r\nContent-Disposition: form-data; name="file"; filename="block_0001.csv"\r\n' +
+      "Content-Type: text/csv\r\n\r\nAcme,TX\n\r\n--B--\r\n";
+    const req = new Request("http://localhost/api/luci/datalake", {
+      method: "POST",
+      headers: {
+        "content-encoding": "gzip",
+        "content-type": "multipart/form-data; boundary=B",
+      },
+      body: gzipSync(Buffer.from(multipart)),
+    });
+    const form = await (await decodeRequestBody(req)).formData();
+    const file = form.get("file") as File;
+    expect(form.get("sector")).toBe("realtors");
+    expect(file.name).toBe("block_0001.csv");
+    expect(await file.text()).toBe("Acme,TX\n");
+  });
+
+  test("rejects unknown encodings", async () => {
+    const req = new Request("http://localhost/api/sectors/import", {
+      method: "POST",
+      headers: { "content-encoding": "zstd" },
+      body: "x",
+    });
+    await expect(decodeRequestBody(req)).rejects.toBeInstanceOf(UnsupportedEncodingError);
+  });
+
+  test("stops decoding at the output limit", async () => {
+    const req = new Request("http://localhost/api/sectors/import", {
+      method: "POST",
+      headers: { "content-encoding": "gzip" },
+      body: gzipSync(Buffer.alloc(1024 * 1024)),
+    });
+    await expect(decodeRequestBody(req, 64 * 1024)).rejects.toBeInstanceOf(BodyTooLargeError);
+  });
+
+  test("refuses oversized compressed bodies before reading them", async () => {
+    const req = new Request("http://localhost/api/sectors/import", {
+      method: "POST",
+      headers: { "content-encoding": "gzip", "content-length": String(MAX_ENCODED_BYTES + 1) },
+      body: "x",
+    });
+    await expect(decodeRequestBody(req)).rejects.toBeInstanceOf(BodyTooLargeError);
+  });
+
+  test("reports corrupt bodies as invalid", async () => {
+    const req = new Request("http://localhost/api/sectors/import", {
+      method: "POST",
+      headers: { "content-encoding": "gzip" },
+      body: "not gzip",
+    });
+    await expect(decodeRequestBody(req)).rejects.toBeInstanceOf(InvalidEncodingError);
+  });
+});
@@ -0,0 +1,66 @@
+// ==========================================
+// COLUMNAR IMPORT PAYLOADS
+// The USBizData importers (scripts/*.py --wire columnar) send records as
+//   { columns: ["company", "state", ...],
+//     dicts: { state: ["TX", "CA", ...] },
+//     rows: [["Acme LLC", 0, ...], ...] }
+// instead of an array of objects: keys are sent once, and low-cardinality
+// columns (state, city, SIC code/description, ...) as indexes into a
+// per-request dictionary. null means the record has no value there.
+// ==========================================
+
+export class ColumnarPayloadError extends Error {}
+
+export interface ColumnarPayload {
+  columns: string[];
+  dicts?: Record<string, string[]>;
+  rows: unknown[][];
+}
+
+export function isColumnarPayload(body: any): body is ColumnarPayload {
+  return Array.isArray(body?.columns) && Array.isArray(body?.rows);
+}
+
+/**
+ * Expand a columnar payload into the record objects the importer expects.
+ * Throws ColumnarPayloadError (a 400) for rows or codes that don't fit.
+ */
+export function decodeColumnar(payload: ColumnarPayload): Record<string, string>[] {
+  const { columns, rows } = payload;
+  const dicts = payload.dicts || {};
+  if (!columns.every((c) => typeof c === "string")) {
+    throw new ColumnarPayloadError("columns must be strings");
+  }
+  // Per column index: its dictionary, or undefined for plain values
+  const lookup = columns.map((c) => {
+    const dict = Object.prototype.hasOwnProperty.call(dicts, c) ? dicts[c] : undefined;
+    if (dict !== undefined && !Array.isArray(dict)) {
+      throw new ColumnarPayloadError(`dicts.${c} must be an array`);
+    }
+    if (dict && !dict.every((v) => typeof v === "string")) {
+      throw new ColumnarPayloadError(`dicts.${c} must hold strings`);
+    }
+    return dict;
+  });
+
+  return rows.map((row, r) => {
+    if (!Array.isArray(row) || row.length !== columns.length) {
+      throw new ColumnarPayloadError(`rows[${r}] must have ${columns.length} values`);
+    }
+    const record: Record<string, string> = {};
+    for (let i = 0; i < columns.length; i++) {
+      const value = row[i];
+      if (value === null || value === undefined) continue;
+      const dict = lookup[i];
+      if (dict) {
+        if (typeof value !== "number" || !Number.isInteger(value) || value < 0 || value >= dict.length) {
+          throw new ColumnarPayloadError(`rows[${r}]: ${columns[i]} code ${JSON.stringify(value)} out of range`);
+        }
+        record[columns[i]] = dict[value];
+      } else {
+        record[columns[i]] = String(value);
+      }
+    }
+    return record;
+  });
+}
@@ -0,0 +1,89 @@
+// ==========================================
+// REQUEST CONTENT-ENCODING
+// The USBizData uploaders (scripts/*.py --compress gzip) send compressed
+// bodies. Route handlers get the raw bytes, so decode them before calling
+// .json() / .formData() on the request.
+// ==========================================
+
+import { promisify } from "util";
+import { brotliDecompress, gunzip, inflate, type ZlibOptions } from "zlib";
+
+type Decoder = (input: Buffer, options: ZlibOptions) => Promise<Buffer>;
+
+const DECODERS: Record<string, Decoder> = {
+  gzip: promisify(gunzip),
+  "x-gzip": promisify(gunzip),
+  deflate: promisify(inflate),
+  br: promisify(brotliDecompress),
+};
+
+// Compressed bodies above this are refused before they are read
+export const MAX_ENCODED_BYTES = 64 * 1024 * 1024;
+// Decompression stops here, so a small gzip bomb can't exhaust memory
+export const MAX_DECODED_BYTES = 256 * 1024 * 1024;
+
+export class UnsupportedEncodingError extends Error {
+  constructor(public encoding: string) {
+    super(`Unsupported Content-Encoding: ${encoding}`);
+  }
+}
+
+/** A compressed body, or what it decodes to, exceeds the limits above (413) */
+export class BodyTooLargeError extends Error {
+  constructor(public limit: number) {
+    super(`Request body exceeds ${limit} bytes`);
+  }
+}
+
+/** The body is not valid data for its Content-Encoding (400) */
+export class InvalidEncodingError extends Error {
+  constructor(public encoding: string, reason: string) {
+    super(`Invalid ${encoding} body: ${reason}`);
+  }
+}
+
+export const SUPPORTED_ENCODINGS = Object.keys(DECODERS);
+
+/**
+ * Return a Request whose body is decoded according to its Content-Encoding.
+ * Uncompressed requests are returned unchanged. Decoding runs off the event
+ * loop and is capped at maxDecodedBytes.
+ */
+export async function decodeRequestBody(
+  req: Request,
+  maxDecodedBytes = MAX_DECODED_BYTES
+): Promise<Request> {
+  const encoding = (req.headers.get("content-encoding") || "identity")
+    .toLowerCase()
+    .trim();
+  if (encoding === "identity") return req;
+
+  const decode = DECODERS[encoding];
+  if (!decode) throw new UnsupportedEncodingError(encoding);
+
+  if (Number(req.headers.get("content-length")) > MAX_ENCODED_BYTES) {
+    throw new BodyTooLargeError(MAX_ENCODED_BYTES);
+  }
+  const raw = Buffer.from(await req.arrayBuffer());
+  if (raw.length > MAX_ENCODED_BYTES) throw new BodyTooLargeError(MAX_ENCODED_BYTES);
+
+  let body: Buffer;
+  try {
+    body = await decode(raw, { maxOutputLength: maxDecodedBytes });
+  } catch (err) {
+    if (err instanceof RangeError || (err as NodeJS.ErrnoException).code === "ERR_BUFFER_TOO_LARGE") {
+      throw new BodyTooLargeError(maxDecodedBytes);
+    }
+    throw new InvalidEncodingError(encoding, (err as Error).message);
+  }
+
+  const headers = new Headers(req.headers);
+  headers.delete("content-encoding");
+  headers.delete("content-length");
+
+  return new Request(req.url, {
+    method: req.method,
+    headers,
+    body: new Uint8Array(body),
+  });
+}
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: buffered vs streamed JSON request bodies
+
+Encodes one /api/sectors/import payload the way the importers do - all at
+once with transport.json_body (the --no-stream path) and chunk by chunk with
+transport.json_stream (the default) - with every available JSON encoder
+(stdlib json, and orjson when installed). For each variant it prints the
+encode rate and the peak memory allocated while encoding (tracemalloc, on
+top of the records themselves), and checks the decoded bodies are identical.
+
+Usage:
+  python scripts/bench/bench_encoding.py [--records N] [--compress gzip] [--repeat N]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from synth import make_row  # noqa: E402
+from usbiz import transport  # noqa: E402
+
+# Normalized field names, in synth.make_row() column order
+FIELDS = [
+    "company", "address", "city", "state", "zip", "county", "phone",
+    "first_name", "last_name", "title", "direct_phone", "email",
+    "website", "employees", "revenue", "sic_code", "sic_description",
+]
+
+
+def make_payload(n):
+    """A payload shaped like Importer.import_part's, with n normalized records"""
+    rng = random.Random(42)
+    records = []
+    for i in range(n):
+        record = {k: v for k, v in zip(FIELDS, make_row(i, rng, False)) if v}
+        record["contact_name"] = f"{record.pop('first_name', '')} {record.pop('last_name', '')}".strip()
+        records.append(record)
+    return {"sectorId": "realtors", "records": records, "source": "usbizdata_blocks", "chunk": 1, "totalChunks": 1}
+
+
+def buffered(payload, encoder, compression, keep=False):
+    body = transport.json_encoder(encoder)(payload)
+    return transport.compress(body, compression)[0]
+
+
+def streamed(payload, encoder, compression, keep=False):
+    # Like requests sending the stream: each piece goes out and is dropped
+    pieces = transport.JSONStream(payload, encoding=compression, encoder=encoder)
+    if keep:
+        return b"".join(pieces)
+    for _ in pieces:
+        pass
+
+
+def measure(fn, payload, encoder, compression, repeat):
+    """(best seconds, peak bytes allocated during one run, body)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(payload, encoder, compression)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn(payload, encoder, compression)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, fn(payload, encoder, compression, keep=True)
+
+
+def decode(body, compression):
+    return json.loads(gzip.decompress(body) if compression else body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark buffered vs streamed JSON request bodies")
+    parser.add_argument("--records", type=int, default=10000, help="Records in the payload (default: 10000, one block)")
+    parser.add_argument("--compress", choices=transport.COMPRESSIONS, default=None, help="Compress the body (default: off)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant, best is reported")
+    args = parser.parse_args()
+
+    payload = make_payload(args.records)
+    expected = json.loads(json.dumps(payload))
+    print(f"{args.records:,} records, {args.compress or 'uncompressed'}, encoders: {', '.join(transport.JSON_ENCODERS)}")
+
+    for encoder in transport.JSON_ENCODERS:
+        for label, fn in (("buffered", buffered), ("streamed", streamed)):
+            seconds, peak, body = measure(fn, payload, encoder, args.compress, args.repeat)
+            if decode(body, args.compress) != expected:
+                print(f"{encoder} {label}: OUTPUT MISMATCH")
+                sys.exit(1)
+            print(f"  {encoder:7} {label}: {args.records / seconds:12,.0f} records/sec, "
+                  f"peak {peak / 1e6:7.2f} MB, body {len(body) / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Parser backends: identical output check and micro-benchmark
+
+Runs import-blocks.py's read_block and import-usbizdata.py's read_range
+with every installed usbiz.parsers backend (pyarrow, polars, python) over a
+shared corpus and checks each returns exactly the records of the python
+backend, key order included:
+  - synthetic exports in each header spelling, clean and --dirty (BOM, CRLF,
+    cp1252 bytes, quoted newlines, blank lines, repeated headers)
+  - small edge cases: whitespace-only and unicode-padded cells, duplicate
+    columns mapping to one field, contact vs first/last names, ragged rows,
+    ASCII separator characters, tab delimiters, header-only files
+Then prints rows/sec per backend on the synthetic exports. Exits 1 on any
+mismatch.
+
+Usage:
+  python scripts/bench/bench_parsers.py [--rows N] [--repeat N]
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+from synth import HEADER_VARIANTS, generate  # noqa: E402
+from usbiz import parsers  # noqa: E402
+from usbiz.rowindex import RowIndex  # noqa: E402
+
+EDGE_HEADER = "Company,First Name,Last Name,Phone,Telephone,Email,State"
+EDGE_ROWS = [
+    'Acme LLC,Pat,Smith,555-0100,,pat@acme.com,TX',
+    '  Padded Co  , Jo ,,  ,555-0101,,ca',
+    'Whitespace Only,   ,   ,,,,',
+    'Only Last,,Nguyen,,,,NY',
+    'Dup Phone,Sam,Lee,555-0102,555-0103,,FL',
+    '"Quoted, Comma Inc","Al ""Ace""",Brown,,,,"TX"',
+    '"Multi\nLine Ltd",Kim,,,,,OH',
+    ' Nbsp Corp ,Ana,　Ito,,,,WA',
+    ',,,,,,',
+    '',
+    'Last Row Co,Lee,Park,,,lee@park.com,GA',
+]
+EDGE_CASES = {
+    "edge": [EDGE_HEADER] + EDGE_ROWS,
+    "edge_crlf_header_repeat": [EDGE_HEADER, EDGE_HEADER] + EDGE_ROWS,
+    "edge_contact": ["Company,Contact,First Name,Last Name,Phone",
+                     "With Contact,Pat Smith,Pat,Smith,555-0100",
+                     "No Contact,,Jo,Doe,555-0101",
+                     "Blank Contact,  ,Al,,555-0102"],
+    "edge_ragged": [EDGE_HEADER] + EDGE_ROWS + ["Short Row,Pat", "Long Row,Pat,Smith,1,2,3,TX,extra"],
+    "edge_separator_chars": [EDGE_HEADER, "Sep\x1fCo,Pat,Smith,,,,TX", "Fine Co,Jo,Doe,,,,CA"],
+    "edge_tabs": [EDGE_HEADER.replace(",", "\t")] + [r.replace(",", "\t") for r in EDGE_ROWS if '"' not in r],
+    "edge_header_only": [EDGE_HEADER],
+}
+
+
+def load_script(name):
+    """Import one of the hyphenated scripts as a module"""
+    path = SCRIPTS_DIR / name
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_")[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_edge_cases(folder):
+    """Each edge case as a single CSV and as a header.csv + block_0001.csv folder"""
+    cases = []
+    for name, lines in EDGE_CASES.items():
+        newline = "\r\n" if "crlf" in name else "\n"
+        csv_path = os.path.join(folder, f"{name}.csv")
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            f.write(newline.join(lines) + newline)
+        block_dir = os.path.join(folder, name)
+        os.makedirs(block_dir)
+        with open(os.path.join(block_dir, "header.csv"), "w", encoding="utf-8", newline="") as f:
+            f.write(lines[0] + newline)
+        with open(os.path.join(block_dir, "block_0001.csv"), "w", encoding="utf-8", newline="") as f:
+            f.write(newline.join(lines[1:]) + newline)
+        cases.append((name, csv_path, block_dir))
+    return cases
+
+
+def write_synthetic(folder, rows):
+    cases = []
+    for headers in sorted(HEADER_VARIANTS):
+        for dirty in (False, True):
+            name = f"synth_{headers}{'_dirty' if dirty else ''}"
+            csv_path = os.path.join(folder, f"{name}.csv")
+            block_dir = os.path.join(folder, name)
+            generate(csv_path, rows, "csv", headers, dirty=dirty)
+            generate(block_dir, rows, "blocks", headers, block_rows=max(1, rows // 4), dirty=dirty)
+            cases.append((name, csv_path, block_dir))
+    return cases
+
+
+def run_blocks(blocks_mod, block_dir, backend):
+    """Records of every block of the folder, like import-blocks.py"""
+    header = os.path.join(block_dir, "header.csv")
+    records = []
+    for path in blocks_mod.find_blocks(block_dir):
+        records += blocks_mod.read_block(header, path, parser=backend)
+    return records
+
+
+def run_chunks(usbiz_mod, csv_path, backend, chunk_rows):
+    """Records of every row-index chunk of the CSV, like import-usbizdata.py"""
+    usbiz_mod._readers.clear()
+    index = RowIndex.build(csv_path, chunk_rows)
+    records = []
+    for chunk in range(1, index.chunks + 1):
+        records += usbiz_mod.read_range(csv_path, *index.chunk_range(chunk), None, backend)[0]
+    return records
+
+
+def same(a, b):
+    return len(a) == len(b) and all(list(x.items()) == list(y.items()) for x, y in zip(a, b))
+
+
+def best_of(repeat, fn, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the CSV parser backends")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows per synthetic export (default: 20000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend, best is reported")
+    args = parser.parse_args()
+
+    blocks_mod = load_script("import-blocks.py")
+    usbiz_mod = load_script("import-usbizdata.py")
+    print(f"Backends installed: {', '.join(parsers.BACKENDS)}")
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        edge = write_edge_cases(tmp)
+        synthetic = write_synthetic(tmp, args.rows)
+
+        timings = {backend: [0.0, 0] for backend in parsers.BACKENDS}
+        for name, csv_path, block_dir in edge + synthetic:
+            timed = name.startswith("synth")
+            repeat = args.repeat if timed else 1
+            for label, fn, fn_args in (
+                ("read_block", run_blocks, (blocks_mod, block_dir)),
+                ("read_range", run_chunks, (usbiz_mod, csv_path)),
+            ):
+                extra = () if label == "read_block" else (max(1, args.rows // 4),)
+                _, expected = best_of(1, fn, *fn_args, "python", *extra)
+                for backend in parsers.BACKENDS:
+                    seconds, records = best_of(repeat, fn, *fn_args, backend, *extra)
+                    if not same(records, expected):
+                        print(f"  {name} {label} {backend}: OUTPUT MISMATCH ({len(records)} vs {len(expected)} records)")
+                        failed = True
+                    if timed:
+                        timings[backend][0] += seconds
+                        timings[backend][1] += len(records)
+
+        cases = len(edge) + len(synthetic)
+        print(f"{cases} corpus files x read_block/read_range: {'MISMATCHES' if failed else 'identical output'}")
+        for backend, (seconds, rows) in timings.items():
+            print(f"  {backend:8} {rows / seconds:12,.0f} rows/sec  ({rows:,} synthetic rows)")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
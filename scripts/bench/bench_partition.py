@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Partition re-sharding: scan pruning and correctness check
+
+Re-shards a block folder with every usbiz.partition layout (state,
+state/sic, state/zip3) and, for a per-state scan and a state + SIC scan,
+compares what POST /api/luci/scan reads with and without partitions.json:
+objects fetched, bytes read, and the time to read and filter them locally.
+Partitions are picked the way the scan route's selectPartitions() picks
+them, and the matching rows found in the partitions must be exactly the
+ones found by reading every block. Exits 1 on any difference.
+
+Without a folder a synthetic export (--states all: 50 states and DC, so a
+single-state scan reads ~1/50 of the data) is generated. Its zips are
+random rather than drawn from each state's ranges, so state,zip3 makes far
+more (and smaller) partitions on it than on a real export.
+
+Usage:
+  python scripts/bench/bench_partition.py [folder] [--rows N] [--state TX] [--sic 6531]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+from synth import ALL_STATES, generate  # noqa: E402
+from usbiz import partition  # noqa: E402
+from usbiz.preflight import header_columns  # noqa: E402
+
+
+def select(manifest, state=None, sic=None, zip_code=None):
+    """Partitions a scan with these filters reads, like selectPartitions() in the scan route"""
+    sic = "".join(c for c in sic or "" if c.isdigit())
+    zip_code = "".join(c for c in zip_code or "" if c.isdigit())
+    wanted = {
+        "state": (state or "").strip().upper() or None,
+        "sic": sic[:4] if len(sic) >= 4 else None,
+        "zip3": zip_code[:3] if len(zip_code) >= 3 else None,
+    }
+    return [p for p in manifest["partitions"]
+            if all(not wanted[dim] or p["values"][dim] == wanted[dim] for dim in manifest["by"])]
+
+
+def scan(paths, columns, state, sic):
+    """(matching rows, bytes read) over paths, filtering like the scan route"""
+    state_col = partition.key_columns(columns, ["state"])[0]
+    sic_col = partition.key_columns(columns, ["sic"])[0] if sic else None
+    found = Counter()
+    nbytes = 0
+    for path in paths:
+        nbytes += os.path.getsize(path)
+        with open(path, "r", encoding="latin-1", newline="") as f:
+            for text, row in partition.records(f):
+                if len(row) <= state_col or row[state_col].strip().upper() != state:
+                    continue
+                if sic_col is not None and (len(row) <= sic_col or not row[sic_col].strip().startswith(sic)):
+                    continue
+                found[text.lstrip(partition.BOM)] += 1
+    return found, nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark partitioned LUCI scans")
+    parser.add_argument("folder", nargs="?", help="Block folder (default: a generated synthetic export)")
+    parser.add_argument("--rows", type=int, default=200000, help="Synthetic rows (default: 200000)")
+    parser.add_argument("--state", default="TX", help="State the scans filter on (default: TX)")
+    parser.add_argument("--sic", default="6531", help="SIC code of the state + SIC scan (default: 6531)")
+    parser.add_argument("--rows-per-file", type=int, default=partition.ROWS_PER_FILE,
+                        help=f"Rows per partition file (default: {partition.ROWS_PER_FILE})")
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.folder
+        if not folder:
+            folder = os.path.join(tmp, "blocks")
+            generate(folder, args.rows, "blocks", dirty=True, states=ALL_STATES)
+        blocks = sorted(str(p) for p in Path(folder).glob("block_*.csv"))
+        columns = header_columns(os.path.join(folder, "header.csv"))
+        print(f"Source: {folder} ({len(blocks)} blocks, {sum(os.path.getsize(b) for b in blocks) / 1e6:,.1f} MB)")
+
+        baseline = {}
+        for label, sic in (("state", None), ("state+sic", args.sic)):
+            start = time.perf_counter()
+            found, nbytes = scan(blocks, columns, args.state, sic)
+            baseline[label] = (found, len(blocks), nbytes, time.perf_counter() - start)
+
+        for by in partition.LAYOUTS:
+            out_dir = os.path.join(tmp, "partitions-" + by.replace(",", "-"))
+            start = time.perf_counter()
+            manifest = partition.reshard(folder, blocks, by.split(","), out_dir, args.rows_per_file)
+            t = manifest["totals"]
+            print(f"\n--partition-by {by}: {t['partitions']} partitions, {t['files']} files, "
+                  f"re-sharded in {time.perf_counter() - start:.2f}s")
+            for label, sic in (("state", None), ("state+sic", args.sic)):
+                expected, all_objects, all_bytes, all_seconds = baseline[label]
+                selected = {p["key"] for p in select(manifest, args.state, sic)}
+                paths = [path for path, _, key, _ in partition.files(manifest, out_dir) if key in selected]
+                start = time.perf_counter()
+                found, nbytes = scan(paths, columns, args.state, sic)
+                seconds = time.perf_counter() - start
+                ok = found == expected
+                failed = failed or not ok
+                print(f"  {label:10} {sum(found.values()):>9,} rows  "
+                      f"{len(paths):>5} / {all_objects} objects  "
+                      f"{nbytes / 1e6:8,.1f} / {all_bytes / 1e6:,.1f} MB ({nbytes / all_bytes * 100 if all_bytes else 0:5.1f}%)  "
+                      f"{seconds:6.2f}s vs {all_seconds:.2f}s  {'same rows' if ok else 'ROWS DIFFER'}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: csv.DictReader row rebuilds vs compiled Projection
+
+Times the previous read_block/read_csv row loop (DictReader + header_map
+walk per row) against the current index-based Projection on the same file,
+checks both produce identical records, and prints rows/sec.
+
+Usage:
+  python scripts/bench/bench_projection.py [csv_file] [--rows N] [--repeat N]
+
+Without a file, a synthetic USBizData-style CSV of --rows rows is generated
+in a temp directory.
+"""
+
+import argparse
+import csv
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from usbiz.projection import Projection  # noqa: E402
+
+HEADERS = [
+    "Company Name", "Address", "City", "State", "Zip", "County", "Phone",
+    "Contact First", "Contact Last", "Title", "Direct Phone", "Email",
+    "Website", "Employee Range", "Annual Sales", "SIC Code", "Industry",
+]
+
+
+def load_script(name):
+    """Import one of the hyphenated scripts as a module"""
+    path = SCRIPTS_DIR / name
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_")[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_sample(path, rows):
+    """Write a synthetic export with a header row"""
+    rng = random.Random(42)
+    states = ["TX", "CA", "NY", "FL", "IL", "PA", "OH", "GA"]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        for i in range(rows):
+            writer.writerow([
+                f"Firm {i} LLC", f"{rng.randint(1, 9999)} Main St", "Springfield",
+                rng.choice(states), f"{rng.randint(10000, 99999)}", "Greene",
+                f"(555) 555-{i % 10000:04d}", "Pat", "Smith" if i % 7 else "",
+                "Owner", "", f"pat{i}@firm{i}.com" if i % 3 else "",
+                f"www.firm{i}.com", "1 to 4", "$500,000 to $1 Million", "6531",
+                "Real Estate Agents & Managers",
+            ])
+
+
+def legacy_rows(path, header_map, keep_name_parts):
+    """The pre-Projection loop: DictReader plus a header_map walk per row"""
+    records = []
+    with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            record = {}
+            for orig_key, new_key in header_map.items():
+                if orig_key in row and row[orig_key]:
+                    record[new_key] = row[orig_key].strip()
+            if "contact_name" not in record:
+                if keep_name_parts:
+                    first = record.get("first_name", "")
+                    last = record.get("last_name", "")
+                else:
+                    first = record.pop("first_name", "")
+                    last = record.pop("last_name", "")
+                if first or last:
+                    record["contact_name"] = f"{first} {last}".strip()
+            if record:
+                records.append(record)
+    return records
+
+
+def projected_rows(path, headers, header_map, keep_name_parts):
+    """The current loop: csv.reader plus a compiled Projection"""
+    project = Projection(headers, header_map, keep_name_parts)
+    records = []
+    with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if not row:
+                continue
+            record = project(row)
+            if record:
+                records.append(record)
+    return records
+
+
+def best_of(repeat, fn, *args):
+    """Fastest wall time over `repeat` runs, plus the last result"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV row projection")
+    parser.add_argument("csv_file", nargs="?", help="CSV with a header row (default: synthetic)")
+    parser.add_argument("--rows", type=int, default=100000, help="Synthetic rows (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant, best is reported")
+    args = parser.parse_args()
+
+    tmpdir = None
+    if args.csv_file:
+        path = args.csv_file
+    else:
+        tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmpdir.name, "sample.csv")
+        write_sample(path, args.rows)
+
+    with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
+        headers = next(csv.reader(f))
+
+    variants = [
+        ("import-blocks.py", True),
+        ("import-usbizdata.py", False),
+    ]
+    for script, keep_name_parts in variants:
+        header_map = load_script(script).normalize_headers(headers)
+        before, old = best_of(args.repeat, legacy_rows, path, header_map, keep_name_parts)
+        after, new = best_of(args.repeat, projected_rows, path, headers, header_map, keep_name_parts)
+        if old != new:
+            print(f"{script}: OUTPUT MISMATCH")
+            sys.exit(1)
+        rows = len(new)
+        print(f"{script} header map, {rows:,} rows")
+        print(f"  DictReader: {rows / before:12,.0f} rows/sec")
+        print(f"  Projection: {rows / after:12,.0f} rows/sec  ({before / after:.2f}x)")
+
+    if tmpdir:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
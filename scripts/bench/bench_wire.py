@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Wire formats for /api/sectors/import: size, memory and round-trip check
+
+Parses and normalizes every block of a folder like import-blocks.py, then
+compares the records format (an array of record objects) with --wire
+columnar (usbiz/columnar.py) on:
+  memory   - traced bytes held by a block's record dicts vs its Table
+  bytes    - request body size, plain and gzip (--compress gzip)
+  time     - building the body: JSON of the records vs Table + encode + JSON
+and checks that decoding each columnar body the way the route does gives
+back exactly the records. Exits 1 on any difference.
+
+Without a folder a synthetic export is generated. Its lists repeat fewer
+distinct cities and names than a real export, which flatters the
+dictionaries; run it on a real block folder for representative numbers.
+
+Usage:
+  python scripts/bench/bench_wire.py [folder] [--rows N] [--block-rows N]
+"""
+
+import argparse
+import gc
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+from synth import generate  # noqa: E402
+from usbiz import columnar, normalize, transport  # noqa: E402
+
+
+def load_script(name):
+    """Import one of the hyphenated scripts as a module"""
+    path = SCRIPTS_DIR / name
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_")[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def traced(fn):
+    """(result, bytes still allocated by fn once it returns)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the records and columnar request formats")
+    parser.add_argument("folder", nargs="?", help="Block folder (default: a generated synthetic export)")
+    parser.add_argument("--rows", type=int, default=100000, help="Synthetic rows (default: 100000)")
+    parser.add_argument("--block-rows", type=int, default=10000, help="Synthetic rows per block (default: 10000)")
+    args = parser.parse_args()
+
+    blocks_mod = load_script("import-blocks.py")
+    dumps = transport.json_encoder()
+    totals = dict.fromkeys(("rows", "mem_records", "mem_table", "json", "json_gz", "col", "col_gz", "t_json", "t_col"), 0)
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.folder
+        if not folder:
+            folder = os.path.join(tmp, "blocks")
+            generate(folder, args.rows, "blocks", block_rows=args.block_rows)
+        header = os.path.join(folder, "header.csv")
+        blocks = blocks_mod.find_blocks(folder)
+        print(f"Source: {folder} ({len(blocks)} blocks, {transport.JSON_ENCODERS[0]})")
+
+        for path in blocks:
+            def parse():
+                records = blocks_mod.read_block(header, path)
+                normalize.normalize_records(records)
+                return records
+
+            records, mem_records = traced(parse)
+            # The Table is built from a copy so the dicts it replaces can be dropped inside the trace
+            table, mem_table = traced(lambda: columnar.Table.from_records(parse()))
+
+            start = time.perf_counter()
+            body = dumps({"records": records})
+            t_json = time.perf_counter() - start
+            start = time.perf_counter()
+            payload = columnar.Table.from_records(records).encode()
+            col = dumps(payload)
+            t_col = time.perf_counter() - start
+
+            if columnar.decode(payload) != records or list(table) != records:
+                print(f"  {os.path.basename(path)}: ROUND TRIP MISMATCH")
+                failed = True
+
+            totals["rows"] += len(records)
+            totals["mem_records"] += mem_records
+            totals["mem_table"] += mem_table
+            totals["json"] += len(body)
+            totals["json_gz"] += len(transport.compress(body, "gzip")[0])
+            totals["col"] += len(col)
+            totals["col_gz"] += len(transport.compress(col, "gzip")[0])
+            totals["t_json"] += t_json
+            totals["t_col"] += t_col
+            coded = ", ".join(table.columns[i] for i in table.coded)
+            del records, table, payload, body, col
+
+    t = totals
+    rows = t["rows"] or 1
+    print(f"{t['rows']:,} records; dictionary-encoded: {coded}")
+    print(f"{'':10} {'records':>12} {'columnar':>12} {'ratio':>7}")
+    for label, a, b, unit, scale in (
+        ("memory", t["mem_records"], t["mem_table"], "B/row", rows),
+        ("body", t["json"], t["col"], "B/row", rows),
+        ("gzip body", t["json_gz"], t["col_gz"], "B/row", rows),
+        ("build", t["t_json"] * 1e6, t["t_col"] * 1e6, "us/row", rows),
+    ):
+        print(f"{label:10} {a / scale:>8,.1f} {unit:<6} {b / scale:>6,.1f} {unit:<6} {b / a if a else 0:>6.2f}x")
+    print(f"Round trip: {'MISMATCHES' if failed else 'identical records'}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark runner for the import scripts
+
+Generates a synthetic export (bench/synth.py), starts the local stand-in
+server (bench/standin.py) and runs import-blocks.py, upload-datalake.py and
+import-usbizdata.py against it as separate processes, exactly as they are
+run by hand. For each script it reports:
+  rows/sec       - records the stand-in accepted / wall time
+  latency        - server-side p50/p99 per request, plus the script's own
+                   client-side p50/p99 from its HTTP summary line
+  peak RSS       - max resident set of the script process (os.wait4)
+  stages         - parse (a --dry-run of the same input, importers only),
+                   startup (launch -> first request), transfer (first ->
+                   last response) and drain (last response -> exit)
+
+Each script gets a fresh parse cache, dedup index and data copy, so runs are
+cold and comparable. Results are saved as JSON; --compare prints the change
+against an earlier results file.
+
+Usage:
+  python scripts/bench/run.py [--rows N] [--scripts import-blocks,upload-datalake,import-usbizdata] [--out results.json]
+
+Examples:
+  python scripts/bench/run.py --rows 200000 --latency-ms 30 --out before.json
+  python scripts/bench/run.py --rows 200000 --latency-ms 30 --out after.json --compare before.json
+  python scripts/bench/run.py --dirty --error-rate 0.02 --throttle-rate 0.02 --script-args "import-blocks:--concurrency 4"
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from standin import Faults, StandIn  # noqa: E402
+from synth import generate  # noqa: E402
+
+SCRIPTS = ("import-blocks", "upload-datalake", "import-usbizdata")
+SECTOR = "realtors"
+_CLIENT_LATENCY = re.compile(r"latency p50 ([\d.]+)s / p99 ([\d.]+)s")
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def command(script, data, extra):
+    """argv for one script against the generated data"""
+    target = data["csv"] if script == "import-usbizdata" else data["blocks"]
+    return [sys.executable, str(SCRIPTS_DIR / f"{script}.py"), target, "--sector", SECTOR, *extra]
+
+
+def run_process(argv, env):
+    """Run to completion; returns (exit code, wall seconds, peak RSS MB, started, finished, output)"""
+    started = time.time()
+    proc = subprocess.Popen(argv, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = proc.stdout.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    finished = time.time()
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    proc.stdout.close()
+    peak_kb = usage.ru_maxrss if sys.platform != "darwin" else usage.ru_maxrss / 1024
+    return proc.returncode, finished - started, peak_kb / 1024, started, finished, output.decode("utf-8", "replace")
+
+
+def bench_script(script, data, standin, extra, workdir):
+    """Benchmark one script; returns its metrics dict"""
+    # Fresh copy of the input and fresh caches, so every script runs cold
+    run_dir = workdir / script
+    shutil.rmtree(run_dir, ignore_errors=True)
+    run_dir.mkdir()
+    local = {
+        "csv": shutil.copy(data["csv"], run_dir / "export.csv"),
+        "blocks": shutil.copytree(data["blocks"], run_dir / "blocks"),
+    }
+    env = dict(os.environ,
+               NEXTIER_API_URL=standin.url,
+               NEXTIER_FRONT_URL=standin.url,
+               NEXTIER_CACHE_DIR=str(run_dir / "cache"),
+               NEXTIER_DEDUP_DIR=str(run_dir / "dedup"),
+               PYTHONUNBUFFERED="1")
+
+    stages = {}
+    if script != "upload-datalake":
+        code, wall, _, _, _, output = run_process(command(script, local, [*extra, "--dry-run", "--no-cache"]), env)
+        if code != 0:
+            return {"error": f"dry run exited {code}", "output": output[-2000:]}
+        stages["parse"] = wall
+
+    standin.stats.reset()
+    code, wall, rss_mb, started, finished, output = run_process(command(script, local, extra), env)
+    server = standin.stats.snapshot()
+
+    if server["first_at"] is not None:
+        stages["startup"] = server["first_at"] - started
+        stages["transfer"] = server["last_at"] - server["first_at"]
+        stages["drain"] = finished - server["last_at"]
+
+    client = _CLIENT_LATENCY.search(output)
+    return {
+        "exit_code": code,
+        "wall_s": wall,
+        "records": server["records"],
+        "rows_per_sec": server["records"] / wall if wall else 0.0,
+        "requests": server["requests"],
+        "status": server["status"],
+        "bytes_sent": server["bytes_in"],
+        "server_p50_ms": server["p50_ms"],
+        "server_p99_ms": server["p99_ms"],
+        "client_p50_s": float(client.group(1)) if client else None,
+        "client_p99_s": float(client.group(2)) if client else None,
+        "peak_rss_mb": rss_mb,
+        "stages_s": stages,
+        **({"output": output[-2000:]} if code != 0 else {}),
+    }
+
+
+def print_result(script, r):
+    if "error" in r:
+        print(f"{script}: ERROR {r['error']}")
+        return
+    stages = ", ".join(f"{k} {v:.2f}s" for k, v in r["stages_s"].items())
+    client = f" (client p50 {r['client_p50_s']:.2f}s / p99 {r['client_p99_s']:.2f}s)" if r["client_p50_s"] is not None else ""
+    print(f"""{script}{'' if r['exit_code'] == 0 else f"  [exit {r['exit_code']}]"}
+  Throughput:  {r['rows_per_sec']:,.0f} rows/sec ({r['records']:,} records in {r['wall_s']:.2f}s)
+  Requests:    {r['requests']} {r['status']}, {r['bytes_sent'] / 1e6:.1f} MB sent
+  Latency:     p50 {r['server_p50_ms']:.1f}ms / p99 {r['server_p99_ms']:.1f}ms server-side{client}
+  Peak RSS:    {r['peak_rss_mb']:.1f} MB
+  Stages:      {stages}""")
+
+
+def compare(previous, current):
+    """Print rows/sec, p99 and RSS changes per script"""
+    print(f"\nCompared with {previous['created']} ({previous.get('git') or 'unknown commit'}):")
+    for script, now in current["results"].items():
+        before = previous.get("results", {}).get(script)
+        if not before or "error" in before or "error" in now:
+            continue
+        speed = now["rows_per_sec"] / before["rows_per_sec"] if before["rows_per_sec"] else float("nan")
+        print(f"  {script:18} {before['rows_per_sec']:>10,.0f} -> {now['rows_per_sec']:>10,.0f} rows/sec ({speed:.2f}x), "
+              f"p99 {before['server_p99_ms']:.1f} -> {now['server_p99_ms']:.1f}ms, "
+              f"RSS {before['peak_rss_mb']:.0f} -> {now['peak_rss_mb']:.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the import scripts against a local stand-in server")
+    parser.add_argument("--rows", type=int, default=100000, help="Synthetic rows (default: 100000)")
+    parser.add_argument("--block-rows", type=int, default=10000, help="Rows per block (default: 10000)")
+    parser.add_argument("--headers", default="usbiz", help="Header spelling for synth.py (default: usbiz)")
+    parser.add_argument("--dirty", action="store_true", help="Generate BOM/CRLF/cp1252/stray-header dirt")
+    parser.add_argument("--scripts", default=",".join(SCRIPTS), help=f"Comma-separated scripts (default: {','.join(SCRIPTS)})")
+    parser.add_argument("--script-args", action="append", default=[], help="Extra arguments for every script, or one script with a prefix, e.g. \"import-blocks:--delay 0\" (repeatable)")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Stand-in latency per request (default: 20)")
+    parser.add_argument("--jitter-ms", type=float, default=5, help="Stand-in latency jitter (default: 5)")
+    parser.add_argument("--ms-per-mb", type=float, default=0, help="Stand-in latency per MB of request body (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of 503 responses (default: 0)")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="Fraction of 429 responses (default: 0)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for data and injected faults (default: 42)")
+    parser.add_argument("--out", help="Results JSON (default: bench-<timestamp>.json in the current directory)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated data and per-script work directories")
+    args = parser.parse_args()
+
+    scripts = [s.strip() for s in args.scripts.split(",") if s.strip()]
+    unknown = set(scripts) - set(SCRIPTS)
+    if unknown:
+        print(f"ERROR: Unknown --scripts: {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+
+    extra = {script: [] for script in scripts}
+    for spec in args.script_args:
+        target, sep, rest = spec.partition(":")
+        if sep and target in SCRIPTS:
+            if target in extra:
+                extra[target] += shlex.split(rest)
+        else:
+            for script in scripts:
+                extra[script] += shlex.split(spec)
+
+    workdir = Path(tempfile.mkdtemp(prefix="usbiz-bench-"))
+
+    print(f"""
+================================================================================
+Import Benchmark
+================================================================================
+Rows:        {args.rows:,} ({args.headers} headers{', dirty' if args.dirty else ''}, {args.block_rows:,} per block)
+Scripts:     {', '.join(scripts)}
+Script Args: {'; '.join(args.script_args) or '(defaults)'}
+Stand-in:    {args.latency_ms:g}ms +/- {args.jitter_ms:g}ms + {args.ms_per_mb:g}ms/MB, {args.error_rate:.1%} 503s, {args.throttle_rate:.1%} 429s
+Work Dir:    {workdir}
+================================================================================
+""")
+
+    started = time.perf_counter()
+    data = {"csv": workdir / "export.csv", "blocks": workdir / "blocks"}
+    generate(data["csv"], args.rows, "csv", args.headers, args.block_rows, args.dirty, args.seed)
+    generate(data["blocks"], args.rows, "blocks", args.headers, args.block_rows, args.dirty, args.seed)
+    print(f"Generated data in {time.perf_counter() - started:.1f}s\n")
+
+    faults = Faults(args.latency_ms, args.jitter_ms, args.error_rate, args.throttle_rate, seed=args.seed,
+                    ms_per_mb=args.ms_per_mb)
+    standin = StandIn(faults=faults).start()
+    results = {}
+    try:
+        for script in scripts:
+            print(f"Running {script}...", flush=True)
+            results[script] = bench_script(script, data, standin, extra[script], workdir)
+            print_result(script, results[script])
+            print()
+    finally:
+        standin.stop()
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "git": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare", "keep")},
+        "results": results,
+    }
+    out = args.out or f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {out}")
+
+    if previous:
+        compare(previous, report)
+
+    if any("error" in r or r.get("exit_code") for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
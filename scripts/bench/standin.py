@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the import endpoints, for benchmarks
+
+Serves POST /api/sectors/import (JSON records, or columnar rows decoded
+like the route does) and POST /api/luci/datalake
+(multipart CSV upload: blocks, batches, partition files and partitions.json)
+with the response shapes the scripts read, without
+touching DO Spaces. Gzip request bodies are accepted like the real routes.
+Latency (fixed, plus optionally per MB of body), 5xx errors and 429 throttling can be injected to exercise retries
+and pacing. A record containing --reject-marker makes /api/sectors/import
+reject its whole request, like a poisoned row, to exercise --bisect.
+--lost-rate imports a request's records but answers 502, like a response
+lost on the way back; an import retried with the same Idempotency-Key is
+then answered without counting its records again, as the route does.
+Every request is timed so a runner can report server-side
+latency percentiles and when the first and last request happened.
+
+GET /__stats returns the counters as JSON; POST /__reset clears them.
+
+Usage:
+  python scripts/bench/standin.py [--port 8787] [--latency-ms 20] [--jitter-ms 10] [--error-rate 0.01] [--throttle-rate 0.02]
+
+Point the scripts at it with:
+  NEXTIER_API_URL=http://127.0.0.1:8787 NEXTIER_FRONT_URL=http://127.0.0.1:8787
+"""
+
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_BOUNDARY = re.compile(r'boundary="?([^";]+)"?')
+_FIELD = re.compile(rb'name="([^"]*)"')
+_FILENAME = re.compile(rb'filename="([^"]*)"')
+
+
+class Faults:
+    """Injected behaviour, shared by all handler threads"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, throttle_rate=0.0, retry_after=1, seed=None,
+                 ms_per_mb=0.0, reject_marker=None, reject_status=500, lost_rate=0.0):
+        self.latency_ms = latency_ms
+        self.lost_rate = lost_rate
+        self.reject_marker = reject_marker
+        self.reject_status = reject_status
+        self.ms_per_mb = ms_per_mb
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def draw(self, nbytes=0):
+        """(delay seconds, status override or None) for one request of nbytes (decoded)"""
+        with self.lock:
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            delay += self.ms_per_mb * nbytes / 1e6 / 1000
+            roll = self.rng.random()
+        if roll < self.throttle_rate:
+            return delay, 429
+        if roll < self.throttle_rate + self.error_rate:
+            return delay, 503
+        if roll < self.throttle_rate + self.error_rate + self.lost_rate:
+            return delay, "lost"
+        return delay, None
+
+
+class Stats:
+    """Per-request timings and counters"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.status = {}
+            self.records = 0
+            self.replays = 0
+            self.bytes_in = 0
+            self.latencies = []
+            self.first_at = None
+            self.last_at = None
+
+    def add(self, started, finished, status, records, nbytes):
+        with self.lock:
+            self.requests += 1
+            self.status[str(status)] = self.status.get(str(status), 0) + 1
+            self.records += records
+            self.bytes_in += nbytes
+            self.latencies.append(finished - started)
+            self.first_at = started if self.first_at is None else min(self.first_at, started)
+            self.last_at = finished if self.last_at is None else max(self.last_at, finished)
+
+    def snapshot(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+
+            def pct(p):
+                if not latencies:
+                    return 0.0
+                return latencies[min(len(latencies) - 1, int(round(p / 100 * (len(latencies) - 1))))]
+
+            return {
+                "requests": self.requests,
+                "status": dict(self.status),
+                "records": self.records,
+                "replays": self.replays,
+                "bytes_in": self.bytes_in,
+                "p50_ms": pct(50) * 1000,
+                "p99_ms": pct(99) * 1000,
+                "first_at": self.first_at,
+                "last_at": self.last_at,
+            }
+
+
+def decode_body(body, encoding):
+    encoding = (encoding or "").strip().lower()
+    if encoding in ("gzip", "x-gzip"):
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        return zlib.decompress(body)
+    return body
+
+
+def decode_columnar(body):
+    """Records of a {"columns", "dicts", "rows"} body, like lib/datalake/columnar.ts; ValueError if malformed"""
+    columns = body["columns"]
+    lookup = [body.get("dicts", {}).get(c) for c in columns]
+    records = []
+    for r, row in enumerate(body["rows"]):
+        if not isinstance(row, list) or len(row) != len(columns):
+            raise ValueError(f"rows[{r}] must have {len(columns)} values")
+        record = {}
+        for column, d, v in zip(columns, lookup, row):
+            if v is None:
+                continue
+            if d is not None:
+                if not isinstance(v, int) or not 0 <= v < len(d):
+                    raise ValueError(f"rows[{r}]: {column} code {v!r} out of range")
+                v = d[v]
+            record[column] = v
+        records.append(record)
+    return records
+
+
+def multipart_files(body, content_type):
+    """(field, filename, bytes) of each file part of a multipart/form-data body
+
+    Text fields named partition come back as ("partition", "", value).
+    """
+    match = _BOUNDARY.search(content_type or "")
+    if not match:
+        return []
+    delimiter = b"--" + match.group(1).encode()
+    files = []
+    for part in body.split(delimiter):
+        head, sep, data = part.partition(b"\r\n\r\n")
+        field = _FIELD.search(head)
+        if sep and field and field.group(1) in (b"file", b"header", b"partitionManifest", b"partition"):
+            filename = _FILENAME.search(head)
+            files.append((field.group(1).decode(), filename.group(1).decode() if filename else "",
+                          data[:-2] if data.endswith(b"\r\n") else data))
+    return files
+
+
+def make_handler(faults, stats):
+    imported_keys = set()  # Idempotency-Key values of imports already counted
+    keys_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, payload, headers=None):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_body(self):
+            if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                chunks = []
+                while True:
+                    size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                    if size == 0:
+                        self.rfile.readline()
+                        break
+                    chunks.append(self.rfile.read(size))
+                    self.rfile.readline()
+                return b"".join(chunks)
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        def do_GET(self):
+            if self.path == "/__stats":
+                self._send(200, stats.snapshot())
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_HEAD(self):
+            # Keep-alive pings from the scripts' --watch mode
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_POST(self):
+            started = time.time()
+            raw = self._read_body()
+            if self.path == "/__reset":
+                stats.reset()
+                self._send(200, {"success": True})
+                return
+
+            try:
+                size = len(decode_body(raw, self.headers.get("Content-Encoding")))
+            except (OSError, zlib.error):
+                size = len(raw)
+            delay, fault = faults.draw(size)
+            if delay:
+                time.sleep(delay)
+            records = 0
+            if fault == 429:
+                status, payload, headers = 429, {"error": "rate limited"}, {"Retry-After": str(faults.retry_after)}
+            elif fault and fault != "lost":
+                status, payload, headers = fault, {"error": "injected failure"}, None
+            elif self.path.startswith("/api/sectors/import"):
+                status, payload, headers = self._sectors_import(raw)
+                records = 0 if payload.get("replayed") else payload.get("imported", 0)
+            elif self.path.startswith("/api/luci/datalake"):
+                status, payload, headers = self._datalake(raw)
+                uploaded = payload.get("uploaded", {})
+                records = payload["records"] if isinstance(uploaded, list) else uploaded.get("records", 0)
+            else:
+                status, payload, headers = 404, {"error": f"no stand-in for {self.path}"}, None
+            if fault == "lost" and status == 200:
+                status, payload, headers = 502, {"error": "injected lost response"}, None
+
+            # Counted before replying, so a client that just got its last response sees it in /__stats
+            stats.add(started, time.time(), status, records, len(raw))
+            self._send(status, payload, headers)
+
+        def _sectors_import(self, raw):
+            try:
+                body = json.loads(decode_body(raw, self.headers.get("Content-Encoding")))
+            except (ValueError, OSError, zlib.error) as e:
+                return 400, {"error": f"bad body: {e}"}, None
+            records = body.get("records")
+            if isinstance(body.get("columns"), list) and isinstance(body.get("rows"), list):
+                try:
+                    records = decode_columnar(body)
+                except (ValueError, TypeError, AttributeError) as e:
+                    return 400, {"error": f"Invalid columnar payload: {e}"}, None
+            if not isinstance(records, list) or not records:
+                return 400, {"error": "records array is required and must not be empty"}, None
+            if faults.reject_marker:
+                for i, record in enumerate(records):
+                    if any(faults.reject_marker in str(v) for v in record.values()):
+                        return faults.reject_status, {"error": f"records[{i}]: cannot import {faults.reject_marker}"}, None
+            key = self.headers.get("Idempotency-Key")
+            replayed = False
+            if key:
+                with keys_lock:
+                    replayed = key in imported_keys
+                    imported_keys.add(key)
+            if replayed:
+                with stats.lock:
+                    stats.replays += 1
+            return 200, {
+                "success": True,
+                "imported": len(records),
+                **({"replayed": True} if replayed else {}),
+                "uploadId": f"bench-{time.time_ns()}",
+                "chunk": {"current": body.get("chunk", 1), "total": body.get("totalChunks", 1)},
+            }, None
+
+        def _datalake(self, raw):
+            try:
+                body = decode_body(raw, self.headers.get("Content-Encoding"))
+            except (OSError, zlib.error) as e:
+                return 400, {"error": f"bad body: {e}"}, None
+            parts = multipart_files(body, self.headers.get("Content-Type"))
+            keys = [data.decode() for field, _, data in parts if field == "partition"]
+            files = [f for f in parts if f[2] and f[0] in ("file", "header")]
+            manifests = [f for f in parts if f[2] and f[0] == "partitionManifest"]
+            if manifests:
+                manifest = json.loads(manifests[0][2])
+                return 200, {"success": True, "uploaded": [{"name": manifests[0][1], "path": "bench/", "records": 0,
+                                                            "isHeader": False, "success": True}],
+                             "records": 0, "partitions": {"by": manifest["by"], **manifest["totals"]}}, None
+            if not files:
+                return 400, {"error": "No file provided"}, None
+            is_header = b'name="isHeader"\r\n\r\ntrue' in body
+            uploaded = []
+            blocks = iter(keys)
+            for field, filename, data in files:
+                header = field == "header" or is_header
+                lines = data.count(b"\n") + (0 if data.endswith(b"\n") else 1)
+                uploaded.append({"name": filename, "path": "bench/", "records": 0 if header else lines,
+                                 "isHeader": header, "success": True})
+                if not header and keys:
+                    uploaded[-1]["partition"] = next(blocks, None)
+            if len(files) == 1 and files[0][0] == "file" and b'name="batch"\r\n\r\ntrue' not in body:
+                return 200, {"success": True, "uploaded": uploaded[0]}, None
+            # Batch shape, like the route with batch=true, several file parts or a header part
+            return 200, {"success": True, "uploaded": uploaded,
+                         "records": sum(u["records"] for u in uploaded)}, None
+
+    return Handler
+
+
+class StandIn:
+    """The stand-in server on a background thread"""
+
+    def __init__(self, port=0, faults=None):
+        self.faults = faults or Faults()
+        self.stats = Stats()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(self.faults, self.stats))
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for /api/sectors/import and /api/luci/datalake")
+    parser.add_argument("--port", type=int, default=8787, help="Port (default: 8787)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added latency per request (default: 0)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Uniform +/- jitter on the latency (default: 0)")
+    parser.add_argument("--ms-per-mb", type=float, default=0, help="Extra latency per MB of decoded body (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests answered 503 (default: 0)")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="Fraction of requests answered 429 (default: 0)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429 (default: 1)")
+    parser.add_argument("--reject-marker", help="Reject /api/sectors/import requests with a record containing this text")
+    parser.add_argument("--reject-status", type=int, default=500, help="Status for --reject-marker (default: 500)")
+    parser.add_argument("--lost-rate", type=float, default=0,
+                        help="Fraction of requests processed but answered 502, as if the response was lost (default: 0)")
+    args = parser.parse_args()
+
+    faults = Faults(args.latency_ms, args.jitter_ms, args.error_rate, args.throttle_rate, args.retry_after,
+                    ms_per_mb=args.ms_per_mb, reject_marker=args.reject_marker, reject_status=args.reject_status,
+                    lost_rate=args.lost_rate)
+    standin = StandIn(args.port, faults)
+    print(f"Stand-in listening on {standin.url} (Ctrl-C to stop)")
+    try:
+        standin.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
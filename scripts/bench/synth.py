@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Synthetic USBizData exports for benchmarks
+
+Writes either one CSV (what import-usbizdata.py reads) or a block folder
+(header.csv + block_NNNN.csv, what import-blocks.py and upload-datalake.py
+read) with realistic-looking rows under one of the header spellings that
+normalize_headers() maps. Optional dirt reproduces what real exports throw
+at the parsers: a UTF-8 BOM, CRLF line endings, stray cp1252 bytes, quoted
+newlines, blank lines and header rows repeated mid-file or at the top of
+blocks.
+
+Usage:
+  python scripts/bench/synth.py <out> [--rows N] [--format csv|blocks] [--headers usbiz|snake|short] [--dirty]
+
+Examples:
+  python scripts/bench/synth.py /tmp/realtors.csv --rows 500000
+  python scripts/bench/synth.py /tmp/realtors_blocks --format blocks --block-rows 10000 --dirty
+"""
+
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+
+# Column spellings seen in exports; all of them map through normalize_headers()
+HEADER_VARIANTS = {
+    "usbiz": [
+        "Company Name", "Address", "City", "State", "Zip", "County", "Phone",
+        "Contact First", "Contact Last", "Title", "Direct Phone", "Email",
+        "Website", "Employee Range", "Annual Sales", "SIC Code", "Industry",
+    ],
+    "snake": [
+        "company_name", "address", "city", "state", "zip_code", "county", "phone_number",
+        "first_name", "last_name", "title", "direct_phone", "email_address",
+        "website", "employee_count", "annual_revenue", "sic_code", "sic_description",
+    ],
+    "short": [
+        "business", "street", "city", "state", "zipcode", "county", "tel",
+        "fname", "lname", "title", "mobile", "email",
+        "url", "employees", "revenue", "siccode", "industry",
+    ],
+}
+
+STATES = ["TX", "CA", "NY", "FL", "IL", "PA", "OH", "GA", "NC", "MI", "NJ", "VA", "WA", "AZ", "MA"]
+# --states all: every state and DC, like a nationwide export
+ALL_STATES = STATES + ["AL", "AK", "AR", "CO", "CT", "DE", "DC", "HI", "ID", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
+                       "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NM", "ND", "OK", "OR", "RI", "SC", "SD", "TN", "UT",
+                       "VT", "WV", "WI", "WY"]
+CITIES = ["Springfield", "Riverside", "Franklin", "Greenville", "Fairview", "Madison", "Georgetown", "Salem"]
+STREETS = ["Main St", "Oak Ave", "Park Blvd", "Elm St", "Cedar Ln", "Maple Dr", "Lakeview Rd"]
+FIRST = ["Pat", "Jordan", "Alex", "Sam", "Chris", "Taylor", "Morgan", "Casey", "Jamie", "Robin"]
+LAST = ["Smith", "Johnson", "Garcia", "Nguyen", "Brown", "Miller", "Davis", "Lopez", "Wilson"]
+SUFFIX = ["LLC", "Inc", "Group", "Realty", "& Associates", "Co"]
+EMPLOYEES = ["1 to 4", "5 to 9", "10 to 19", "20 to 49"]
+SALES = ["Less Than $500,000", "$500,000 to $1 Million", "$1 to 2.5 Million", "$2.5 to 5 Million"]
+SIC = [("6531", "Real Estate Agents & Managers"), ("1711", "Plumbing, Heating & Air-Conditioning"),
+       ("8742", "Management Consulting Services")]
+
+
+def make_row(i, rng, dirty, states=STATES):
+    """One data row as a list of strings"""
+    first = rng.choice(FIRST)
+    last = rng.choice(LAST)
+    sic, industry = rng.choice(SIC)
+    company = f"{last} {rng.choice(SUFFIX)} {i}"
+    address = f"{rng.randint(1, 9999)} {rng.choice(STREETS)}"
+    if dirty and rng.random() < 0.01:
+        address += f"\nSuite {rng.randint(100, 999)}"  # quoted newline
+    if dirty and rng.random() < 0.02:
+        company = f'"{company}" Holdings'  # embedded quotes
+    return [
+        company, address, rng.choice(CITIES), rng.choice(states),
+        f"{rng.randint(10000, 99999)}", "Greene",
+        f"({rng.randint(200, 989)}) 555-{i % 10000:04d}",
+        first, last if i % 7 else "", "Owner", "" if i % 5 else f"{rng.randint(200, 989)}555{i % 10000:04d}",
+        f"{first.lower()}{i}@{last.lower()}{i}.com" if i % 3 else "",
+        f"www.{last.lower()}{i}.com" if i % 2 else "", rng.choice(EMPLOYEES), rng.choice(SALES), sic, industry,
+    ]
+
+
+def encode_rows(rows, newline, rng, dirty):
+    """CSV-encode rows to bytes, sprinkling cp1252 bytes in when dirty"""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator=newline).writerows(rows)
+    data = buf.getvalue().encode("utf-8")
+    if dirty:
+        # Exports are mostly UTF-8 but some rows come through as cp1252 ("Café")
+        data = data.replace(b"Greene", b"Gr\xe9ene", max(1, len(rows) // 200))
+    return data
+
+
+def generate(out, rows=100000, fmt="csv", headers="usbiz", block_rows=10000, dirty=False, seed=42, states=STATES):
+    """Write the dataset; returns the number of data rows written"""
+    rng = random.Random(seed)
+    header = HEADER_VARIANTS[headers]
+    newline = "\r\n" if dirty else "\n"
+    header_line = encode_rows([header], newline, rng, False)
+    bom = b"\xef\xbb\xbf" if dirty else b""
+
+    def batches():
+        for start in range(0, rows, block_rows):
+            batch = [make_row(i, rng, dirty, states) for i in range(start, min(rows, start + block_rows))]
+            yield batch
+
+    if fmt == "csv":
+        with open(out, "wb") as f:
+            f.write(bom + header_line)
+            for n, batch in enumerate(batches()):
+                if dirty and n and n % 10 == 0:
+                    f.write(header_line)  # stray header row from concatenated exports
+                if dirty:
+                    f.write(newline.encode())  # blank line
+                f.write(encode_rows(batch, newline, rng, dirty))
+    else:
+        os.makedirs(out, exist_ok=True)
+        with open(os.path.join(out, "header.csv"), "wb") as f:
+            f.write(bom + header_line)
+        for n, batch in enumerate(batches(), start=1):
+            with open(os.path.join(out, f"block_{n:04d}.csv"), "wb") as f:
+                if dirty and n % 4 == 1:
+                    f.write(header_line)  # some blocks repeat the header
+                f.write(encode_rows(batch, newline, rng, dirty))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic USBizData export")
+    parser.add_argument("out", help="Output CSV file (--format csv) or folder (--format blocks)")
+    parser.add_argument("--rows", type=int, default=100000, help="Data rows (default: 100000)")
+    parser.add_argument("--format", choices=["csv", "blocks"], default="csv", help="Single CSV or block folder (default: csv)")
+    parser.add_argument("--headers", choices=sorted(HEADER_VARIANTS), default="usbiz", help="Header spelling (default: usbiz)")
+    parser.add_argument("--block-rows", type=int, default=10000, help="Rows per block (default: 10000)")
+    parser.add_argument("--dirty", action="store_true", help="BOM, CRLF, cp1252 bytes, quoted newlines, blank lines, stray headers")
+    parser.add_argument("--states", choices=["15", "all"], default="15",
+                        help="15 large states, or all 50 and DC (default: 15)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    args = parser.parse_args()
+
+    if args.rows < 1 or args.block_rows < 1:
+        print("ERROR: --rows and --block-rows must be at least 1")
+        sys.exit(1)
+
+    generate(args.out, args.rows, args.format, args.headers, args.block_rows, args.dirty, args.seed,
+             ALL_STATES if args.states == "all" else STATES)
+    print(f"Wrote {args.rows:,} rows ({args.format}, {args.headers} headers{', dirty' if args.dirty else ''}) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
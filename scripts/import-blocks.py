@@ -4,34 +4,53 @@ USBizData Block Importer
 Imports pre-chunked CSV blocks from USBizData to NEXTIER API
 
 Usage:
-  python import-blocks.py <folder> --sector <sector_id> [--start <block_num>] [--dry-run]
+  python import-blocks.py <folder> --sector <sector_id> [--start <block_num>] [--dry-run] [--resume]
 
 Examples:
   python import-blocks.py "C:/Users/colep/Downloads/CampaignBlocks/Plumbing" --sector plumbers_hvac
   python import-blocks.py "C:/Users/colep/Downloads/CampaignBlocks/Consultants/SIC_8742" --sector business_consultants_8742
   python import-blocks.py "C:/Users/colep/Downloads/CampaignBlocks/Realtors/SIC_6531" --sector realtors --start 50
+  python import-blocks.py "C:/Users/colep/Downloads/CampaignBlocks/Realtors/SIC_6531" --sector realtors --resume --dedup --bisect
+  python import-blocks.py "C:/Users/colep/Downloads/CampaignBlocks/Realtors/SIC_6531" --sector realtors --watch --idle-exit 1800
+  python import-blocks.py ".../Realtors/2026Q3" --sector realtors --since ".../Realtors/2026Q2/.fingerprints-realtors-tm_nextiertech.sqlite"
 
-The folder should contain:
+The folder should contain (split-blocks.py creates it from a raw export):
   - header.csv (column headers)
   - block_0001.csv, block_0002.csv, ... (data blocks without headers)
+
+Every run journals per-block outcomes in the folder, so --resume re-sends
+only what didn't go through. --help lists the other options; usbiz/ has
+how each works (pacing, request sizing, parsers, normalization, dedup,
+delta imports, bisecting, metrics).
 """
 
 import csv
 import json
-import requests
 import argparse
 import sys
 import os
 import glob
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
-import time
+
+from usbiz import columnar, deadletter, dedup, importer, metrics, normalize, parsers, preflight, ratecontrol, sizing, transport, watch
+from usbiz.cache import RecordCache, cache_key, default_cache_dir
+from usbiz.delta import FingerprintStore, default_store_path, default_tombstone_path
+from usbiz.journal import Journal, file_hash, journal_path, record_digest, unsent
+from usbiz.projection import Projection
+from usbiz.sizing import RequestSizer
 
 # Configuration
 API_BASE = os.getenv("NEXTIER_API_URL", "https://outreach-global-api-4z29z.ondigitalocean.app")
 API_KEY = os.getenv("NEXTIER_API_KEY", "")
 FRONT_URL = os.getenv("NEXTIER_FRONT_URL", "https://outreachglobal.app")
 DEFAULT_TEAM = os.getenv("NEXTIER_TEAM_ID", "tm_nextiertech")
+REQUEST_TIMEOUT = 180  # seconds
+DEFAULT_DELAY = 0.5  # starting delay between blocks (seconds)
 
 # Sector mappings
 SECTORS = {
@@ -95,82 +114,106 @@ def normalize_headers(headers):
         normalized[h] = mapping.get(key, key.replace(" ", "_"))
     return normalized
 
-def read_block(header_path, block_path):
-    """Read a block CSV using header from header.csv"""
+def read_block(header_path, block_path, stats=None, parser=None):
+    """Read a block CSV using header from header.csv (timings go to stats, a Metrics)
+
+    parser picks the usbiz.parsers backend (None = fastest installed); all
+    backends return the same records.
+    """
+    started = time.perf_counter()
     # Read headers
     with open(header_path, 'r', encoding='utf-8-sig', errors='replace') as f:
         reader = csv.reader(f)
         headers = next(reader)
 
-    header_map = normalize_headers(headers)
+    project = Projection(headers, normalize_headers(headers))
 
     # Read block data
-    records = []
     with open(block_path, 'r', encoding='utf-8-sig', errors='replace') as f:
-        reader = csv.DictReader(f, fieldnames=headers)
-
-        # Skip header row if present in block
-        first_row = next(reader)
-        if first_row.get(headers[0], "").strip() != headers[0]:
-            # First row is data, not header - include it
-            record = {}
-            for orig_key, new_key in header_map.items():
-                if orig_key in first_row and first_row[orig_key]:
-                    record[new_key] = first_row[orig_key].strip()
-            if record:
-                records.append(record)
-
-        # Read rest of rows
-        for row in reader:
-            record = {}
-            for orig_key, new_key in header_map.items():
-                if orig_key in row and row[orig_key]:
-                    record[new_key] = row[orig_key].strip()
-
-            # Combine first + last if no contact_name
-            if "contact_name" not in record:
-                first = record.get("first_name", "")
-                last = record.get("last_name", "")
-                if first or last:
-                    record["contact_name"] = f"{first} {last}".strip()
-
-            if record:
-                records.append(record)
+        text = f.read()
+    read_done = time.perf_counter()
 
-    return records
-
-def import_block(records, sector_id, team_id, block_num, total_blocks):
-    """Import a block of records to the API"""
-    endpoint = f"{API_BASE}/api/sectors/import"
+    # Blank lines and a header row repeated at the top of the block are skipped
+    records, rows = parsers.parse(text, project, first_column=headers[0], backend=parser, stats=stats)
 
-    headers = {
-        "Content-Type": "application/json",
-        "x-team-id": team_id,
-    }
-    if API_KEY:
-        headers["Authorization"] = f"Bearer {API_KEY}"
-
-    payload = {
-        "sectorId": sector_id,
-        "records": records,
-        "source": "usbizdata_blocks",
-        "chunk": block_num,
-        "totalChunks": total_blocks,
-    }
-
-    try:
-        response = requests.post(endpoint, json=payload, headers=headers, timeout=180)
+    if stats is not None:
+        stats.time("read", read_done - started)
+        stats.time("parse", time.perf_counter() - read_done)
+        stats.add("rows_read", rows)
+        stats.add("bytes_read", os.path.getsize(block_path))
+    return records
 
-        if response.status_code == 200:
-            data = response.json()
-            return {"success": True, "imported": data.get("imported", len(records))}
-        else:
-            return {"success": False, "error": f"HTTP {response.status_code}: {response.text[:200]}"}
+def load_block(header_path, block_path, cache_dir=None, parser=None, clean=True):
+    """read_block through the parse cache in cache_dir; returns (records, cached, exported stage metrics)
+
+    clean=True normalizes phone/zip/state/email/website column-wise after
+    loading (usbiz/normalize.py); the cache holds records as parsed.
+    """
+    stats = metrics.Metrics()
+    records, cached = cached_block(header_path, block_path, cache_dir, parser, stats)
+    if clean:
+        normalize.normalize_records(records, stats)
+    return records, cached, stats.export()
+
+def cached_block(header_path, block_path, cache_dir, parser, stats):
+    """(records, cached) of a block, from the parse cache when it has them"""
+    if not cache_dir:
+        return read_block(header_path, block_path, stats, parser), False
+
+    with open(header_path, 'rb') as f:
+        header = f.read()
+    headers = next(csv.reader([header.decode('utf-8-sig', errors='replace').splitlines()[0]]), [])
+    key = cache_key("import-blocks", file_hash(block_path), header, json.dumps(normalize_headers(headers)),
+                    parsers.backend_name(parser))
+
+    cache = RecordCache(cache_dir)
+    with stats.stage("cache_load"):
+        records = cache.get(key)
+    if records is not None:
+        stats.add("bytes_read", os.path.getsize(block_path))
+        return records, True
+    records = read_block(header_path, block_path, stats, parser)
+    with stats.stage("cache_store"):
+        cache.put(key, records)
+    return records, False
+
+def parse_blocks(header_path, blocks, workers=1, cache_dir=None, parser=None, clean=True):
+    """Yield (block_path, records, error, cached) in block order.
+
+    With workers > 1, blocks are parsed in a process pool at most 2*workers
+    ahead of the consumer, so memory stays bounded while the uploader drains.
+    Stage timings from the parse (in whichever process) go to the run's metrics.
+    """
+    stats = metrics.get_metrics()
+    if workers <= 1:
+        for block_path in blocks:
+            try:
+                records, cached, parse_stats = load_block(header_path, block_path, cache_dir, parser, clean)
+            except Exception as e:
+                yield block_path, None, e, False
+            else:
+                stats.merge(parse_stats)
+                yield block_path, records, None, cached
+        return
 
-    except requests.exceptions.Timeout:
-        return {"success": False, "error": "Request timeout (180s)"}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    remaining = iter(blocks)
+    ahead = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for block_path in islice(remaining, workers * 2):
+            ahead.append((block_path, pool.submit(load_block, header_path, block_path, cache_dir, parser, clean)))
+
+        while ahead:
+            block_path, future = ahead.popleft()
+            for next_path in islice(remaining, 1):
+                ahead.append((next_path, pool.submit(load_block, header_path, next_path, cache_dir, parser, clean)))
+            try:
+                with stats.stage("parse_wait"):
+                    records, cached, parse_stats = future.result()
+            except Exception as e:
+                yield block_path, None, e, False
+            else:
+                stats.merge(parse_stats)
+                yield block_path, records, None, cached
 
 def find_blocks(folder):
     """Find all block_*.csv files in folder"""
@@ -186,10 +229,78 @@ def main():
     parser.add_argument("--start", type=int, default=1, help="Start from block number (default: 1)")
     parser.add_argument("--end", type=int, default=0, help="End at block number (0 = all)")
     parser.add_argument("--dry-run", action="store_true", help="Parse but don't import")
-    parser.add_argument("--delay", type=float, default=0.5, help="Delay between blocks (seconds)")
+    parser.add_argument("--preflight", action="store_true", help="Count rows and check columns from raw bytes, write the folder manifest, don't import")
+    parser.add_argument("--delay", type=float, default=None, help="Fixed delay between blocks in seconds (default: adaptive)")
+    parser.add_argument("--concurrency", type=int, default=None, help="Import requests in flight: fixed with --delay (default 1), else adaptive ceiling (default 1)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes parsing blocks ahead of the uploader (default: 1; --preflight: one per CPU)")
+    parser.add_argument("--resume", action="store_true", help="Skip blocks the journal has as imported and unchanged")
+    parser.add_argument("--journal", help="Journal file (default: .journal-import-<sector>-<team>.jsonl in the folder)")
+    parser.add_argument("--dedup", action="store_true", help="Drop records already uploaded (phone/email/company+zip index)")
+    parser.add_argument("--dedup-index", help="Dedup index directory (default: ~/.nextier/dedup/<team>)")
+    parser.add_argument("--dedup-keys", default=",".join(dedup.KEY_KINDS), help=f"Comma-separated dedup keys (default: {','.join(dedup.KEY_KINDS)})")
+    parser.add_argument("--dedup-memory", type=int, default=dedup.DEFAULT_MEMORY_MB, help=f"Dedup index memory budget in MB (default: {dedup.DEFAULT_MEMORY_MB})")
+    parser.add_argument("--compress", choices=transport.COMPRESSIONS, default=None, help="Compress request bodies (default: off)")
+    parser.add_argument("--no-stream", action="store_true", help="Build each request body in memory and send it with Content-Length instead of streaming it chunked")
+    parser.add_argument("--cache-dir", help="Parse cache directory (default: ~/.nextier/cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Always parse blocks; don't read or write the parse cache")
+    parser.add_argument("--since", help="Fingerprint store of the previous release: only send added/changed records")
+    parser.add_argument("--snapshot", nargs="?", const="", default=None, help="Write this release's fingerprints (default path: .fingerprints-<sector>-<team>.sqlite in the folder; implied by --since)")
+    parser.add_argument("--tombstones", help="Removed-keys file for --since (default: tombstones-<sector>-<team>.jsonl in the folder)")
+    sizing.add_arguments(parser)
+    parsers.add_arguments(parser)
+    normalize.add_arguments(parser)
+    deadletter.add_arguments(parser)
+    columnar.add_arguments(parser)
+    watch.add_arguments(parser)
+    metrics.add_arguments(parser)
 
     args = parser.parse_args()
 
+    if args.concurrency is not None and args.concurrency < 1:
+        print("ERROR: --concurrency must be at least 1")
+        sys.exit(1)
+    if args.watch and (args.dry_run or args.preflight):
+        print("ERROR: --watch can't be combined with --dry-run or --preflight")
+        sys.exit(1)
+    preflight_workers = args.workers
+    args.workers = args.workers or 1
+    if args.watch and args.workers > 1:
+        # Parsing ahead would hold each block back until the next ones land
+        print("Note: --watch parses blocks as they arrive; ignoring --workers")
+        args.workers = 1
+    if args.workers < 1:
+        print("ERROR: --workers must be at least 1")
+        sys.exit(1)
+    if args.request_kb < 1:
+        print("ERROR: --request-kb must be at least 1")
+        sys.exit(1)
+    if args.bisect_max_requests < 1:
+        print("ERROR: --bisect-max-requests must be at least 1")
+        sys.exit(1)
+    try:
+        csv_parser = parsers.backend_name(args.parser)
+    except ValueError as e:
+        print(f"ERROR: --parser {e}")
+        sys.exit(1)
+    clean = not args.no_normalize
+    sizer = RequestSizer(REQUEST_TIMEOUT, args.request_kb, adaptive=not args.fixed_request_size)
+    uploader = importer.Importer(API_BASE, API_KEY, args.sector, args.team, "usbizdata_blocks", REQUEST_TIMEOUT,
+                                 args.compress, not args.no_stream, sizer,
+                                 args.bisect_max_requests if args.bisect else 0)
+
+    dedup_kinds = [k.strip() for k in args.dedup_keys.split(",") if k.strip()]
+    unknown = set(dedup_kinds) - set(dedup.KEY_KINDS)
+    if unknown:
+        print(f"ERROR: Unknown --dedup-keys: {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
+    cache_dir = None if args.no_cache else (args.cache_dir or default_cache_dir())
+    if args.since and not os.path.exists(args.since):
+        print(f"ERROR: Fingerprint store not found: {args.since}")
+        sys.exit(1)
+
+    rate = ratecontrol.from_args(args.delay, args.concurrency, REQUEST_TIMEOUT, DEFAULT_DELAY)
+
     # Validate folder
     folder_path = Path(args.folder)
     if not folder_path.exists():
@@ -197,13 +308,21 @@ def main():
         sys.exit(1)
 
     header_path = folder_path / "header.csv"
-    if not header_path.exists():
+    watcher = None
+    if args.watch:
+        watcher = watch.BlockWatcher(folder_path, settle=args.settle, poll=args.poll, idle_exit=args.idle_exit)
+        watch.stop_on_signals(watcher)
+        if not header_path.exists():
+            print(f"Waiting for {header_path}...", flush=True)
+        if not watcher.wait_for(header_path):
+            sys.exit(1)
+    elif not header_path.exists():
         print(f"ERROR: header.csv not found in {folder_path}")
         sys.exit(1)
 
     # Find blocks
     blocks = find_blocks(folder_path)
-    if not blocks:
+    if not blocks and not args.watch:
         print(f"ERROR: No block_*.csv files found in {folder_path}")
         sys.exit(1)
 
@@ -213,6 +332,16 @@ def main():
     start_idx = args.start - 1
     end_idx = args.end if args.end > 0 else total_blocks
     blocks_to_process = blocks[start_idx:end_idx]
+    numbered = list(enumerate(blocks, start=1))[start_idx:end_idx]
+    if args.watch:
+        # Blocks are numbered by file name and arrive while running; the total isn't known
+        end_idx = args.end if args.end > 0 else float("inf")
+        total_blocks = "?"
+
+    if args.preflight:
+        print(f"Preflight: {len(blocks_to_process)} blocks in {folder_path}")
+        sys.exit(preflight.run(folder_path, blocks_to_process, preflight_workers))
+    manifest = preflight.Manifest.load(folder_path)
 
     print(f"""
 ================================================================================
@@ -222,7 +351,18 @@ Folder:      {folder_path}
 Sector:      {args.sector} ({SECTORS.get(args.sector, 'Unknown')})
 Team:        {args.team}
 Total Blocks: {total_blocks}
-Processing:  Blocks {args.start} to {end_idx} ({len(blocks_to_process)} blocks)
+Processing:  {f"watching for blocks {args.start} to {args.end or 'end'} (settle {args.settle:g}s)" if args.watch else f"Blocks {args.start} to {end_idx} ({len(blocks_to_process)} blocks)"}
+Pacing:      {rate.describe()}
+Compression: {args.compress or 'none'}
+Requests:    {sizer.describe()}
+Body:        {args.wire}, {'buffered' if args.no_stream else 'streamed'} ({transport.JSON_ENCODERS[0]})
+Workers:     {args.workers}
+Parser:      {csv_parser}
+Normalize:   {'off' if not clean else 'phone, zip, state, email, website'}
+Bisect:      {f"on 400/413/422/500, up to {args.bisect_max_requests} requests" if args.bisect else 'off (a rejected request fails its block)'}
+Parse Cache: {cache_dir or 'off'}
+Manifest:    {f"{len(manifest)} blocks preflighted" if manifest else "none (--preflight writes one)"}
+Delta Since: {args.since or 'off (full import)'}
 API:         {API_BASE}
 ================================================================================
 """)
@@ -236,48 +376,237 @@ API:         {API_BASE}
     if args.dry_run:
         # Just count records
         total_records = 0
-        for block_path in blocks_to_process:
-            records = read_block(header_path, block_path)
+        cached_blocks = 0
+        # Classify against --since without writing a snapshot
+        delta = FingerprintStore(":memory:", since=args.since) if args.since else None
+        for block_path, records, error, cached in parse_blocks(header_path, blocks_to_process, args.workers, cache_dir, csv_parser, clean):
+            if error is not None:
+                raise error
             total_records += len(records)
+            cached_blocks += cached
             block_name = os.path.basename(block_path)
-            print(f"{block_name}: {len(records)} records")
-        print(f"\n[DRY RUN] Would import {total_records:,} records from {len(blocks_to_process)} blocks")
+            note = " (cached)" if cached else ""
+            if delta:
+                added, changed, unchanged, token = delta.filter(records)
+                delta.commit(token)
+                note += f" ({len(added):,} added, {len(changed):,} changed, {unchanged:,} unchanged)"
+            print(f"{block_name}: {len(records)} records{note}")
+        print(f"\n[DRY RUN] Would import {total_records:,} records from {len(blocks_to_process)} blocks ({cached_blocks} from parse cache)")
+        if clean:
+            print(f"[DRY RUN] Rejected values: {normalize.rejects_summary(metrics.get_metrics())}")
+        if delta:
+            counts = delta.counts
+            removed = sum(1 for _ in delta.removed()) if blocks_to_process == blocks else None
+            print(f"[DRY RUN] Delta: {counts['added'] + counts['changed']:,} to send ({counts['added']:,} added, "
+                  f"{counts['changed']:,} changed), {counts['unchanged']:,} unchanged"
+                  + (f", {removed:,} removed" if removed is not None else ""))
+            delta.close()
         return
 
+    # Journal every block; on --resume skip what is already imported and unchanged
+    journal = Journal(args.journal or journal_path(folder_path, "import", args.sector, args.team))
+    hashes = {} if args.watch else {block_path: manifest.file_hash(block_path) for _, block_path in numbered}
+    skipped = []
+    if args.resume and not args.watch:
+        skipped = [i for i, block_path in numbered
+                   if journal.completed(os.path.basename(block_path), hashes[block_path])]
+        done = set(skipped)
+        numbered = [(i, block_path) for i, block_path in numbered if i not in done]
+        print(f"Resume: {len(skipped)} blocks already imported ({journal.path})")
+        if not numbered:
+            print("Nothing left to import.")
+            return
+
+    delta = None
+    if args.since or args.snapshot is not None:
+        store_path = args.snapshot or default_store_path(folder_path, args.sector, args.team)
+        if args.since and os.path.abspath(store_path) == os.path.abspath(args.since):
+            print("ERROR: --snapshot must differ from --since (write each release's fingerprints to its own file)")
+            sys.exit(1)
+        delta = FingerprintStore(store_path, since=args.since)
+        print(f"Fingerprints: {delta.path}{f' (comparing against {args.since})' if args.since else ''}")
+
+    dead_letters = None
+    if args.bisect:
+        dead_letters = deadletter.DeadLetters(args.dead_letter or deadletter.default_path(folder_path, "import", args.sector, args.team))
+        print(f"Dead letters: {dead_letters.path}")
+
+    index = None
+    if args.dedup:
+        index = dedup.DedupIndex(args.dedup_index or dedup.default_index_dir(args.team),
+                                 memory_mb=args.dedup_memory, kinds=dedup_kinds)
+        print(f"Dedup: {', '.join(dedup_kinds)} ({index.directory})")
+
     # Import blocks
-    print(f"Importing {len(blocks_to_process)} blocks...")
+    print(f"Watching {folder_path} for blocks (Ctrl-C to stop)..." if args.watch else f"Importing {len(numbered)} blocks...")
     print("-" * 60)
 
     imported_total = 0
+    duplicates_total = 0
+    cached_blocks = 0
+    read_errors = 0
+    processed = 0
     failed_blocks = []
     start_time = datetime.now()
 
-    for i, block_path in enumerate(blocks_to_process, start=args.start):
-        block_name = os.path.basename(block_path)
+    # Up to rate.concurrency requests run in a thread pool. Results are reported
+    # strictly in block order, so output and failed_blocks match a serial run.
+    pending = deque()
 
-        # Read block
-        try:
-            records = read_block(header_path, block_path)
-        except Exception as e:
-            print(f"Block {i}/{total_blocks} ({block_name}): READ ERROR - {e}")
+    def report(entry):
+        nonlocal imported_total, duplicates_total, read_errors
+        i = entry["block"]
+        block_name = entry["name"]
+        if "error" in entry:
+            print(f"Block {i}/{total_blocks} ({block_name}): READ ERROR - {entry['error']}")
             failed_blocks.append(i)
-            continue
-
-        print(f"Block {i}/{total_blocks} ({block_name}): {len(records):,} records... ", end="", flush=True)
-
-        # Import
-        result = import_block(records, args.sector, args.team, i, total_blocks)
-
+            read_errors += 1
+            journal.record(block_name, entry["hash"], "read_error", block=i, error=str(entry["error"]))
+            return
+
+        count = entry["count"]
+        dropped = entry["duplicates"]
+        notes = []
+        if entry["resumed"]:
+            notes.append(f"{entry['resumed']:,} imported before")
+        if args.since:
+            notes.append(f"{entry['added']:,} added, {entry['changed']:,} changed, {entry['unchanged']:,} unchanged")
+        if index:
+            notes.append(f"{dropped:,} duplicates dropped")
+        note = f" ({', '.join(notes)})" if notes else ""
+        print(f"Block {i}/{total_blocks} ({block_name}): {count:,} records{note}... ", end="", flush=True)
+        with stats.stage("upload_wait"):
+            result = entry["future"].result()
+
+        importer.settle(result, index, entry.get("keys"), delta, entry.get("fingerprints"))
         if result["success"]:
             imported_total += result["imported"]
-            print(f"OK ({result['imported']:,} imported)")
+            duplicates_total += dropped
+            dead = result.get("dead_letters", [])
+            if dead:
+                dead_letters.write(block_name, dead)
+            print(f"OK ({result['imported']:,} imported{f', {len(dead):,} dead-lettered' if dead else ''})")
+            journal.record(block_name, entry["hash"], "ok", block=i, records=count, duplicates=dropped,
+                           unchanged=entry.get("unchanged", 0), imported=result["imported"],
+                           dead_letters=len(dead), response=result.get("response"))
         else:
+            imported_total += result.get("imported", 0)
             failed_blocks.append(i)
             print(f"FAILED: {result['error']}")
-
-        # Delay between blocks
-        if args.delay > 0 and i < end_idx:
-            time.sleep(args.delay)
+            # --resume leaves out what this and earlier attempts imported
+            accepted = entry["accepted"] + [record_digest(r) for r in result.get("accepted", [])]
+            journal.record(block_name, entry["hash"], "failed", block=i, records=count, error=result["error"],
+                           imported=result.get("imported", 0), accepted=accepted)
+
+    transport.get_transport(pool_size=rate.max_concurrency).add_observer(rate.observe)
+    stats = metrics.get_metrics()
+    metrics.track_transport(stats, transport.get_transport())
+    reporter = metrics.Reporter(stats, {"script": "import-blocks", "sector": args.sector, "team": args.team},
+                                args.metrics_jsonl, args.metrics_prom, args.metrics_interval).start()
+
+    numbers = {block_path: i for i, block_path in numbered}
+    last_ping = [time.monotonic()]
+
+    def idle():
+        # Nothing new in the folder: report what has finished and keep the connection warm
+        while pending and ("error" in pending[0] or pending[0]["future"].done()):
+            report(pending.popleft())
+        if time.monotonic() - last_ping[0] >= watch.KEEPALIVE_INTERVAL:
+            last_ping[0] = time.monotonic()
+            transport.get_transport().keepalive(f"{API_BASE}/api/sectors/import")
+
+    def watched_blocks():
+        for block_path in watcher:
+            i = watch.block_number(block_path)
+            if i is None or i < args.start or i > end_idx:
+                continue
+            digest = manifest.file_hash(block_path)
+            if journal.completed(os.path.basename(block_path), digest):
+                skipped.append(i)
+                print(f"Block {i} ({os.path.basename(block_path)}): already imported, skipping")
+                continue
+            numbers[block_path] = i
+            hashes[block_path] = digest
+            yield block_path
+
+    with ThreadPoolExecutor(max_workers=rate.max_concurrency) as pool:
+        if args.watch:
+            watcher.on_idle = idle
+            paths = watched_blocks()
+        else:
+            paths = [block_path for _, block_path in numbered]
+        for block_path, records, error, cached in parse_blocks(header_path, paths, args.workers, cache_dir, csv_parser, clean):
+            i = numbers[block_path]
+            processed += 1
+            entry = {"block": i, "name": os.path.basename(block_path), "hash": hashes[block_path]}
+            cached_blocks += cached
+
+            if error is not None:
+                entry["error"] = error
+            else:
+                entry["count"] = len(records)
+                entry["duplicates"] = 0
+                # Records a failed attempt of this unchanged block already imported
+                entry["accepted"] = journal.accepted(entry["name"], entry["hash"]) if args.resume or args.watch else []
+                records, entry["resumed"] = unsent(records, entry["accepted"])
+                changed = []
+                if delta:
+                    with stats.stage("delta"):
+                        records, changed, entry["unchanged"], entry["fingerprints"] = delta.filter(records)
+                    entry["added"] = len(records)
+                    entry["changed"] = len(changed)
+                # Changed records were uploaded before under the same keys, so only new ones go through dedup
+                if index:
+                    with stats.stage("dedup"):
+                        records, entry["duplicates"], entry["keys"] = index.filter(records)
+                records += changed
+                if records:
+                    if args.wire == "columnar":
+                        # Held as tuples until sent; the record dicts go now
+                        with stats.stage("columnar"):
+                            records = columnar.Table.from_records(records)
+                    entry["future"] = pool.submit(uploader.import_unit, records, i, 0 if args.watch else total_blocks)
+                else:
+                    # Every record was a duplicate or unchanged - nothing to send
+                    entry["future"] = Future()
+                    entry["future"].set_result({"success": True, "imported": 0})
+                del records
+            pending.append(entry)
+
+            # Keep at most N blocks in flight; report the oldest before reading more
+            while len(pending) >= rate.concurrency:
+                report(pending.popleft())
+
+            # Delay between blocks
+            if i < end_idx:
+                with stats.stage("delay"):
+                    rate.pause()
+
+        while pending:
+            report(pending.popleft())
+
+    journal.close()
+    if index:
+        index.close()
+    if dead_letters:
+        dead_letters.close()
+    reporter.close()
+
+    removed_note = ""
+    if delta:
+        if args.since:
+            # A watch run can't tell whether the export had finished: re-run with --resume to write tombstones
+            complete = blocks_to_process == blocks and not read_errors and not args.watch
+            if complete:
+                tombstone_path = args.tombstones or default_tombstone_path(folder_path, args.sector, args.team)
+                removed = delta.write_tombstones(tombstone_path)
+                removed_note = f", {removed:,} removed ({tombstone_path})"
+            else:
+                removed_note = ", tombstones not written (run did not cover every block)"
+        counts = delta.counts
+        delta_line = (f"{counts['added']:,} added, {counts['changed']:,} changed, "
+                      f"{counts['unchanged']:,} unchanged{removed_note}")
+        delta.close()
 
     # Summary
     duration = datetime.now() - start_time
@@ -287,19 +616,35 @@ API:         {API_BASE}
 IMPORT COMPLETE
 ================================================================================
 Duration:        {duration}
-Blocks Processed: {len(blocks_to_process)}
+Blocks Processed: {processed}
+Blocks Skipped:  {len(skipped)} (already imported)
 Records Imported: {imported_total:,}
+Duplicates Dropped: {duplicates_total:,}
+Rejected Values: {'off' if not clean else normalize.rejects_summary(stats)}
+Parse Cache:     {f'{cached_blocks}/{processed} blocks loaded' if cache_dir else 'off'}
+Delta:           {delta_line if delta else 'off'}
+Dead Letters:    {dead_letters.summary() if dead_letters else 'off'}
 Failed Blocks:   {len(failed_blocks)} {f'({failed_blocks})' if failed_blocks else ''}
-Success Rate:    {((len(blocks_to_process) - len(failed_blocks)) / len(blocks_to_process) * 100):.1f}%
+Success Rate:    {((processed - len(failed_blocks)) / processed * 100 if processed else 100.0):.1f}%
+Journal:         {journal.path}
+HTTP:            {transport.get_transport().summary()}
+Pacing:          {rate.summary()}
+Request Size:    {sizer.summary()}
+Stages:          {stats.summary()}
 ================================================================================
 """)
 
     if failed_blocks:
-        print(f"\nTo retry failed blocks, run:")
+        print(f"\nTo retry all failed blocks, run:")
+        print(f"  python import-blocks.py \"{folder_path}\" --sector {args.sector} --team {args.team} --resume")
+        print(f"\nOr retry individual blocks:")
         for b in failed_blocks[:5]:
-            print(f"  python import-blocks.py \"{folder_path}\" --sector {args.sector} --start {b} --end {b}")
+            print(f"  python import-blocks.py \"{folder_path}\" --sector {args.sector} --team {args.team} --start {b} --end {b} --resume")
         if len(failed_blocks) > 5:
             print(f"  ... and {len(failed_blocks) - 5} more")
+        if not args.bisect:
+            print(f"\nBlocks rejected for a few bad records (HTTP 400/413/422/500) can be imported with --bisect,")
+            print(f"which writes just those records to a dead-letter file.")
 
 if __name__ == "__main__":
     main()
@@ -1,29 +1,50 @@
 #!/usr/bin/env python3
 """
 USBizData CSV Importer
-Chunks large CSV files into 10k batches and imports to NEXTIER API
+Streams large CSV files in 10k batches and imports to NEXTIER API
 
 Usage:
-  python import-usbizdata.py <csv_file> --sector <sector_id> [--team <team_id>]
+  python import-usbizdata.py <csv_file> --sector <sector_id> [--team <team_id>] [--resume]
 
 Examples:
   python import-usbizdata.py hotels.csv --sector hotels_motels
   python import-usbizdata.py consultants.csv --sector business_consultants --team tm_abc123
+  python import-usbizdata.py realtors.csv --sector realtors --start-chunk 180 --end-chunk 180
+  python import-usbizdata.py realtors.csv --sector realtors --workers 4 --resume --dedup
+  python import-usbizdata.py realtors_q3.csv --sector realtors --since .fingerprints-realtors_q2-realtors-tm_nextiertech.sqlite
+
+Chunks are found through a row index cached next to the CSV
+(usbiz/rowindex.py), and every run journals per-chunk outcomes there, so
+--resume re-sends only what didn't go through. --help lists the other
+options; usbiz/ has how each works.
 """
 
 import csv
+import hashlib
 import json
-import requests
 import argparse
 import sys
 import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
 
+from usbiz import columnar, deadletter, dedup, importer, metrics, normalize, parsers, sizing, transport
+from usbiz.cache import RecordCache, cache_key, default_cache_dir
+from usbiz.delta import FingerprintStore, default_store_path, default_tombstone_path
+from usbiz.journal import Journal, journal_path, record_digest, records_hash, unsent
+from usbiz.projection import Projection
+from usbiz.rowindex import index_path, load_or_build, quote_of
+from usbiz.sizing import RequestSizer
+
 # Configuration
 API_BASE = os.getenv("NEXTIER_API_URL", "https://outreach-global-api-4z29z.ondigitalocean.app")
 API_KEY = os.getenv("NEXTIER_API_KEY", "")
 CHUNK_SIZE = 10000  # 10k records per batch
+REQUEST_TIMEOUT = 120  # seconds
 DEFAULT_TEAM = os.getenv("NEXTIER_TEAM_ID", "tm_nextiertech")
 
 # Sector mappings (sectorId -> display name + SIC codes)
@@ -50,11 +71,6 @@ SECTORS = {
     "construction": "Construction & Contractors",
 }
 
-def chunk_list(lst, chunk_size):
-    """Split list into chunks of specified size"""
-    for i in range(0, len(lst), chunk_size):
-        yield lst[i:i + chunk_size]
-
 def normalize_headers(headers):
     """Normalize CSV headers to expected field names"""
     mapping = {
@@ -123,11 +139,9 @@ def normalize_headers(headers):
 
     return normalized
 
-def read_csv(filepath):
-    """Read CSV and return normalized records"""
-    records = []
-
-    with open(filepath, 'r', encoding='utf-8-sig', errors='replace') as f:
+def sniff_csv(filepath):
+    """Detect the delimiter and read the header row"""
+    with open(filepath, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
         # Try to detect delimiter
         sample = f.read(4096)
         f.seek(0)
@@ -137,67 +151,97 @@ def read_csv(filepath):
         except:
             dialect = csv.excel
 
-        reader = csv.DictReader(f, dialect=dialect)
-        headers = reader.fieldnames
+        headers = next(csv.reader(f, dialect=dialect), None)
+    return dialect, headers
 
-        if not headers:
-            print("ERROR: Could not read CSV headers")
-            sys.exit(1)
+_readers = {}
 
+def csv_reader_setup(filepath):
+    """(dialect, projection, cache signature) for filepath, computed once per process"""
+    if filepath not in _readers:
+        dialect, headers = sniff_csv(filepath)
         header_map = normalize_headers(headers)
-        print(f"Detected columns: {list(headers)}")
-        print(f"Mapped to: {list(set(header_map.values()))}")
-
-        for row in reader:
-            record = {}
-            for orig_key, new_key in header_map.items():
-                if orig_key in row and row[orig_key]:
-                    record[new_key] = row[orig_key].strip()
-
-            # Combine first_name + last_name if no contact_name
-            if "contact_name" not in record:
-                first = record.pop("first_name", "")
-                last = record.pop("last_name", "")
-                if first or last:
-                    record["contact_name"] = f"{first} {last}".strip()
-
-            if record:  # Only add non-empty records
-                records.append(record)
-
-    return records
-
-def import_chunk(records, sector_id, team_id, chunk_num, total_chunks):
-    """Import a chunk of records to the API"""
-    endpoint = f"{API_BASE}/api/sectors/import"
-
-    headers = {
-        "Content-Type": "application/json",
-        "x-team-id": team_id,
-    }
-    if API_KEY:
-        headers["Authorization"] = f"Bearer {API_KEY}"
-
-    payload = {
-        "sectorId": sector_id,
-        "records": records,
-        "source": "usbizdata_import",
-        "chunk": chunk_num,
-        "totalChunks": total_chunks,
-    }
-
-    try:
-        response = requests.post(endpoint, json=payload, headers=headers, timeout=120)
-
-        if response.status_code == 200:
-            data = response.json()
-            return {"success": True, "imported": data.get("imported", len(records))}
-        else:
-            return {"success": False, "error": f"HTTP {response.status_code}: {response.text[:200]}"}
+        signature = json.dumps([dialect.delimiter, dialect.quotechar, header_map])
+        # first_name/last_name are folded into contact_name
+        _readers[filepath] = (dialect, Projection(headers, header_map, keep_name_parts=False), signature)
+    return _readers[filepath]
+
+def read_range(filepath, start, end, cache_dir=None, parser=None, clean=True):
+    """Parse the records in bytes [start, end) of the CSV (a chunk from the row index).
+
+    Returns (records, cached, exported stage metrics); with cache_dir, chunks
+    already parsed in an earlier run are loaded from the parse cache instead.
+    parser picks the usbiz.parsers backend (None = fastest installed), with
+    the delimiter sniff_csv detected; all backends return the same records.
+    clean=True normalizes phone/zip/state/email/website column-wise after
+    loading (usbiz/normalize.py); the cache holds records as parsed.
+    """
+    stats = metrics.Metrics()
+    dialect, project, signature = csv_reader_setup(filepath)
+    started = time.perf_counter()
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    read_s = time.perf_counter() - started
+    stats.add("bytes_read", len(data))
+
+    cache = key = None
+    if cache_dir:
+        cache = RecordCache(cache_dir)
+        key = cache_key("import-usbizdata", hashlib.sha256(data).hexdigest(), signature,
+                        parsers.backend_name(parser))
+        with stats.stage("cache_load"):
+            records = cache.get(key)
+        if records is not None:
+            stats.time("read", read_s)
+            if clean:
+                normalize.normalize_records(records, stats)
+            return records, True, stats.export()
+
+    started = time.perf_counter()
+    # Blank lines and empty records are skipped
+    records, rows = parsers.parse(data.decode('utf-8', errors='replace'), project, dialect,
+                                  backend=parser, stats=stats)
+    stats.time("read", read_s)
+    stats.time("parse", time.perf_counter() - started)
+    stats.add("rows_read", rows)
+    if cache:
+        with stats.stage("cache_store"):
+            cache.put(key, records)
+    if clean:
+        normalize.normalize_records(records, stats)
+    return records, False, stats.export()
+
+def read_chunks(filepath, index, chunks, workers=1, cache_dir=None, parser=None, clean=True):
+    """Yield (chunk_num, records, cached) in order for the given 1-based chunk numbers.
+
+    With workers > 1, chunks are parsed in a process pool at most 2*workers
+    ahead of the consumer, each worker reading its own byte range of the file.
+    Stage timings from the parse (in whichever process) go to the run's metrics.
+    """
+    filepath = str(filepath)
+    stats = metrics.get_metrics()
+    if workers <= 1:
+        for chunk in chunks:
+            records, cached, parse_stats = read_range(filepath, *index.chunk_range(chunk), cache_dir, parser, clean)
+            stats.merge(parse_stats)
+            yield chunk, records, cached
+        return
 
-    except requests.exceptions.Timeout:
-        return {"success": False, "error": "Request timeout (120s)"}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    remaining = iter(chunks)
+    ahead = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in islice(remaining, workers * 2):
+            ahead.append((chunk, pool.submit(read_range, filepath, *index.chunk_range(chunk), cache_dir, parser, clean)))
+
+        while ahead:
+            chunk, future = ahead.popleft()
+            for next_chunk in islice(remaining, 1):
+                ahead.append((next_chunk, pool.submit(read_range, filepath, *index.chunk_range(next_chunk), cache_dir, parser, clean)))
+            with stats.stage("parse_wait"):
+                records, cached, parse_stats = future.result()
+            stats.merge(parse_stats)
+            yield chunk, records, cached
 
 def main():
     parser = argparse.ArgumentParser(description="Import USBizData CSV to NEXTIER")
@@ -206,15 +250,73 @@ def main():
     parser.add_argument("--team", default=DEFAULT_TEAM, help="Team ID (default: from env or tm_nextiertech)")
     parser.add_argument("--dry-run", action="store_true", help="Parse CSV but don't import")
     parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"Records per chunk (default: {CHUNK_SIZE})")
+    parser.add_argument("--start-chunk", type=int, default=1, help="Start from chunk number (default: 1)")
+    parser.add_argument("--end-chunk", type=int, default=0, help="End at chunk number (0 = all)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes parsing chunks ahead of the uploader (default: 1)")
+    parser.add_argument("--index", help="Row index file (default: .rowindex-<file>-<chunk size>.json next to the CSV)")
+    parser.add_argument("--resume", action="store_true", help="Skip chunks the journal has as imported and unchanged")
+    parser.add_argument("--journal", help="Journal file (default: .journal-import-<file>-<sector>-<team>.jsonl next to the CSV)")
+    parser.add_argument("--dedup", action="store_true", help="Drop records already uploaded (phone/email/company+zip index)")
+    parser.add_argument("--dedup-index", help="Dedup index directory (default: ~/.nextier/dedup/<team>)")
+    parser.add_argument("--dedup-keys", default=",".join(dedup.KEY_KINDS), help=f"Comma-separated dedup keys (default: {','.join(dedup.KEY_KINDS)})")
+    parser.add_argument("--dedup-memory", type=int, default=dedup.DEFAULT_MEMORY_MB, help=f"Dedup index memory budget in MB (default: {dedup.DEFAULT_MEMORY_MB})")
+    parser.add_argument("--compress", choices=transport.COMPRESSIONS, default=None, help="Compress request bodies (default: off)")
+    parser.add_argument("--no-stream", action="store_true", help="Build each request body in memory and send it with Content-Length instead of streaming it chunked")
+    parser.add_argument("--cache-dir", help="Parse cache directory (default: ~/.nextier/cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Always parse chunks; don't read or write the parse cache")
+    parser.add_argument("--since", help="Fingerprint store of the previous release: only send added/changed records")
+    parser.add_argument("--snapshot", nargs="?", const="", default=None, help="Write this release's fingerprints (default path: .fingerprints-<file>-<sector>-<team>.sqlite next to the CSV; implied by --since)")
+    parser.add_argument("--tombstones", help="Removed-keys file for --since (default: tombstones-<file>-<sector>-<team>.jsonl next to the CSV)")
+    sizing.add_arguments(parser)
+    parsers.add_arguments(parser)
+    normalize.add_arguments(parser)
+    deadletter.add_arguments(parser)
+    columnar.add_arguments(parser)
+    metrics.add_arguments(parser)
 
     args = parser.parse_args()
 
+    if args.chunk_size < 1:
+        print("ERROR: --chunk-size must be at least 1")
+        sys.exit(1)
+    if args.workers < 1:
+        print("ERROR: --workers must be at least 1")
+        sys.exit(1)
+    if args.request_kb < 1:
+        print("ERROR: --request-kb must be at least 1")
+        sys.exit(1)
+    if args.bisect_max_requests < 1:
+        print("ERROR: --bisect-max-requests must be at least 1")
+        sys.exit(1)
+    try:
+        csv_parser = parsers.backend_name(args.parser)
+    except ValueError as e:
+        print(f"ERROR: --parser {e}")
+        sys.exit(1)
+    clean = not args.no_normalize
+    sizer = RequestSizer(REQUEST_TIMEOUT, args.request_kb, adaptive=not args.fixed_request_size)
+    uploader = importer.Importer(API_BASE, API_KEY, args.sector, args.team, "usbizdata_import", REQUEST_TIMEOUT,
+                                 args.compress, not args.no_stream, sizer,
+                                 args.bisect_max_requests if args.bisect else 0)
+
+    cache_dir = None if args.no_cache else (args.cache_dir or default_cache_dir())
+
+    dedup_kinds = [k.strip() for k in args.dedup_keys.split(",") if k.strip()]
+    unknown = set(dedup_kinds) - set(dedup.KEY_KINDS)
+    if unknown:
+        print(f"ERROR: Unknown --dedup-keys: {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
     # Validate file exists
     csv_path = Path(args.csv_file)
     if not csv_path.exists():
         print(f"ERROR: File not found: {csv_path}")
         sys.exit(1)
 
+    if args.since and not os.path.exists(args.since):
+        print(f"ERROR: Fingerprint store not found: {args.since}")
+        sys.exit(1)
+
     # Validate sector
     if args.sector not in SECTORS:
         print(f"ERROR: Unknown sector '{args.sector}'")
@@ -229,50 +331,217 @@ File:     {csv_path}
 Sector:   {args.sector} ({SECTORS[args.sector]})
 Team:     {args.team}
 Chunk:    {args.chunk_size:,} records
+Workers:  {args.workers}
+Parser:   {csv_parser}
+Normalize: {'off' if not clean else 'phone, zip, state, email, website'}
+Bisect:   {f"on 400/413/422/500, up to {args.bisect_max_requests} requests" if args.bisect else 'off (a rejected request fails its chunk)'}
+Cache:    {cache_dir or 'off'}
+Since:    {args.since or 'off (full import)'}
+Compress: {args.compress or 'none'}
+Requests: {sizer.describe()}
+Body:     {args.wire}, {'buffered' if args.no_stream else 'streamed'} ({transport.JSON_ENCODERS[0]})
 API:      {API_BASE}
 ================================================================================
 """)
 
-    # Read CSV
-    print("Reading CSV file...")
-    records = read_csv(csv_path)
-    total_records = len(records)
-
-    if total_records == 0:
-        print("ERROR: No valid records found in CSV")
+    dialect, headers = sniff_csv(csv_path)
+    if not headers:
+        print("ERROR: Could not read CSV headers")
         sys.exit(1)
+    header_map = normalize_headers(headers)
+    print(f"Detected columns: {list(headers)}")
+    print(f"Mapped to: {list(set(header_map.values()))}")
 
-    print(f"Found {total_records:,} records")
+    # Byte offsets of every chunk (built once, cached next to the CSV)
+    stats = metrics.get_metrics()
+    started = datetime.now()
+    try:
+        with stats.stage("index"):
+            row_index, built = load_or_build(csv_path, args.chunk_size, args.index, quote_of(dialect))
+    except ValueError as e:
+        print(f"ERROR: Can't index {csv_path}: {e}")
+        sys.exit(1)
+    elapsed = (datetime.now() - started).total_seconds()
+    source = f"built in {elapsed:.1f}s" if built else "cached"
+    print(f"Row index: {row_index.rows:,} rows in {row_index.chunks} chunks ({source}, {args.index or index_path(csv_path, args.chunk_size)})")
+
+    start_chunk = max(1, args.start_chunk)
+    end_chunk = min(args.end_chunk, row_index.chunks) if args.end_chunk > 0 else row_index.chunks
+    chunks = range(start_chunk, end_chunk + 1)
+    if not chunks:
+        print(f"ERROR: No chunks in range {start_chunk}-{end_chunk} (file has {row_index.chunks})")
+        sys.exit(1)
+    if len(chunks) < row_index.chunks:
+        print(f"Chunks {start_chunk}-{end_chunk} of {row_index.chunks}")
 
-    # Show sample record
-    print(f"\nSample record:")
-    print(json.dumps(records[0], indent=2))
+    parsed = read_chunks(csv_path, row_index, chunks, args.workers, cache_dir, csv_parser, clean)
 
     if args.dry_run:
-        print("\n[DRY RUN] Would import {total_records:,} records in {len(list(chunk_list(records, args.chunk_size)))} chunks")
+        total_records = 0
+        total_chunks = 0
+        cached_chunks = 0
+        # Classify against --since without writing a snapshot
+        delta = FingerprintStore(":memory:", since=args.since) if args.since else None
+        for i, chunk, cached in parsed:
+            if total_records == 0 and chunk:
+                print(f"\nSample record:")
+                print(json.dumps(chunk[0], indent=2))
+            total_records += len(chunk)
+            total_chunks += 1
+            cached_chunks += cached
+            if delta:
+                delta.commit(delta.filter(chunk)[3])
+        if total_records == 0:
+            print("ERROR: No valid records found in CSV")
+            sys.exit(1)
+        print(f"\n[DRY RUN] Would import {total_records:,} records in {total_chunks} chunks ({cached_chunks} from parse cache)")
+        if clean:
+            print(f"[DRY RUN] Rejected values: {normalize.rejects_summary(metrics.get_metrics())}")
+        if delta:
+            counts = delta.counts
+            removed = sum(1 for _ in delta.removed()) if len(chunks) == row_index.chunks else None
+            print(f"[DRY RUN] Delta: {counts['added'] + counts['changed']:,} to send ({counts['added']:,} added, "
+                  f"{counts['changed']:,} changed), {counts['unchanged']:,} unchanged"
+                  + (f", {removed:,} removed" if removed is not None else ""))
+            delta.close()
         return
 
-    # Chunk and import
-    chunks = list(chunk_list(records, args.chunk_size))
-    total_chunks = len(chunks)
-
-    print(f"\nImporting {total_records:,} records in {total_chunks} chunks...")
+    # Stream chunks straight to the API
+    print(f"\nImporting chunks {start_chunk}-{end_chunk} of {row_index.chunks}...")
     print("-" * 60)
 
+    journal = Journal(args.journal or journal_path(csv_path.parent, "import", csv_path.stem, args.sector, args.team))
+    if args.resume:
+        print(f"Resume: {journal.counts().get('ok', 0)} chunks in journal ({journal.path})")
+
+    dead_letters = None
+    if args.bisect:
+        dead_letters = deadletter.DeadLetters(args.dead_letter or deadletter.default_path(csv_path.parent, csv_path.stem, args.sector, args.team))
+        print(f"Dead letters: {dead_letters.path}")
+
+    delta = None
+    if args.since or args.snapshot is not None:
+        store_path = args.snapshot or default_store_path(csv_path.parent, csv_path.stem, args.sector, args.team)
+        if args.since and os.path.abspath(store_path) == os.path.abspath(args.since):
+            print("ERROR: --snapshot must differ from --since (write each release's fingerprints to its own file)")
+            sys.exit(1)
+        delta = FingerprintStore(store_path, since=args.since)
+        print(f"Fingerprints: {delta.path}{f' (comparing against {args.since})' if args.since else ''}")
+
+    index = None
+    if args.dedup:
+        index = dedup.DedupIndex(args.dedup_index or dedup.default_index_dir(args.team),
+                                 memory_mb=args.dedup_memory, kinds=dedup_kinds)
+        print(f"Dedup: {', '.join(dedup_kinds)} ({index.directory})")
+
+    metrics.track_transport(stats, transport.get_transport())
+    reporter = metrics.Reporter(stats, {"script": "import-usbizdata", "sector": args.sector, "team": args.team},
+                                args.metrics_jsonl, args.metrics_prom, args.metrics_interval).start()
+
+    total_records = 0
+    total_chunks = 0
     imported_total = 0
+    duplicates_total = 0
+    unchanged_total = 0
+    skipped_records = 0
+    skipped_chunks = 0
+    cached_chunks = 0
     failed_chunks = []
 
-    for i, chunk in enumerate(chunks, 1):
-        print(f"Chunk {i}/{total_chunks} ({len(chunk):,} records)... ", end="", flush=True)
-
-        result = import_chunk(chunk, args.sector, args.team, i, total_chunks)
+    for i, chunk, cached in parsed:
+        if total_records == 0 and chunk:
+            print(f"Sample record:")
+            print(json.dumps(chunk[0], indent=2))
+        total_records += len(chunk)
+        total_chunks += 1
+        cached_chunks += cached
+        unit = f"chunk_{i:04d}"
+        digest = records_hash(chunk)
+
+        if args.resume and journal.completed(unit, digest):
+            skipped_records += len(chunk)
+            skipped_chunks += 1
+            continue
+
+        count = len(chunk)
+        dropped = 0
+        unchanged = 0
+        keys = None
+        fingerprints = None
+        changed = []
+        note = ""
+        # Records a failed attempt of this unchanged chunk already imported
+        accepted = journal.accepted(unit, digest) if args.resume else []
+        chunk, resumed = unsent(chunk, accepted)
+        skipped_records += resumed
+        if resumed:
+            note += f", {resumed:,} imported before"
+        if delta:
+            with stats.stage("delta"):
+                chunk, changed, unchanged, fingerprints = delta.filter(chunk)
+            if args.since:
+                note += f", {len(chunk):,} added, {len(changed):,} changed, {unchanged:,} unchanged"
+        # Changed records were uploaded before under the same keys, so only new ones go through dedup
+        if index:
+            with stats.stage("dedup"):
+                chunk, dropped, keys = index.filter(chunk)
+            note += f", {dropped:,} duplicates dropped"
+        chunk += changed
+        print(f"Chunk {i}/{row_index.chunks} ({count:,} records{note})... ", end="", flush=True)
+
+        if chunk:
+            if args.wire == "columnar":
+                with stats.stage("columnar"):
+                    chunk = columnar.Table.from_records(chunk)
+            result = uploader.import_unit(chunk, i, row_index.chunks)
+        else:
+            result = {"success": True, "imported": 0}  # every record was a duplicate or unchanged
 
+        importer.settle(result, index, keys, delta, fingerprints)
         if result["success"]:
             imported_total += result["imported"]
-            print(f"OK ({result['imported']:,} imported)")
+            duplicates_total += dropped
+            unchanged_total += unchanged
+            dead = result.get("dead_letters", [])
+            if dead:
+                dead_letters.write(unit, dead)
+            print(f"OK ({result['imported']:,} imported{f', {len(dead):,} dead-lettered' if dead else ''})")
+            journal.record(unit, digest, "ok", chunk=i, records=count, duplicates=dropped, unchanged=unchanged,
+                           imported=result["imported"], dead_letters=len(dead), response=result.get("response"))
         else:
+            imported_total += result.get("imported", 0)
             failed_chunks.append(i)
             print(f"FAILED: {result['error']}")
+            # --resume leaves out what this and earlier attempts imported
+            accepted += [record_digest(r) for r in result.get("accepted", [])]
+            journal.record(unit, digest, "failed", chunk=i, records=count, error=result["error"],
+                           imported=result.get("imported", 0), accepted=accepted)
+
+    journal.close()
+    if index:
+        index.close()
+    if dead_letters:
+        dead_letters.close()
+    reporter.close()
+    sent_records = total_records - skipped_records - duplicates_total - unchanged_total
+
+    if delta:
+        removed_note = ""
+        if args.since:
+            if len(chunks) == row_index.chunks:
+                tombstone_path = args.tombstones or default_tombstone_path(csv_path.parent, csv_path.stem, args.sector, args.team)
+                removed = delta.write_tombstones(tombstone_path)
+                removed_note = f", {removed:,} removed ({tombstone_path})"
+            else:
+                removed_note = ", tombstones not written (run did not cover every chunk)"
+        counts = delta.counts
+        delta_line = (f"{counts['added']:,} added, {counts['changed']:,} changed, "
+                      f"{counts['unchanged']:,} unchanged{removed_note}")
+        delta.close()
+
+    if total_records == 0:
+        print("ERROR: No valid records found in CSV")
+        sys.exit(1)
 
     # Summary
     print("-" * 60)
@@ -281,11 +550,30 @@ API:      {API_BASE}
 IMPORT COMPLETE
 ================================================================================
 Total Records:   {total_records:,}
+Total Chunks:    {total_chunks}
+Skipped:         {skipped_chunks} chunks / {skipped_records:,} records (already imported)
 Imported:        {imported_total:,}
+Duplicates:      {duplicates_total:,} dropped
+Rejected Values: {'off' if not clean else normalize.rejects_summary(stats)}
+Delta:           {delta_line if delta else 'off'}
+Parse Cache:     {f'{cached_chunks}/{total_chunks} chunks loaded' if cache_dir else 'off'}
+Dead Letters:    {dead_letters.summary() if dead_letters else 'off'}
 Failed Chunks:   {len(failed_chunks)} {f'({failed_chunks})' if failed_chunks else ''}
-Success Rate:    {(imported_total / total_records * 100):.1f}%
+Success Rate:    {(imported_total / sent_records * 100 if sent_records else 100.0):.1f}%
+HTTP:            {transport.get_transport().summary()}
+Request Size:    {sizer.summary()}
+Stages:          {stats.summary()}
 ================================================================================
 """)
 
+    if failed_chunks:
+        print(f"To retry failed chunks, run:")
+        print(f"  python import-usbizdata.py \"{csv_path}\" --sector {args.sector} --team {args.team} --chunk-size {args.chunk_size} --resume")
+        print(f"or a single chunk, e.g.:")
+        print(f"  python import-usbizdata.py \"{csv_path}\" --sector {args.sector} --team {args.team} --chunk-size {args.chunk_size} --start-chunk {failed_chunks[0]} --end-chunk {failed_chunks[0]} --resume")
+        if not args.bisect:
+            print(f"Chunks rejected for a few bad records (HTTP 400/413/422/500) can be imported with --bisect,")
+            print(f"which writes just those records to a dead-letter file.")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+USBizData Block Splitter
+Splits a raw USBizData export into header.csv + block_0001.csv, ... for
+import-blocks.py and upload-datalake.py
+
+Usage:
+  python split-blocks.py <csv_file> [<out_folder>] [--rows N | --bytes SIZE] [--workers N]
+
+Examples:
+  python split-blocks.py "C:/Users/colep/Downloads/US_Realtors.csv" "C:/Users/colep/Downloads/CampaignBlocks/Realtors/SIC_6531"
+  python split-blocks.py plumbers.csv --rows 5000
+  python split-blocks.py realtors.csv --bytes 8MB --workers 4
+
+Splitting works on raw bytes (memory-mapped, quote-aware newline scan) in
+parallel across cores, so it runs at disk speed rather than csv-module speed.
+See usbiz/split.py.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from usbiz.split import DEFAULT_ROWS, existing_blocks, split_file
+
+SIZE_UNITS = {"": 1, "B": 1, "K": 1 << 10, "KB": 1 << 10, "M": 1 << 20, "MB": 1 << 20, "G": 1 << 30, "GB": 1 << 30}
+
+
+def parse_size(value):
+    """Parse '8MB', '8M', '512KB' or a plain byte count; ValueError if it is none of those"""
+    text = value.strip().upper()
+    for unit in sorted(SIZE_UNITS, key=len, reverse=True):
+        if unit and text.endswith(unit):
+            return int(float(text[:-len(unit)]) * SIZE_UNITS[unit])
+    return int(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split a USBizData CSV into header.csv + block_*.csv")
+    parser.add_argument("csv_file", help="Path to the raw CSV export")
+    parser.add_argument("out_folder", nargs="?", help="Output folder (default: <csv name>_blocks next to the file)")
+    size_group = parser.add_mutually_exclusive_group()
+    size_group.add_argument("--rows", type=int, help=f"Target rows per block (default: {DEFAULT_ROWS})")
+    size_group.add_argument("--bytes", help="Target bytes per block, e.g. 8MB or 8M")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parallel workers (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Overwrite existing block_*.csv files in the output folder")
+
+    args = parser.parse_args()
+
+    csv_path = Path(args.csv_file)
+    if not csv_path.exists():
+        print(f"ERROR: File not found: {csv_path}")
+        sys.exit(1)
+
+    out_dir = Path(args.out_folder) if args.out_folder else csv_path.with_name(f"{csv_path.stem}_blocks")
+    old_blocks = existing_blocks(out_dir)
+    if old_blocks and not args.force:
+        print(f"ERROR: {out_dir} already has {len(old_blocks)} block files (use --force to replace them)")
+        sys.exit(1)
+
+    rows = args.rows
+    try:
+        size = parse_size(args.bytes) if args.bytes else None
+    except (ValueError, OverflowError):
+        print(f"ERROR: Invalid --bytes {args.bytes!r} (use a byte count or e.g. 512KB, 8MB, 1G)")
+        sys.exit(1)
+    if not rows and not size:
+        rows = DEFAULT_ROWS
+    if (rows is not None and rows < 1) or (size is not None and size < 1):
+        print("ERROR: Block size must be positive")
+        sys.exit(1)
+
+    file_size = csv_path.stat().st_size
+    print(f"""
+================================================================================
+USBizData Block Splitter
+================================================================================
+File:        {csv_path} ({file_size / (1 << 20):,.1f} MB)
+Output:      {out_dir}
+Block size:  {f'{rows:,} rows' if rows else f'{size:,} bytes'}
+Workers:     {args.workers}
+================================================================================
+""")
+
+    for block in old_blocks:
+        os.remove(block)
+
+    start_time = datetime.now()
+    blocks = split_file(str(csv_path), str(out_dir), rows=rows, size=size, workers=args.workers)
+    duration = datetime.now() - start_time
+    seconds = max(duration.total_seconds(), 1e-6)
+
+    print(f"""
+================================================================================
+SPLIT COMPLETE
+================================================================================
+Duration:    {duration}
+Blocks:      {len(blocks)} ({os.path.basename(blocks[0]) if blocks else '-'} .. {os.path.basename(blocks[-1]) if blocks else '-'})
+Throughput:  {file_size / (1 << 20) / seconds:,.1f} MB/s
+================================================================================
+
+Next:
+  python import-blocks.py "{out_dir}" --sector <sector_id>
+  python upload-datalake.py "{out_dir}" --sector <sector_id>
+""")
+
+
+if __name__ == "__main__":
+    main()
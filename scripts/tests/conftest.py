@@ -0,0 +1,82 @@
+"""
+Shared fixtures: the bench stand-in server and running the scripts against it
+"""
+
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(SCRIPTS_DIR / "bench"))
+
+from standin import Faults, StandIn  # noqa: E402
+
+HEADER = "Company Name,Address,City,State,Zip,Contact First,Contact Last,Phone,Email"
+# A record containing this is rejected by the stand-in with REJECT_STATUS, like a poisoned row
+REJECT_MARKER = "POISON"
+REJECT_STATUS = 422
+
+
+def row(block, i, company=None):
+    """One CSV row, unique per (block, i)"""
+    return (f"{company or f'Company {block}-{i}'},{i} Main St,Austin,TX,78701,Jane,Doe,"
+            f"512{200 + block:03d}{i:04d},c{block}x{i}@acme.com")
+
+
+def csv_corpus(quote='"', newline="\n", final_newline=True, records=40):
+    """Bytes of a CSV with a header, quoted delimiters, quotes and newlines, empty cells and a blank line"""
+    out = io.StringIO(newline="")
+    writer = csv.writer(out, quotechar=quote, lineterminator=newline)
+    writer.writerow(["Company Name", "Address", "City", "Notes"])
+    for i in range(records):
+        company = f"Co {i}, Inc" if i % 3 == 0 else f"Co {i}"
+        address = f"{i} Main St{newline}Suite {i}" if i % 4 == 0 else f"{i} Main St"
+        notes = f"say {quote}hi{quote} {i}" if i % 5 == 0 else ("" if i % 7 == 0 else f"note {i}")
+        writer.writerow([company, address, "Austin", notes])
+        if i == 10:
+            out.write(newline)
+    text = out.getvalue()
+    if not final_newline:
+        text = text[:-len(newline)]
+    return text.encode("utf-8")
+
+
+def csv_rows(data, quote='"'):
+    """csv.reader's rows of CSV bytes, blank lines left out"""
+    return [r for r in csv.reader(io.StringIO(data.decode("utf-8"), newline=""), quotechar=quote) if r]
+
+
+@pytest.fixture
+def standin():
+    server = StandIn(faults=Faults(reject_marker=REJECT_MARKER, reject_status=REJECT_STATUS)).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def run_script(standin, tmp_path):
+    """run_script("import-blocks.py", *args) -> (exit code, output, server stats of that run)"""
+    env = dict(os.environ,
+               NEXTIER_API_URL=standin.url,
+               NEXTIER_FRONT_URL=standin.url,
+               NEXTIER_CACHE_DIR=str(tmp_path / "cache"),
+               NEXTIER_DEDUP_DIR=str(tmp_path / "dedup"),
+               PYTHONUNBUFFERED="1")
+
+    def run(script, *args):
+        standin.stats.reset()
+        proc = subprocess.run([sys.executable, str(SCRIPTS_DIR / script), *map(str, args)], env=env,
+                              capture_output=True, text=True, timeout=120)
+        with urllib.request.urlopen(f"{standin.url}/__stats") as response:
+            stats = json.load(response)
+        return proc.returncode, proc.stdout + proc.stderr, stats
+
+    return run
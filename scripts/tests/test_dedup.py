@@ -0,0 +1,130 @@
+"""
+Dedup index (usbiz/dedup.py): Bloom filter + SQLite, filter/commit/discard
+
+Records are duplicates within a batch, across blocks and runs, and across
+sectors of one team; keys of a batch that failed are discarded so the
+retry isn't dropped as a duplicate of itself.
+"""
+
+from usbiz import importer
+from usbiz.dedup import DedupIndex, default_index_dir, record_keys
+
+from conftest import HEADER, REJECT_MARKER, row
+
+
+def rec(company, phone="", email="", zip_code="78701"):
+    return {"company": company, "phone": phone, "email": email, "zip": zip_code}
+
+
+def test_record_keys_normalize():
+    assert record_keys(rec("Acme, Inc.", "+1 (512) 555-0100", " Jane@Acme.COM ", "78701-1234")) == [
+        "p:5125550100", "e:jane@acme.com", "c:acmeinc|78701"]
+    # No usable values, no keys
+    assert record_keys(rec("", "555-0100", "not an email", "787")) == []
+    assert record_keys(rec("Acme", "5125550100"), kinds=("phone",)) == ["p:5125550100"]
+
+
+def test_duplicates_within_a_batch(tmp_path):
+    index = DedupIndex(tmp_path / "dedup")
+    records = [rec("Acme", "5125550100"), rec("Bolt", "15125550100"), rec("Cog", email="x@cog.com"),
+               rec("Cog Co", email="X@COG.COM"), rec("Dyn")]
+    kept, dropped, token = index.filter(records)
+    # Bolt shares Acme's phone, Cog Co shares Cog's email
+    assert [r["company"] for r in kept] == ["Acme", "Cog", "Dyn"]
+    assert dropped == 2
+    index.commit(token)
+    index.close()
+
+
+def test_duplicates_across_blocks_and_runs(tmp_path):
+    index = DedupIndex(tmp_path / "dedup")
+    _, _, token = index.filter([rec("Acme", "5125550100"), rec("Bolt", email="b@bolt.com")])
+    index.commit(token)
+    kept, dropped, token = index.filter([rec("Acme LLC", "512-555-0100"), rec("New Co", "2145550100")])
+    assert [r["company"] for r in kept] == ["New Co"] and dropped == 1
+    index.commit(token)
+    index.close()
+
+    # A later run reads the committed keys back from disk
+    index = DedupIndex(tmp_path / "dedup")
+    kept, dropped, _ = index.filter([rec("Bolt", email="B@bolt.com"), rec("New Co 2", "2145550100"),
+                                     rec("Fresh", "7135550100")])
+    assert [r["company"] for r in kept] == ["Fresh"] and dropped == 2
+    index.close()
+
+
+def test_bloom_false_positives_dont_drop(tmp_path):
+    index = DedupIndex(tmp_path / "dedup")
+    # Every bit set: every key is a Bloom hit, so SQLite decides
+    index.bloom._mm[:] = b"\xff" * index.bloom.size
+    kept, dropped, _ = index.filter([rec("Acme", "5125550100")])
+    assert len(kept) == 1 and dropped == 0
+    index.close()
+
+
+def test_discard_after_failed_upload(tmp_path):
+    index = DedupIndex(tmp_path / "dedup")
+    records = [rec("Acme", "5125550100"), rec("Bolt", "2145550100")]
+    kept, _, token = index.filter(records)
+    # While the batch is in flight its keys count as seen
+    assert index.filter([rec("Acme again", "5125550100")])[1] == 1
+    index.discard(token)
+    # The upload failed: the retry goes out in full, and only its commit makes them duplicates
+    kept, dropped, token = index.filter(records)
+    assert kept == records and dropped == 0
+    index.commit(token)
+    assert index.filter(records)[1] == 2
+    index.close()
+
+
+def test_settle_commits_only_accepted_records(tmp_path):
+    index = DedupIndex(tmp_path / "dedup")
+    records = [rec("Acme", "5125550100"), rec("Bolt", "2145550100"), rec("Cog", "7135550100")]
+    kept, _, token = index.filter(records)
+    # The unit failed after its first record went through
+    importer.settle({"success": False, "accepted": kept[:1]}, index, token)
+    kept, dropped, _ = index.filter(records)
+    assert [r["company"] for r in kept] == ["Bolt", "Cog"] and dropped == 1
+    index.close()
+
+
+def test_index_is_shared_across_sectors(monkeypatch, tmp_path):
+    monkeypatch.setenv("NEXTIER_DEDUP_DIR", str(tmp_path / "dedup"))
+    assert default_index_dir("tm_a") != default_index_dir("tm_b")
+    index = DedupIndex(default_index_dir("tm_a"))
+    index.commit(index.filter([rec("Acme", "5125550100")])[2])
+    index.close()
+
+    # Same team, any sector: the same index; another team starts empty
+    index = DedupIndex(default_index_dir("tm_a"))
+    assert index.filter([rec("Acme", "5125550100")])[1] == 1
+    index.close()
+    index = DedupIndex(default_index_dir("tm_b"))
+    assert index.filter([rec("Acme", "5125550100")])[1] == 0
+    index.close()
+
+
+def test_import_dedup_across_sectors_and_retries(run_script, tmp_path):
+    folder = tmp_path / "blocks"
+    folder.mkdir()
+    (folder / "header.csv").write_text(HEADER + "\n")
+    (folder / "block_0001.csv").write_text("\n".join(row(1, i) for i in range(50)) + "\n")
+    # Block 2 repeats block 1's first 10 rows and is rejected for its poisoned row
+    rows = [row(1, i) for i in range(10)] + [row(2, i) for i in range(40)] + [row(2, 40, REJECT_MARKER)]
+    (folder / "block_0002.csv").write_text("\n".join(rows) + "\n")
+    args = (folder, "--team", "tm_test", "--delay", 0, "--no-cache", "--dedup")
+
+    code, output, server = run_script("import-blocks.py", *args, "--sector", "realtors")
+    assert server["records"] == 50, output
+    assert "Failed Blocks:   1 ([2])" in output
+
+    # The retry isn't dropped as a duplicate of the failed attempt: bisect imports it
+    code, output, server = run_script("import-blocks.py", *args, "--sector", "realtors", "--resume", "--bisect")
+    assert code == 0, output
+    assert server["records"] == 40, output
+    assert "Duplicates Dropped: 10" in output
+
+    # Another sector of the same team: everything was uploaded already
+    code, output, server = run_script("import-blocks.py", *args, "--sector", "hotels_motels")
+    assert code == 0, output
+    assert server["records"] == 0, output
@@ -0,0 +1,96 @@
+"""
+Delta imports between releases (usbiz/delta.py): --snapshot and --since
+
+A release is imported with --snapshot, then the next one, with one row
+changed, one removed and one added, with --since the first snapshot: only
+the added and changed rows are sent and the removed one is tombstoned.
+"""
+
+import json
+import shutil
+
+from usbiz.delta import FingerprintStore, stable_key
+
+from conftest import HEADER, row
+
+
+def rec(company, address, zip_code="78701"):
+    return {"company": company, "contact_name": "Jane Doe", "address": address, "zip": zip_code}
+
+
+def snapshot(path, records):
+    store = FingerprintStore(path)
+    added, changed, unchanged, token = store.filter(records)
+    assert (len(added), changed, unchanged) == (len(records), [], 0)
+    store.commit(token)
+    store.close()
+
+
+def test_classifies_against_previous_release(tmp_path):
+    q2 = tmp_path / "q2.sqlite"
+    snapshot(q2, [rec("Acme", "1 Main St"), rec("Bolt", "2 Oak Ave"), rec("Cog", "3 Elm Rd")])
+
+    store = FingerprintStore(tmp_path / "q3.sqlite", since=q2)
+    # Acme unchanged (in another key order), Bolt moved, Cog gone, Dyn new
+    acme = {"zip": "78701", "address": "1 Main St", "contact_name": "Jane Doe", "company": "Acme"}
+    added, changed, unchanged, token = store.filter([acme, rec("Bolt", "9 New Rd"), rec("Dyn", "4 Pine Ct")])
+    assert [r["company"] for r in added] == ["Dyn"]
+    assert [r["company"] for r in changed] == ["Bolt"]
+    assert unchanged == 1
+    assert store.counts == {"added": 1, "changed": 1, "unchanged": 1}
+    store.commit(token)
+
+    tombstones = tmp_path / "tombstones.jsonl"
+    assert store.write_tombstones(tombstones) == 1
+    assert [json.loads(line) for line in tombstones.read_text().splitlines()] == [
+        {"key": stable_key(rec("Cog", "3 Elm Rd"))}]
+    store.close()
+
+
+def test_failed_rows_are_resent_not_tombstoned(tmp_path):
+    q2 = tmp_path / "q2.sqlite"
+    snapshot(q2, [rec("Acme", "1 Main St"), rec("Bolt", "2 Oak Ave")])
+
+    store = FingerprintStore(tmp_path / "q3.sqlite", since=q2)
+    added, changed, _, token = store.filter([rec("Acme", "1 Main St"), rec("Bolt", "9 New Rd")])
+    store.discard(token)  # the upload of Bolt's change failed
+    assert list(store.removed()) == []
+    store.close()
+
+    # The next delta against q3 sends Bolt again, even unchanged
+    store = FingerprintStore(tmp_path / "q4.sqlite", since=tmp_path / "q3.sqlite")
+    added, changed, unchanged, _ = store.filter([rec("Acme", "1 Main St"), rec("Bolt", "9 New Rd")])
+    assert ([r["company"] for r in changed], added, unchanged) == (["Bolt"], [], 1)
+    store.close()
+
+
+def test_since_imports_only_the_delta(run_script, tmp_path):
+    q2 = tmp_path / "q2"
+    q2.mkdir()
+    (q2 / "header.csv").write_text(HEADER + "\n")
+    (q2 / "block_0001.csv").write_text("\n".join(row(1, i) for i in range(30)) + "\n")
+    (q2 / "block_0002.csv").write_text("\n".join(row(2, i) for i in range(30)) + "\n")
+    args = ("--sector", "realtors", "--team", "tm_test", "--delay", 0, "--no-cache")
+
+    code, output, server = run_script("import-blocks.py", q2, *args, "--snapshot")
+    assert code == 0, output
+    assert server["records"] == 60
+    fingerprints = q2 / ".fingerprints-realtors-tm_test.sqlite"
+    assert fingerprints.exists()
+
+    # Next release: block 1 row 3 moved, block 2 row 7 gone, one new row
+    q3 = tmp_path / "q3"
+    shutil.copytree(q2, q3, ignore=shutil.ignore_patterns(".*"))
+    block1 = q3 / "block_0001.csv"
+    block1.write_text(block1.read_text().replace(",3 Main St,", ",3 Market St,"))
+    block2 = q3 / "block_0002.csv"
+    block2.write_text("\n".join([row(2, i) for i in range(30) if i != 7] + [row(2, 99)]) + "\n")
+
+    code, output, server = run_script("import-blocks.py", q3, *args, "--since", fingerprints)
+    assert code == 0, output
+    assert server["records"] == 2, output
+    assert "1 added, 1 changed, 58 unchanged" in output
+    tombstones = (q3 / "tombstones-realtors-tm_test.jsonl").read_text().splitlines()
+    assert [json.loads(line)["key"] for line in tombstones] == ["n:company27|janedoe|78701"]
+    # It writes its own snapshot for the release after it
+    assert (q3 / ".fingerprints-realtors-tm_test.sqlite").exists()
@@ -0,0 +1,125 @@
+"""
+Parser backend parity on a fixed corpus
+
+Every backend of usbiz/parsers.py must give the records csv.reader gives,
+through both importers' read paths: blocks (import-blocks.py read_block)
+and row-index chunks (import-usbizdata.py read_range). The corpus has a BOM,
+quoted commas, quotes and newlines, blank lines, CRLF, empty cells and a
+header repeated at the top of a block. The pyarrow and polars cases are
+skipped when those libraries aren't installed.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from usbiz import metrics  # noqa: E402
+from usbiz.rowindex import RowIndex  # noqa: E402
+
+HEADER = "Company Name,Address,City,State,Zip,Contact First,Contact Last,Phone,Email"
+ROWS = [
+    "Acme Plumbing,1 Main St,Austin,TX,78701,Jane,Doe,5125550100,jane@acme.com",
+    '"Smith, Jones & Co","2 Oak Ave\nSuite 5",Dallas,TX,75201,Bob,Smith,2145550101,bob@sj.com',
+    "",
+    '"The ""Best"" Pipes",  3 Elm Rd  ,Houston,TX,77002,,,7135550102,',
+    "\r",
+    "Zed LLC,,El Paso,TX,79901,,Lee,9155550103,\"z@zed.com\"\r",
+    '"Multi\n\nLine",4 Pine Ct,Waco,TX,76701,Ann,,2545550104,ann@ml.com',
+]
+BOM = "\ufeff"
+CHUNK_ROWS = 2
+
+
+def load_script(name):
+    """Import one of the hyphenated scripts as a module"""
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_")[:-3], SCRIPTS_DIR / name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def blocks_mod():
+    return load_script("import-blocks.py")
+
+
+@pytest.fixture(scope="module")
+def usbiz_mod():
+    return load_script("import-usbizdata.py")
+
+
+@pytest.fixture
+def block_dir(tmp_path):
+    """header.csv and two blocks; the first repeats the header and both start with a BOM"""
+    (tmp_path / "header.csv").write_text(BOM + HEADER + "\n", encoding="utf-8", newline="")
+    (tmp_path / "block_0001.csv").write_text(BOM + "\n".join([HEADER] + ROWS[:4]) + "\n", encoding="utf-8",
+                                             newline="")
+    (tmp_path / "block_0002.csv").write_text(BOM + "\n".join(ROWS[4:]) + "\n\n", encoding="utf-8", newline="")
+    return tmp_path
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text(BOM + "\n".join([HEADER] + ROWS) + "\n", encoding="utf-8", newline="")
+    return path
+
+
+def read_blocks(blocks_mod, folder, backend):
+    stats = metrics.Metrics()
+    records = []
+    for path in blocks_mod.find_blocks(folder):
+        records += blocks_mod.read_block(folder / "header.csv", path, stats, backend)
+    return records, stats.counters.get(("parse_fallbacks", ()), 0)
+
+
+def read_chunks(usbiz_mod, csv_path, backend):
+    usbiz_mod._readers.clear()
+    index = RowIndex.build(csv_path, CHUNK_ROWS)
+    records = []
+    for chunk in range(1, index.chunks + 1):
+        records += usbiz_mod.read_range(str(csv_path), *index.chunk_range(chunk), None, backend, clean=False)[0]
+    return records
+
+
+def ordered(records):
+    """Records with their key order, which the request bodies keep"""
+    return [list(r.items()) for r in records]
+
+
+def test_python_backend_reads_corpus(blocks_mod, block_dir):
+    records, _ = read_blocks(blocks_mod, block_dir, "python")
+    assert [r["company"] for r in records] == ["Acme Plumbing", "Smith, Jones & Co", 'The "Best" Pipes',
+                                               "Zed LLC", "Multi\n\nLine"]
+    assert records[1]["address"] == "2 Oak Ave\nSuite 5"
+    assert records[2]["address"] == "3 Elm Rd"
+    assert "contact_name" not in records[2] and "email" not in records[2]
+    assert records[3]["contact_name"] == "Lee" and records[3]["email"] == "z@zed.com"
+
+
+def test_chunks_match_blocks(blocks_mod, usbiz_mod, block_dir, csv_path):
+    blocks, _ = read_blocks(blocks_mod, block_dir, "python")
+    # Chunks of two records: the quoted newlines and blank lines fall inside and between them
+    chunks = read_chunks(usbiz_mod, csv_path, "python")
+    assert [(r["company"], r.get("address")) for r in chunks] == [(r["company"], r.get("address")) for r in blocks]
+
+
+@pytest.mark.parametrize("backend", ["pyarrow", "polars"])
+def test_vectorized_blocks_match_python(blocks_mod, block_dir, backend):
+    pytest.importorskip(backend)
+    expected, _ = read_blocks(blocks_mod, block_dir, "python")
+    records, fallbacks = read_blocks(blocks_mod, block_dir, backend)
+    assert ordered(records) == ordered(expected)
+    # The corpus is plain CSV: the backend itself has to read it, not the python fallback
+    assert fallbacks == 0
+
+
+@pytest.mark.parametrize("backend", ["pyarrow", "polars"])
+def test_vectorized_chunks_match_python(usbiz_mod, csv_path, backend):
+    pytest.importorskip(backend)
+    assert ordered(read_chunks(usbiz_mod, csv_path, backend)) == ordered(read_chunks(usbiz_mod, csv_path, "python"))
@@ -0,0 +1,105 @@
+"""
+--resume from the run journal (usbiz/journal.py)
+
+A first run against the stand-in server fails one unit partway: --bisect
+with a budget of three requests imports part of it and gives up. Then
+another unit's data changes, and --resume must send only the records the
+failed unit did not import plus the whole changed unit, and skip the rest.
+Block/chunk sizes differ so the server's record count tells which were sent.
+"""
+
+from usbiz.journal import Journal, record_digest, unsent
+
+from conftest import HEADER, REJECT_MARKER, row
+
+BLOCK_SIZES = (100, 120, 140, 160)
+# In block 3: requests of rows 0-69 (accepted), 70-139 (rejected), 70-104 (accepted), then out of budget
+POISON_ROW = 110
+BUDGET = ("--bisect", "--bisect-max-requests", 3)
+CHUNK = 100
+
+
+def test_unsent_skips_each_accepted_record_once():
+    records = [{"company": "A"}, {"company": "B"}, {"company": "A"}]
+    kept, skipped = unsent(records, [record_digest({"company": "A"})])
+    assert kept == [{"company": "B"}, {"company": "A"}]
+    assert skipped == 1
+    assert unsent(records, []) == (records, 0)
+
+
+def test_journal_keeps_latest_entry_per_unit(tmp_path):
+    path = tmp_path / ".journal.jsonl"
+    journal = Journal(path)
+    journal.record("block_0001.csv", "h1", "ok")
+    journal.record("block_0002.csv", "h2", "failed", accepted=["d1", "d2"])
+    journal.close()
+    with open(path, "a") as f:
+        f.write('{"unit": "block_0003.csv", "hash"')  # torn line from a crash
+
+    journal = Journal(path)
+    assert journal.completed("block_0001.csv", "h1")
+    assert not journal.completed("block_0001.csv", "changed")
+    assert not journal.completed("block_0002.csv", "h2")
+    assert journal.accepted("block_0002.csv", "h2") == ["d1", "d2"]
+    # Accepted digests only hold for the content they were recorded with
+    assert journal.accepted("block_0002.csv", "changed") == []
+    assert journal.accepted("block_0001.csv", "h1") == []
+    journal.close()
+
+
+def write_blocks(folder):
+    folder.mkdir()
+    (folder / "header.csv").write_text(HEADER + "\n")
+    for b, size in enumerate(BLOCK_SIZES, 1):
+        rows = [row(b, i, REJECT_MARKER if (b, i) == (3, POISON_ROW) else None) for i in range(size)]
+        (folder / f"block_{b:04d}.csv").write_text("\n".join(rows) + "\n")
+
+
+def test_blocks_resume(run_script, tmp_path):
+    folder = tmp_path / "blocks"
+    write_blocks(folder)
+    args = ("import-blocks.py", folder, "--sector", "realtors", "--team", "tm_test", "--delay", 0, "--no-cache")
+
+    code, output, server = run_script(*args, *BUDGET)
+    assert server["records"] == 100 + 120 + 105 + 160, output
+    assert "Failed Blocks:   1 ([3])" in output
+
+    # Block 4 changes after it was imported
+    block4 = folder / "block_0004.csv"
+    block4.write_text(block4.read_text().replace("Company 4-5,", "Company 4-5 Renamed,"))
+
+    code, output, server = run_script(*args, "--resume", "--bisect")
+    assert code == 0, output
+    assert "Resume: 2 blocks already imported" in output
+    assert "105 imported before" in output
+    # Block 3: the 35 records after the accepted halves, one dead-lettered; block 4: all of it
+    assert server["records"] == 34 + 160, output
+    assert "Dead Letters:    1 records" in output
+
+    code, output, server = run_script(*args, "--resume", "--bisect")
+    assert code == 0, output
+    assert server["requests"] == 0
+
+
+def test_chunks_resume(run_script, tmp_path):
+    csv_path = tmp_path / "export.csv"
+    rows = [row(1, i, REJECT_MARKER if i == 2 * CHUNK + 80 else None) for i in range(4 * CHUNK)]
+    csv_path.write_text("\n".join([HEADER] + rows) + "\n")
+    # Chunk 3 bisects into rows 0-49 (accepted), 50-99 (rejected), 50-74 (accepted), then out of budget
+    args = ("import-usbizdata.py", csv_path, "--sector", "realtors", "--team", "tm_test", "--no-cache",
+            "--chunk-size", CHUNK)
+
+    code, output, server = run_script(*args, *BUDGET)
+    assert server["records"] == 3 * CHUNK + 75, output
+
+    # A row of chunk 4 changes; the file is re-indexed and chunks 1-2 still match the journal
+    csv_path.write_text(csv_path.read_text().replace("Company 1-350,", "Company 1-350 Renamed,"))
+
+    code, output, server = run_script(*args, "--resume", "--bisect")
+    assert code == 0, output
+    assert "75 imported before" in output
+    assert server["records"] == 24 + CHUNK, output
+
+    code, output, server = run_script(*args, "--resume", "--bisect")
+    assert code == 0, output
+    assert server["requests"] == 0
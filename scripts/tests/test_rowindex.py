@@ -0,0 +1,83 @@
+"""
+Byte-offset row index (usbiz/rowindex.py)
+
+The chunks of the index, read by their byte ranges, must give exactly the
+records csv.reader gives for the whole file: quoted newlines never split a
+record, for '"' and other quote characters, LF and CRLF line endings, and
+with or without a final newline.
+"""
+
+import csv
+
+import pytest
+
+from usbiz.rowindex import RowIndex, index_path, load_or_build, quote_of
+
+from conftest import csv_corpus, csv_rows
+
+CASES = [(q, nl, final) for q in ('"', "'") for nl in ("\n", "\r\n") for final in (True, False)]
+
+
+@pytest.mark.parametrize("quote,newline,final_newline", CASES)
+@pytest.mark.parametrize("every", [1, 3, 7, 100])
+def test_chunks_match_csv_reader(tmp_path, quote, newline, final_newline, every):
+    data = csv_corpus(quote, newline, final_newline)
+    path = tmp_path / "export.csv"
+    path.write_bytes(data)
+    expected = csv_rows(data, quote)[1:]
+
+    index = RowIndex.build(path, every, quote.encode())
+    chunks = [csv_rows(data[slice(*index.chunk_range(c))], quote) for c in range(1, index.chunks + 1)]
+    assert [r for chunk in chunks for r in chunk] == expected
+    assert index.rows == len(expected)
+    # Every chunk but the last holds exactly `every` records
+    assert all(len(chunk) == every for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= every
+
+
+def test_wrong_quote_is_what_the_index_guards_against(tmp_path):
+    # Indexed on '"', a "'"-quoted file gets split inside its quoted newlines
+    data = csv_corpus("'")
+    path = tmp_path / "export.csv"
+    path.write_bytes(data)
+    index = RowIndex.build(path, 1)
+    rows = [r for c in range(1, index.chunks + 1) for r in csv_rows(data[slice(*index.chunk_range(c))], "'")]
+    assert rows != csv_rows(data, "'")[1:]
+
+
+def test_cached_index_is_keyed_by_quote(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_bytes(csv_corpus("'"))
+    index, built = load_or_build(path, 5, quote=b"'")
+    assert built and index_path(path, 5).exists()
+    assert load_or_build(path, 5, quote=b"'")[1] is False
+    # Another quote character, or a changed file, rebuilds it
+    assert load_or_build(path, 5, quote=b'"')[1] is True
+    path.write_bytes(csv_corpus("'", records=41))
+    index, built = load_or_build(path, 5, quote=b"'")
+    assert built and index.rows == 41
+
+
+def test_bare_cr_line_endings_are_refused(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_bytes(csv_corpus(newline="\r"))
+    with pytest.raises(ValueError, match="bare"):
+        RowIndex.build(path, 5)
+
+
+def test_quote_of_dialect():
+    assert quote_of(csv.excel) == b'"'
+
+    class Single(csv.excel):
+        quotechar = "'"
+
+    class Escaped(csv.excel):
+        escapechar = "\\"
+
+    class Unquoted(csv.excel):
+        quoting = csv.QUOTE_NONE
+
+    assert quote_of(Single) == b"'"
+    for dialect in (Escaped, Unquoted):
+        with pytest.raises(ValueError):
+            quote_of(dialect)
@@ -0,0 +1,96 @@
+"""
+Quote-aware block splitting (usbiz/split.py) and split-blocks.py --bytes
+
+header.csv plus the blocks, parsed one by one, must give exactly the
+records csv.reader gives for the whole export, whatever the block size in
+rows or bytes, number of workers, quote character, line ending and final
+newline.
+"""
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from usbiz import split
+
+from conftest import SCRIPTS_DIR, csv_corpus, csv_rows
+
+CASES = [(q, nl, final) for q in ('"', "'") for nl in ("\n", "\r\n") for final in (True, False)]
+
+
+def blocks_rows(out_dir, quote):
+    header = (out_dir / "header.csv").read_bytes()
+    rows = [r for block in split.existing_blocks(out_dir) for r in csv_rows(Path(block).read_bytes(), quote)]
+    return csv_rows(header, quote), rows
+
+
+@pytest.mark.parametrize("quote,newline,final_newline", CASES)
+@pytest.mark.parametrize("target", [{"rows": 1}, {"rows": 4}, {"size": 1}, {"size": 150}, {"size": 1 << 20}])
+def test_blocks_match_csv_reader(tmp_path, quote, newline, final_newline, target):
+    data = csv_corpus(quote, newline, final_newline)
+    path = tmp_path / "export.csv"
+    path.write_bytes(b"\xef\xbb\xbf" + data)
+
+    blocks = split.split_file(str(path), str(tmp_path / "blocks"), workers=1, quote=quote.encode(), **target)
+    header, rows = blocks_rows(tmp_path / "blocks", quote)
+    expected = csv_rows(data, quote)
+    assert header == expected[:1]
+    assert rows == expected[1:]
+    assert [Path(b).name for b in blocks][:2] == ["block_0001.csv", "block_0002.csv"][:len(blocks)]
+
+
+@pytest.mark.parametrize("quote", ['"', "'"])
+def test_parallel_segments_start_on_record_boundaries(tmp_path, monkeypatch, quote):
+    # Segments as small as a few records, so every worker boundary lands near quoted newlines
+    monkeypatch.setattr(split, "MIN_SEGMENT", 64)
+    data = csv_corpus(quote, "\r\n", records=200)
+    path = tmp_path / "export.csv"
+    path.write_bytes(data)
+
+    split.split_file(str(path), str(tmp_path / "blocks"), rows=7, workers=4, quote=quote.encode())
+    _, rows = blocks_rows(tmp_path / "blocks", quote)
+    assert rows == csv_rows(data, quote)[1:]
+
+
+def test_segment_starts_are_record_starts():
+    data = csv_corpus(records=200)
+    starts = split.segment_starts(data, split.data_start(data)[0], 8)
+    assert len(starts) == 8
+    for start in starts:
+        # Everything before a segment start is whole records
+        assert csv_rows(data[:start]) == csv_rows(data)[:len(csv_rows(data[:start]))]
+        assert data[start - 1:start] == b"\n"
+
+
+@pytest.fixture(scope="module")
+def split_blocks():
+    spec = importlib.util.spec_from_file_location("split_blocks", SCRIPTS_DIR / "split-blocks.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("text,size", [("1024", 1024), ("512KB", 512 << 10), ("8MB", 8 << 20), ("8M", 8 << 20),
+                                       ("8m", 8 << 20), ("1.5G", 3 << 29), ("2 gb", 2 << 30), ("100B", 100),
+                                       ("4K", 4 << 10)])
+def test_parse_size(split_blocks, text, size):
+    assert split_blocks.parse_size(text) == size
+
+
+@pytest.mark.parametrize("text", ["", "MB", "8TB", "eight", "8 MiB"])
+def test_parse_size_rejects(split_blocks, text):
+    with pytest.raises(ValueError):
+        split_blocks.parse_size(text)
+
+
+def test_bad_size_is_an_error_line(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_bytes(csv_corpus())
+    proc = subprocess.run([sys.executable, str(SCRIPTS_DIR / "split-blocks.py"), str(path), "--bytes", "8TB"],
+                          capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 1
+    assert proc.stdout.startswith("ERROR: Invalid --bytes '8TB'")
+    assert "Traceback" not in proc.stderr
@@ -4,30 +4,47 @@ USBizData Datalake Uploader
 Upload pre-chunked CSV blocks to LUCI datalake for scanning
 
 Usage:
-  python upload-datalake.py <folder> --sector <sector_id> [--start <block>] [--dry-run]
+  python upload-datalake.py <folder> --sector <sector_id> [--start <block>] [--dry-run] [--resume]
 
 Examples:
   python upload-datalake.py "C:/Users/colep/Downloads/CampaignBlocks/Plumbing" --sector plumbers_hvac
   python upload-datalake.py "C:/Users/colep/Downloads/CampaignBlocks/Consultants/SIC_8742" --sector business_consultants
   python upload-datalake.py "C:/Users/colep/Downloads/CampaignBlocks/Realtors/SIC_6531" --sector realtors
+  python upload-datalake.py "C:/Users/colep/Downloads/CampaignBlocks/Realtors/SIC_6531" --sector realtors --batch 8
+  python upload-datalake.py "C:/Users/colep/Downloads/CampaignBlocks/Realtors/SIC_6531" --sector realtors --partition-by state
 
-The folder should contain:
+The folder should contain (split-blocks.py creates it from a raw export):
   - header.csv (column headers)
   - block_0001.csv, block_0002.csv, ... (data blocks)
+
+Every run journals per-file outcomes in the folder, so --resume re-sends
+only what didn't go through. --partition-by re-shards the blocks by state
+(usbiz/partition.py) so LUCI scans read only the states they filter on.
+--help lists the other options.
 """
 
 import os
 import sys
 import glob
 import argparse
-import requests
 import time
+import requests
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from urllib3 import encode_multipart_formdata
+
+from usbiz import metrics, partition, preflight, ratecontrol, transport, watch
+from usbiz.journal import Journal, journal_path, safe_file_hash
 
 # Configuration
 API_BASE = os.getenv("NEXTIER_FRONT_URL", "https://outreachglobal.app")
 # API_BASE = "http://localhost:3000"  # For local testing
+REQUEST_TIMEOUT = 120  # seconds
+DEFAULT_DELAY = 0.2  # starting delay between uploads (seconds)
+BATCH_MAX_BYTES = 32 * 1024 * 1024  # --batch: a request closes early at this many bytes of blocks
 
 # Sector definitions
 SECTORS = {
@@ -39,19 +56,43 @@ SECTORS = {
     "trucking": "Trucking Companies (SIC 4212/4213)",
 }
 
-def upload_file(sector_id, file_path, is_header=False):
-    """Upload a single file to the datalake"""
+def upload_file(sector_id, file_path, is_header=False, compression=None):
+    """Upload a single file to the datalake
+
+    Files are stored under their own names, so the transport may repeat an
+    upload the route already took (idempotent=True): it overwrites the same
+    objects and manifest entry, and the route swaps the block's earlier
+    state/city counts for the new ones instead of adding them again.
+    """
     endpoint = f"{API_BASE}/api/luci/datalake"
+    stats = metrics.get_metrics()
 
     try:
         with open(file_path, 'rb') as f:
-            files = {'file': (os.path.basename(file_path), f, 'text/csv')}
             data = {
                 'sector': sector_id,
                 'isHeader': 'true' if is_header else 'false'
             }
 
-            response = requests.post(endpoint, files=files, data=data, timeout=120)
+            if compression:
+                # Build the multipart body ourselves so the whole thing can be compressed
+                with stats.stage("read"):
+                    content = f.read()
+                stats.add("bytes_read", len(content))
+                with stats.stage("serialize"):
+                    fields = dict(data, file=(os.path.basename(file_path), content, 'text/csv'))
+                    body, content_type = encode_multipart_formdata(fields)
+                    body, headers = transport.compress(body, compression)
+                headers['Content-Type'] = content_type
+                stats.add("bytes_sent", len(body))
+                response = transport.post(endpoint, data=body, headers=headers, idempotent=True, timeout=REQUEST_TIMEOUT)
+            else:
+                # requests streams the file while sending, so its read time is part of "network"
+                size = os.fstat(f.fileno()).st_size
+                stats.add("bytes_read", size)
+                stats.add("bytes_sent", size)
+                files = {'file': (os.path.basename(file_path), f, 'text/csv')}
+                response = transport.post(endpoint, files=files, data=data, idempotent=True, timeout=REQUEST_TIMEOUT)
 
             if response.status_code == 200:
                 result = response.json()
@@ -59,6 +100,7 @@ def upload_file(sector_id, file_path, is_header=False):
                     'success': True,
                     'records': result.get('uploaded', {}).get('records', 0),
                     'path': result.get('uploaded', {}).get('path', ''),
+                    'response': result,
                 }
             else:
                 return {
@@ -66,10 +108,108 @@ def upload_file(sector_id, file_path, is_header=False):
                     'error': f"HTTP {response.status_code}: {response.text[:200]}"
                 }
     except requests.exceptions.Timeout:
-        return {'success': False, 'error': "Request timeout (120s)"}
+        return {'success': False, 'error': f"Request timeout ({REQUEST_TIMEOUT}s)"}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+def upload_batch(sector_id, block_paths, header_path=None, compression=None, partitions=None):
+    """Upload several blocks (and optionally header.csv) in one multipart request
+
+    partitions: the partition key of each file (--partition-by), sent as a
+    `partition` field per file in the same order. Returns {'success',
+    'results'} with one {'success', 'records', 'error'} per block in order
+    (plus 'header' when it was sent), or {'success': False, 'error'} when
+    the request itself failed.
+    """
+    endpoint = f"{API_BASE}/api/luci/datalake"
+    stats = metrics.get_metrics()
+
+    try:
+        with ExitStack() as stack:
+            parts = [('header', header_path)] if header_path else []
+            parts += [('file', path) for path in block_paths]
+            if compression:
+                with stats.stage("read"):
+                    contents = [open(path, 'rb').read() for _, path in parts]
+                stats.add("bytes_read", sum(len(c) for c in contents))
+                with stats.stage("serialize"):
+                    fields = [('sector', sector_id), ('batch', 'true')]
+                    fields += [('partition', key) for key in partitions or []]
+                    fields += [(name, (os.path.basename(path), content, 'text/csv'))
+                               for (name, path), content in zip(parts, contents)]
+                    body, content_type = encode_multipart_formdata(fields)
+                    body, headers = transport.compress(body, compression)
+                headers['Content-Type'] = content_type
+                stats.add("bytes_sent", len(body))
+                response = transport.post(endpoint, data=body, headers=headers, idempotent=True, timeout=REQUEST_TIMEOUT)
+            else:
+                size = sum(os.path.getsize(path) for _, path in parts)
+                stats.add("bytes_read", size)
+                stats.add("bytes_sent", size)
+                files = [(name, (os.path.basename(path), stack.enter_context(open(path, 'rb')), 'text/csv'))
+                         for name, path in parts]
+                data = [('sector', sector_id), ('batch', 'true')] + [('partition', key) for key in partitions or []]
+                response = transport.post(endpoint, files=files, data=data, idempotent=True, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code != 200:
+            return {'success': False, 'error': f"HTTP {response.status_code}: {response.text[:200]}"}
+        uploaded = response.json().get('uploaded', [])
+        if not isinstance(uploaded, list):
+            return {'success': False, 'error': "Server doesn't support batch uploads (deploy the batch datalake route or use --batch 1)"}
+
+        # Matched by the file name (and partition) each part was sent with
+        entries = {(u.get('isHeader', False), u.get('partition'), u.get('name')): u for u in uploaded}
+        def result_for(path, is_header=False, key=None):
+            u = entries.get((is_header, key, os.path.basename(path)))
+            if u is None:
+                return {'success': False, 'error': "missing from the batch response"}
+            if not u.get('success'):
+                return {'success': False, 'error': u.get('error', 'failed')}
+            return {'success': True, 'records': u.get('records', 0), 'path': u.get('path', ''), 'response': u}
+
+        keys = partitions or [None] * len(block_paths)
+        results = {'success': True, 'results': [result_for(path, key=key) for path, key in zip(block_paths, keys)]}
+        if header_path:
+            results['header'] = result_for(header_path, is_header=True)
+        return results
+    except requests.exceptions.Timeout:
+        return {'success': False, 'error': f"Request timeout ({REQUEST_TIMEOUT}s)"}
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
+def upload_partition_manifest(sector_id, manifest_path, compression=None):
+    """Upload partitions.json once every partition file is in place"""
+    endpoint = f"{API_BASE}/api/luci/datalake"
+    try:
+        with open(manifest_path, 'rb') as f:
+            content = f.read()
+        fields = [('sector', sector_id), ('batch', 'true'),
+                  ('partitionManifest', (partition.MANIFEST_NAME, content, 'application/json'))]
+        body, content_type = encode_multipart_formdata(fields)
+        body, headers = transport.compress(body, compression) if compression else (body, {})
+        headers['Content-Type'] = content_type
+        response = transport.post(endpoint, data=body, headers=headers, idempotent=True, timeout=REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            return {'success': False, 'error': f"HTTP {response.status_code}: {response.text[:200]}"}
+        result = response.json()
+        if not result.get('partitions'):
+            return {'success': False, 'error': "Server doesn't support partitioned uploads (deploy the partition datalake route)"}
+        return {'success': True, 'response': result}
+    except requests.exceptions.Timeout:
+        return {'success': False, 'error': f"Request timeout ({REQUEST_TIMEOUT}s)"}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+def report_header(journal, digest, result):
+    """Print and journal the outcome of the header.csv upload"""
+    if result['success']:
+        print("OK")
+        journal.record("header.csv", digest, "ok", response=result.get('response'))
+    else:
+        print(f"FAILED: {result['error']}")
+        print("Continuing with blocks anyway...")
+        journal.record("header.csv", digest, "failed", error=result['error'])
+
 def find_blocks(folder):
     """Find all block_*.csv files in folder"""
     pattern = os.path.join(folder, "block_*.csv")
@@ -83,10 +223,39 @@ def main():
     parser.add_argument("--start", type=int, default=1, help="Start from block number (default: 1)")
     parser.add_argument("--end", type=int, default=0, help="End at block number (0 = all)")
     parser.add_argument("--dry-run", action="store_true", help="List files but don't upload")
-    parser.add_argument("--delay", type=float, default=0.2, help="Delay between uploads (seconds)")
+    parser.add_argument("--preflight", action="store_true", help="Count rows and check columns from raw bytes, write the folder manifest, don't upload")
+    parser.add_argument("--workers", type=int, default=None, help="--preflight: processes scanning blocks (default: one per CPU)")
+    parser.add_argument("--delay", type=float, default=None, help="Fixed delay between uploads in seconds (default: adaptive)")
+    parser.add_argument("--concurrency", type=int, default=None, help="Uploads in flight: fixed with --delay (default 1), else adaptive ceiling (default 1)")
+    parser.add_argument("--resume", action="store_true", help="Skip files the journal has as uploaded and unchanged")
+    parser.add_argument("--journal", help="Journal file (default: .journal-datalake-<sector>.jsonl in the folder)")
+    parser.add_argument("--compress", choices=transport.COMPRESSIONS, default=None, help="Compress request bodies (default: off)")
+    parser.add_argument("--batch", type=int, default=1, help=f"Blocks per request, header.csv riding along with the first (default: 1; at most {BATCH_MAX_BYTES // 2**20} MB of blocks)")
+    partition.add_arguments(parser)
+    watch.add_arguments(parser)
+    metrics.add_arguments(parser)
 
     args = parser.parse_args()
 
+    if args.concurrency is not None and args.concurrency < 1:
+        print("ERROR: --concurrency must be at least 1")
+        sys.exit(1)
+    if args.batch < 1:
+        print("ERROR: --batch must be at least 1")
+        sys.exit(1)
+    if args.watch and (args.dry_run or args.preflight):
+        print("ERROR: --watch can't be combined with --dry-run or --preflight")
+        sys.exit(1)
+    if args.partition_by and (args.watch or args.start != 1 or args.end):
+        # Partitions mix rows from every block, and partitions.json replaces the sector's layout
+        print("ERROR: --partition-by re-shards the whole folder; it can't be combined with --watch, --start or --end")
+        sys.exit(1)
+    if args.partition_rows < 1:
+        print("ERROR: --partition-rows must be at least 1")
+        sys.exit(1)
+
+    rate = ratecontrol.from_args(args.delay, args.concurrency, REQUEST_TIMEOUT, DEFAULT_DELAY)
+
     # Validate folder
     folder_path = Path(args.folder)
     if not folder_path.exists():
@@ -94,7 +263,15 @@ def main():
         sys.exit(1)
 
     header_path = folder_path / "header.csv"
-    if not header_path.exists():
+    watcher = None
+    if args.watch:
+        watcher = watch.BlockWatcher(folder_path, settle=args.settle, poll=args.poll, idle_exit=args.idle_exit)
+        watch.stop_on_signals(watcher)
+        if not header_path.exists():
+            print(f"Waiting for {header_path}...", flush=True)
+        if not watcher.wait_for(header_path):
+            sys.exit(1)
+    elif not header_path.exists():
         print(f"ERROR: header.csv not found in {folder_path}")
         sys.exit(1)
 
@@ -106,7 +283,7 @@ def main():
 
     # Find blocks
     blocks = find_blocks(folder_path)
-    if not blocks:
+    if not blocks and not args.watch:
         print(f"ERROR: No block_*.csv files found in {folder_path}")
         sys.exit(1)
 
@@ -114,6 +291,16 @@ def main():
     start_idx = args.start - 1
     end_idx = args.end if args.end > 0 else total_blocks
     blocks_to_upload = blocks[start_idx:end_idx]
+    numbered = list(enumerate(blocks, start=1))[start_idx:end_idx]
+    if args.watch:
+        # Blocks are numbered by file name and arrive while running; the total isn't known
+        end_idx = args.end if args.end > 0 else float("inf")
+        total_blocks = "?"
+
+    if args.preflight:
+        print(f"Preflight: {len(blocks_to_upload)} blocks in {folder_path}")
+        sys.exit(preflight.run(folder_path, blocks_to_upload, args.workers))
+    manifest = preflight.Manifest.load(folder_path)
 
     print(f"""
 ================================================================================
@@ -123,55 +310,243 @@ Folder:       {folder_path}
 Sector:       {args.sector}
               {SECTORS[args.sector]}
 Total Blocks: {total_blocks}
-Uploading:    Blocks {args.start} to {end_idx} ({len(blocks_to_upload)} blocks)
+Uploading:    {f"watching for blocks {args.start} to {args.end or 'end'} (settle {args.settle:g}s)" if args.watch else f"Blocks {args.start} to {end_idx} ({len(blocks_to_upload)} blocks)"}
+Pacing:       {rate.describe()}
+Compression:  {args.compress or 'none'}
+Batch:        {f"{args.batch} blocks per request" if args.batch > 1 else "one block per request"}
+Partitions:   {f"by {args.partition_by}, {args.partition_rows:,} rows per file" if args.partition_by else "off (blocks as exported)"}
 API:          {API_BASE}
 ================================================================================
 """)
 
+    # Re-shard into partitions (reused while the blocks are unchanged)
+    layout = partition_dir = None
+    if args.partition_by:
+        by = args.partition_by.split(",")
+        partition_dir = args.partition_dir or partition.default_dir(folder_path, by)
+        print(f"Re-sharding {len(blocks)} blocks into {partition_dir}... ", end="", flush=True)
+        try:
+            with metrics.get_metrics().stage("reshard"):
+                layout, reused = partition.prepare(folder_path, blocks, by, partition_dir, args.partition_rows)
+        except ValueError as e:
+            print(f"\nERROR: {e}")
+            sys.exit(1)
+        print("unchanged since the last run, reusing it" if reused else "done")
+        partition.print_summary(layout)
+        print()
+
+    if args.dry_run and layout:
+        print(f"[DRY RUN] Would upload header.csv, {layout['totals']['files']} partition files "
+              f"and {partition.MANIFEST_NAME} from {partition_dir}")
+        return
+
     if args.dry_run:
         print("[DRY RUN] Would upload:")
         print(f"  - header.csv")
         for b in blocks_to_upload[:10]:
-            print(f"  - {os.path.basename(b)}")
+            entry = manifest.get(b)
+            print(f"  - {os.path.basename(b)}" + (f" ({entry['rows']:,} rows)" if entry else ""))
         if len(blocks_to_upload) > 10:
             print(f"  ... and {len(blocks_to_upload) - 10} more blocks")
+        entries = [manifest.get(b) for b in blocks_to_upload]
+        if all(entries):
+            print(f"[DRY RUN] {sum(e['rows'] for e in entries):,} rows, "
+                  f"{sum(e['bytes'] for e in entries) / 1e6:,.1f} MB (from {preflight.MANIFEST_NAME})")
+        else:
+            print("[DRY RUN] Run with --preflight to count rows and check columns")
         return
 
-    # Upload header first
-    print("Uploading header.csv... ", end="", flush=True)
-    result = upload_file(args.sector, header_path, is_header=True)
-    if result['success']:
-        print("OK")
+    # Journal every file; on --resume skip what is already uploaded and unchanged
+    journal = Journal(args.journal or journal_path(folder_path, "datalake", args.sector))
+    names = {}
+    partition_keys = {}
+    if layout:
+        # The partition files take the place of the blocks, journaled as state=TX/.../part_0001.csv
+        part_files = partition.files(layout, partition_dir)
+        numbered = list(enumerate((path for path, _, _, _ in part_files), start=1))
+        total_blocks = end_idx = len(numbered)
+        hashes = {path: digest for path, _, _, digest in part_files}
+        names = {path: name for path, name, _, _ in part_files}
+        partition_keys = {path: key for path, _, key, _ in part_files}
     else:
-        print(f"FAILED: {result['error']}")
-        print("Continuing with blocks anyway...")
+        hashes = {} if args.watch else {block_path: manifest.file_hash(block_path) for _, block_path in numbered}
+
+    def name_of(path):
+        return names.get(path) or os.path.basename(path)
+
+    skipped = []
+    if args.resume and not args.watch:
+        skipped = [i for i, block_path in numbered
+                   if journal.completed(name_of(block_path), hashes[block_path])]
+        done = set(skipped)
+        numbered = [(i, block_path) for i, block_path in numbered if i not in done]
+        print(f"Resume: {len(skipped)} {'files' if layout else 'blocks'} already uploaded ({journal.path})")
+
+    stats = metrics.get_metrics()
+    metrics.track_transport(stats, transport.get_transport(pool_size=rate.max_concurrency))
+    reporter = metrics.Reporter(stats, {"script": "upload-datalake", "sector": args.sector},
+                                args.metrics_jsonl, args.metrics_prom, args.metrics_interval).start()
+
+    # Upload header first (with --batch it rides along with the first batch)
+    header_hash = safe_file_hash(header_path)
+    header_due = None
+    if (args.resume or args.watch) and journal.completed("header.csv", header_hash):
+        print("header.csv unchanged, skipping")
+    elif args.batch > 1 and (numbered or args.watch):
+        header_due = header_path
+    else:
+        print("Uploading header.csv... ", end="", flush=True)
+        result = upload_file(args.sector, header_path, is_header=True, compression=args.compress)
+        report_header(journal, header_hash, result)
+
+    if not numbered and not args.watch and not layout:
+        print("Nothing left to upload.")
+        journal.close()
+        reporter.close()
+        return
 
     # Upload blocks
-    print(f"\nUploading {len(blocks_to_upload)} blocks...")
+    unit = "File" if layout else "Block"
+    print(f"\nWatching {folder_path} for blocks (Ctrl-C to stop)..." if args.watch else f"\nUploading {len(numbered)} {unit.lower()}s...")
     print("-" * 60)
 
     uploaded_total = 0
     records_total = 0
+    processed = 0
     failed_blocks = []
     start_time = datetime.now()
 
-    for i, block_path in enumerate(blocks_to_upload, start=args.start):
-        block_name = os.path.basename(block_path)
-        print(f"Block {i}/{total_blocks} ({block_name})... ", end="", flush=True)
+    # Uploads run in a thread pool, reported strictly in block order; each
+    # entry is one request: its blocks as (number, name, digest) plus the future
+    pending = deque()
+    batch = []
+    batch_bytes = 0
+
+    def report(entry):
+        nonlocal uploaded_total, records_total
+        items, sent_header, future = entry
+        with stats.stage("upload_wait"):
+            result = future.result()
 
-        result = upload_file(args.sector, block_path)
+        if sent_header:
+            print("Uploading header.csv... ", end="", flush=True)
+            report_header(journal, header_hash, result.get('header', result))
+
+        for k, (i, block_name, digest) in enumerate(items):
+            print(f"{unit} {i}/{total_blocks} ({block_name})... ", end="", flush=True)
+            block_result = result['results'][k] if 'results' in result else result
+            if block_result['success']:
+                uploaded_total += 1
+                records_total += block_result['records']
+                print(f"OK ({block_result['records']:,} records)")
+                journal.record(block_name, digest, "ok", block=i, records=block_result['records'],
+                               response=block_result.get('response'))
+            else:
+                failed_blocks.append(i)
+                print(f"FAILED: {block_result['error']}")
+                journal.record(block_name, digest, "failed", block=i, error=block_result['error'])
 
-        if result['success']:
-            uploaded_total += 1
-            records_total += result['records']
-            print(f"OK ({result['records']:,} records)")
+    def submit(pool):
+        # Send the blocks collected so far as one request
+        nonlocal batch, batch_bytes, header_due
+        if not batch:
+            return
+        items = [(i, name_of(block_path), hashes[block_path]) for i, block_path in batch]
+        if args.batch > 1 or layout:
+            future = pool.submit(upload_batch, args.sector, [p for _, p in batch], header_path=header_due,
+                                 compression=args.compress,
+                                 partitions=[partition_keys[p] for _, p in batch] if layout else None)
         else:
-            failed_blocks.append(i)
-            print(f"FAILED: {result['error']}")
+            future = pool.submit(upload_file, args.sector, batch[0][1], compression=args.compress)
+        pending.append((items, header_due is not None, future))
+        header_due = None
+        batch, batch_bytes = [], 0
+
+    transport.get_transport(pool_size=rate.max_concurrency).add_observer(rate.observe)
+
+    last_ping = [time.monotonic()]
+
+    def idle(pool):
+        # Nothing new in the folder: send a partial batch, report what has
+        # finished and keep the connection warm
+        submit(pool)
+        while pending and pending[0][2].done():
+            report(pending.popleft())
+        if time.monotonic() - last_ping[0] >= watch.KEEPALIVE_INTERVAL:
+            last_ping[0] = time.monotonic()
+            transport.get_transport().keepalive(f"{API_BASE}/api/luci/datalake")
+
+    def watched_blocks():
+        for block_path in watcher:
+            i = watch.block_number(block_path)
+            if i is None or i < args.start or i > end_idx:
+                continue
+            digest = manifest.file_hash(block_path)
+            if journal.completed(os.path.basename(block_path), digest):
+                skipped.append(i)
+                print(f"Block {i} ({os.path.basename(block_path)}): already uploaded, skipping")
+                continue
+            hashes[block_path] = digest
+            yield i, block_path
+
+    with ThreadPoolExecutor(max_workers=rate.max_concurrency) as pool:
+        if args.watch:
+            watcher.on_idle = lambda: idle(pool)
+            numbered = watched_blocks()
+        for i, block_path in numbered:
+            processed += 1
+            batch.append((i, block_path))
+            batch_bytes += os.path.getsize(block_path)
+            if len(batch) < args.batch and batch_bytes < BATCH_MAX_BYTES:
+                continue
+            submit(pool)
+
+            while len(pending) >= rate.concurrency:
+                report(pending.popleft())
+
+            # Delay between uploads
+            if i < end_idx:
+                with stats.stage("delay"):
+                    rate.pause()
+
+        submit(pool)
+        while pending:
+            report(pending.popleft())
+
+    if header_due:
+        # --watch stopped before any block arrived
+        print("Uploading header.csv... ", end="", flush=True)
+        report_header(journal, header_hash, upload_file(args.sector, header_path, is_header=True,
+                                                        compression=args.compress))
+
+    partition_line = "off"
+    manifest_failed = False
+    if layout:
+        # Last, so a scan never follows partitions.json to a file that isn't there yet
+        manifest_file = os.path.join(partition_dir, partition.MANIFEST_NAME)
+        manifest_hash = safe_file_hash(manifest_file)
+        partition_line = f"{layout['totals']['partitions']} by {args.partition_by}, "
+        if failed_blocks:
+            partition_line += f"{partition.MANIFEST_NAME} not uploaded (files failed)"
+            print(f"{partition.MANIFEST_NAME} not uploaded: {len(failed_blocks)} partition files failed")
+        elif args.resume and journal.completed(partition.MANIFEST_NAME, manifest_hash):
+            partition_line += f"{partition.MANIFEST_NAME} unchanged"
+            print(f"{partition.MANIFEST_NAME} unchanged, skipping")
+        else:
+            print(f"Uploading {partition.MANIFEST_NAME}... ", end="", flush=True)
+            result = upload_partition_manifest(args.sector, manifest_file, args.compress)
+            if result['success']:
+                print("OK")
+                partition_line += f"{partition.MANIFEST_NAME} uploaded"
+                journal.record(partition.MANIFEST_NAME, manifest_hash, "ok", response=result.get('response'))
+            else:
+                manifest_failed = True
+                print(f"FAILED: {result['error']}")
+                partition_line += f"{partition.MANIFEST_NAME} FAILED"
+                journal.record(partition.MANIFEST_NAME, manifest_hash, "failed", error=result['error'])
 
-        # Delay between uploads
-        if args.delay > 0 and i < end_idx:
-            time.sleep(args.delay)
+    journal.close()
+    reporter.close()
 
     # Summary
     duration = datetime.now() - start_time
@@ -181,10 +556,16 @@ API:          {API_BASE}
 UPLOAD COMPLETE
 ================================================================================
 Duration:         {duration}
-Blocks Uploaded:  {uploaded_total}/{len(blocks_to_upload)}
+Blocks Uploaded:  {uploaded_total}/{processed}
+Blocks Skipped:   {len(skipped)} (already uploaded)
 Records Total:    {records_total:,}
 Failed Blocks:    {len(failed_blocks)} {f'({failed_blocks[:5]})' if failed_blocks else ''}
-Success Rate:     {(uploaded_total / len(blocks_to_upload) * 100):.1f}%
+Partitions:       {partition_line}
+Success Rate:     {(uploaded_total / processed * 100 if processed else 100.0):.1f}%
+Journal:          {journal.path}
+HTTP:             {transport.get_transport().summary()}
+Pacing:           {rate.summary()}
+Stages:           {stats.summary()}
 ================================================================================
 
 NEXT STEPS:
@@ -196,8 +577,15 @@ NEXT STEPS:
 ================================================================================
 """)
 
-    if failed_blocks:
-        print(f"To retry failed blocks:")
+    if layout and (failed_blocks or manifest_failed):
+        print(f"To retry the failed files and upload {partition.MANIFEST_NAME}:")
+        extra = (f" --partition-dir \"{args.partition_dir}\"" if args.partition_dir else "") + \
+                (f" --partition-rows {args.partition_rows}" if args.partition_rows != partition.ROWS_PER_FILE else "")
+        print(f"  python upload-datalake.py \"{folder_path}\" --sector {args.sector} --partition-by {args.partition_by}{extra} --resume")
+    elif failed_blocks:
+        print(f"To retry all failed blocks:")
+        print(f"  python upload-datalake.py \"{folder_path}\" --sector {args.sector} --resume")
+        print(f"Or individually:")
         for b in failed_blocks[:5]:
             print(f"  python upload-datalake.py \"{folder_path}\" --sector {args.sector} --start {b} --end {b}")
 
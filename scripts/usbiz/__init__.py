@@ -0,0 +1,27 @@
+"""
+Shared helpers for the USBizData import scripts in scripts/
+
+The uploaders are run directly (python scripts/import-blocks.py ...), which
+puts scripts/ on sys.path, so they import these modules as `usbiz.<module>`.
+
+Modules:
+  transport   - pooled HTTP session with retry/backoff, latency capture and streamed JSON bodies
+  ratecontrol - AIMD pacing of request rate and concurrency
+  projection  - compiled header map for projecting csv.reader rows to records
+  parsers     - pyarrow/polars/python CSV parser backends with identical output
+  normalize   - column-wise E.164/zip5/state/email/website normalization with reject counts
+  journal     - append-only JSONL run journal behind --resume
+  deadletter  - bisecting retry of rejected requests and the --bisect dead-letter file
+  dedup       - on-disk Bloom + SQLite index of uploaded record keys
+  split       - quote-aware mmap splitter behind split-blocks.py
+  rowindex    - cached byte-offset index of a CSV's chunks behind --start-chunk
+  cache       - content-addressed cache of parsed records
+  delta       - release-to-release fingerprint store behind --since
+  metrics     - per-stage timers/counters written as JSON-lines or a Prometheus textfile
+  sizing      - latency-tuned byte size of /api/sectors/import requests
+  importer    - sized, bisected /api/sectors/import requests for one block or chunk, and what a failed one imported
+  columnar    - tuple-backed record tables and the dictionary-encoded --wire columnar body
+  watch       - size-stable polling of a block folder behind --watch
+  preflight   - mmap row/column scan of a block folder and its .manifest.json
+  partition   - state/SIC/zip3 re-sharding of a block folder and its partitions.json
+"""
@@ -0,0 +1,86 @@
+"""
+Parse-once cache of parsed records
+
+Parsing a block is the expensive part of a dry run or an import that runs
+more than once, so the records as parsed (before usbiz/normalize.py cleans
+them) are kept in ~/.nextier/cache (or $NEXTIER_CACHE_DIR). Entries are keyed
+by a hash of the raw block bytes plus everything that shapes the output
+(header row and column mapping, CSV dialect, parser backend, cache format),
+so a changed file, header or --parser simply misses and is parsed again;
+nothing needs invalidating.
+
+Entries are marshal-encoded lists of record dicts behind a small magic/
+version header. Loading one is a single C call; a columnar layout measured
+about 2x slower to load because every record dict then has to be rebuilt in
+Python. Writes go to a temp file and are renamed into place, and unreadable
+entries count as misses, so the directory can be deleted at any time, even
+during a run.
+"""
+
+import hashlib
+import marshal
+import os
+
+MAGIC = b"USBC"
+VERSION = 1
+MARSHAL_VERSION = 4
+
+
+def default_cache_dir():
+    """Shared across folders, sectors and teams (entries are content-addressed)"""
+    return os.getenv("NEXTIER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".nextier", "cache"))
+
+
+def cache_key(*parts):
+    """Hex key for the given content hashes/strings/bytes"""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"v{VERSION}".encode())
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.hexdigest()
+
+
+class RecordCache:
+    """Directory of cached record lists, one file per key"""
+
+    def __init__(self, directory):
+        self.directory = str(directory)
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.rec")
+
+    def get(self, key):
+        """Cached records for key, or None on a miss or an unreadable entry"""
+        try:
+            with open(self.path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if data[:len(MAGIC)] != MAGIC or data[len(MAGIC):len(MAGIC) + 1] != bytes([VERSION]):
+            return None
+        try:
+            records = marshal.loads(data[len(MAGIC) + 1:])
+        except (EOFError, ValueError, TypeError):
+            return None
+        return records if isinstance(records, list) else None
+
+    def put(self, key, records):
+        """Store records under key; returns False if the cache is not writable"""
+        path = self.path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(MAGIC + bytes([VERSION]))
+                f.write(marshal.dumps(records, MARSHAL_VERSION))
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return False
+        return True
@@ -0,0 +1,105 @@
+"""
+Dictionary-encoded columnar payloads for /api/sectors/import
+
+The records format repeats every key on every record, and the values of
+low-cardinality columns (state, city, county, title, SIC code and
+description, employee and sales ranges) on every record as well. With
+--wire columnar a request carries
+  {"columns": ["company", "state", ...],
+   "dicts": {"state": ["TX", "CA", ...], ...},
+   "rows": [["Acme LLC", 0, ...], ...]}
+instead: keys once, low-cardinality columns as indexes into a dictionary
+built for the request, null where a record has no value. The route expands
+it back into the same records (apps/front/src/lib/datalake/columnar.ts).
+
+On the client a block is held as a Table once it is ready to send: one
+tuple per record over a shared column list, with each low-cardinality
+column's values interned (one str object per distinct value), instead of a
+dict per record. A Table reads like a list of record dicts - len(), an
+index gives a dict, a slice gives a Table - so request sizing, --bisect and
+the dead-letter file work on it unchanged. bench/bench_wire.py measures
+memory and bytes against the records format.
+"""
+
+from array import array
+from itertools import chain, repeat
+from operator import add
+
+WIRE_FORMATS = ("records", "columnar")
+DICT_RATIO = 4  # a column is dictionary-encoded when it has at most 1/DICT_RATIO distinct values
+CODE_BYTES = 4  # estimated JSON bytes of a dictionary code and its comma
+NULL_BYTES = 5  # null,
+
+
+class Table:
+    """Records as tuples over one column list; reads like a list of record dicts"""
+
+    __slots__ = ("columns", "coded", "rows", "sizes")
+
+    def __init__(self, columns, coded, rows, sizes):
+        self.columns = columns
+        self.coded = coded
+        self.rows = rows
+        self.sizes = sizes
+
+    @classmethod
+    def from_records(cls, records):
+        """Table of record dicts; keys in first-seen order, low-cardinality values interned"""
+        columns = tuple(dict.fromkeys(chain.from_iterable(records)))
+        values = []
+        coded = []
+        # Encoded size per row: value lengths of the plain columns, plus a constant for the rest
+        sizes = [0] * len(records)
+        for i, column in enumerate(columns):
+            column_values = list(map(dict.get, records, repeat(column)))
+            distinct = dict.fromkeys(column_values)
+            if len(distinct) * DICT_RATIO <= len(column_values) - column_values.count(None):
+                # The first object of each distinct value stands in for all of them
+                column_values = list(map(dict(zip(distinct, distinct)).__getitem__, column_values))
+                coded.append(i)
+            else:
+                sizes = list(map(add, sizes, [NULL_BYTES - 3 if v is None else len(v) for v in column_values]))
+            values.append(column_values)
+        base = 2 + CODE_BYTES * len(coded) + 3 * (len(columns) - len(coded))  # [], codes, quotes and commas
+        return cls(columns, tuple(coded), list(zip(*values)), array("I", map(base.__add__, sizes)))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Table(self.columns, self.coded, self.rows[index], self.sizes[index])
+        return {c: v for c, v in zip(self.columns, self.rows[index]) if v is not None}
+
+    def __iter__(self):
+        for i in range(len(self.rows)):
+            yield self[i]
+
+    def encode(self):
+        """{"columns", "dicts", "rows"} for a request; dictionaries hold only the values these rows use"""
+        if not self.coded or not self.rows:
+            return {"columns": list(self.columns), "dicts": {}, "rows": self.rows}
+        cells = list(zip(*self.rows))
+        dicts = {}
+        for i in self.coded:
+            distinct = [v for v in dict.fromkeys(cells[i]) if v is not None]
+            codes = dict(zip(distinct, range(len(distinct))))
+            codes[None] = None
+            cells[i] = map(codes.__getitem__, cells[i])
+            dicts[self.columns[i]] = distinct
+        return {"columns": list(self.columns), "dicts": dicts, "rows": list(zip(*cells))}
+
+
+def decode(payload):
+    """Record dicts of an encode() payload, as the route expands it"""
+    columns = payload["columns"]
+    lookup = [payload["dicts"].get(c) for c in columns]
+    return [{c: (d[v] if d is not None else v) for c, d, v in zip(columns, lookup, row) if v is not None}
+            for row in payload["rows"]]
+
+
+def add_arguments(parser):
+    """--wire, shared by the JSON importers"""
+    parser.add_argument("--wire", choices=WIRE_FORMATS, default="records",
+                        help="Request body: an array of record objects, or columnar with dictionary-encoded "
+                             "low-cardinality columns (needs the route that decodes it; default: records)")
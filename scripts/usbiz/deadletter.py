@@ -0,0 +1,133 @@
+"""
+Bisecting retry of rejected import requests, and the dead-letter file
+
+A 400/413/422/500 from /api/sectors/import usually comes from one or a few
+records the route can't take (a value of the wrong type, one huge row), but
+it fails the whole request and with it the block. isolate() re-sends the
+rejected records in halves: halves the route accepts are imported, rejected
+halves are split again until each offending record is on its own. Those
+come back with the server's error, to be written to the dead-letter file,
+instead of the whole block failing and being re-sent.
+
+Isolating k bad records out of n takes about 2k*log2(n/k) requests, each
+smaller than the last. Both halves of a rejected batch are always sent,
+since a rejection can come from a combination of records rather than one,
+and only single records retry a 500: the full request already did.
+max_requests caps the requests per rejected request; past it the block
+fails as it did without --bisect, and the halves the route accepted are
+returned so a resume doesn't send them again.
+
+DeadLetters appends one JSON line per isolated record, e.g. to
+<folder>/deadletter-import-realtors-tm_x.jsonl:
+  {"unit": "block_0137.csv", "status": 500, "error": "HTTP 500: ...", "record": {...}, "at": "..."}
+Fix the records and import them like any other data.
+"""
+
+import json
+import os
+from datetime import datetime
+
+BISECT_STATUSES = {400, 413, 422, 500}
+MAX_REQUESTS = 256  # per rejected request
+# Retried statuses for requests of more than one record while bisecting
+SPLIT_RETRY_STATUSES = {429, 502, 503, 504}
+
+
+def default_path(directory, *parts):
+    """Dead-letter file for a run, e.g. <folder>/deadletter-import-realtors-tm_x.jsonl"""
+    name = "-".join(["deadletter", *[str(p) for p in parts if p]])
+    return os.path.join(directory, f"{name}.jsonl")
+
+
+def isolate(send, records, status, error, max_requests=MAX_REQUESTS):
+    """Bisect a rejected request; returns {"success", "imported", "accepted", "dead", "requests", "error"}
+
+    send(records, single) POSTs records (single: they are one record, so
+    a 500 is retried) and returns an import_part() result with "status".
+    records were rejected with status/error. dead is a list of
+    {"record", "status", "error"} for the records the route rejected on
+    their own. A result that isn't a bisectable rejection (network error,
+    503 after retries, timeout), or running out of requests, stops with
+    success False; halves already accepted stay imported and are listed,
+    in record order, under accepted.
+    """
+    imported = 0
+    accepted = []
+    dead = []
+    requests = 0
+    # Rejected batches still to split, first in record order on top
+    stack = [(records, status, error)]
+    while stack:
+        batch, status, error = stack.pop()
+        if len(batch) == 1:
+            dead.append({"record": batch[0], "status": status, "error": error})
+            continue
+        mid = len(batch) // 2
+        rejected = []
+        for half in (batch[:mid], batch[mid:]):
+            if requests >= max_requests:
+                return {"success": False, "imported": imported, "accepted": accepted, "dead": dead,
+                        "requests": requests, "error": f"{error} (bisect gave up after {requests} requests)"}
+            requests += 1
+            result = send(half, len(half) == 1)
+            if result["success"]:
+                imported += result["imported"]
+                accepted += half
+            elif result.get("status") in BISECT_STATUSES:
+                rejected.append((half, result["status"], result["error"]))
+            else:
+                return {"success": False, "imported": imported, "accepted": accepted, "dead": dead,
+                        "requests": requests, "error": result["error"]}
+        stack.extend(reversed(rejected))
+    return {"success": True, "imported": imported, "accepted": accepted, "dead": dead, "requests": requests,
+            "error": None}
+
+
+def without(token, dead_token):
+    """A dedup/delta filter() token minus the entries of dead-lettered records"""
+    dead = set(dead_token)
+    return [t for t in token if t not in dead]
+
+
+class DeadLetters:
+    """Append-only JSONL of records the server rejected; the file is created on first write"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.count = 0
+        self.units = 0
+        self._file = None
+
+    def write(self, unit, dead):
+        """Append the dead entries (from isolate()) of one block/chunk"""
+        if not dead:
+            return
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        at = datetime.now().isoformat(timespec="seconds")
+        for d in dead:
+            self._file.write(json.dumps({"unit": unit, "status": d["status"], "error": d["error"],
+                                         "record": d["record"], "at": at}, default=str) + "\n")
+        self._file.flush()
+        self.count += len(dead)
+        self.units += 1
+
+    def summary(self):
+        if not self.count:
+            return "none"
+        return f"{self.count:,} records from {self.units} {'unit' if self.units == 1 else 'units'} ({self.path})"
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def add_arguments(parser):
+    """--bisect/--dead-letter/--bisect-max-requests, shared by the importers"""
+    parser.add_argument("--bisect", action="store_true",
+                        help="On a 400/413/422/500, split the request to isolate the rejected records: import the "
+                             "rest and write those to the dead-letter file instead of failing the whole block")
+    parser.add_argument("--dead-letter", help="Dead-letter JSONL for --bisect (default: deadletter-<sector>-<team>.jsonl "
+                                              "next to the data)")
+    parser.add_argument("--bisect-max-requests", type=int, default=MAX_REQUESTS,
+                        help=f"Requests --bisect may spend per rejected request (default: {MAX_REQUESTS})")
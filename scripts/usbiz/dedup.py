@@ -0,0 +1,166 @@
+"""
+On-disk deduplication index for the importers
+
+USBizData lists overlap (8742 vs 8748 consultants share firms, and the same
+phone or email shows up in several blocks). Each record is reduced to
+normalized keys - phone (10 digits), email (lowercased) and company+zip5 -
+and dropped if any selected key has already been uploaded.
+
+Keys are stored as 16-byte blake2b digests in two files under the index
+directory:
+  bloom.bin    - fixed-size Bloom filter (mmap), answers "definitely new"
+  keys.sqlite  - exact key store, consulted only on Bloom hits so false
+                 positives never drop a real record
+
+Memory stays within a fixed budget regardless of how many keys are stored:
+the Bloom filter is sized once from --dedup-memory and SQLite's page cache
+gets the remainder.
+
+Keys are only committed after the server accepted the batch, so a failed
+block is not treated as a duplicate when it is retried.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import sqlite3
+
+KEY_KINDS = ("phone", "email", "company_zip")
+DEFAULT_MEMORY_MB = 64
+BLOOM_SHARE = 0.75  # fraction of the memory budget given to the Bloom filter
+BLOOM_HASHES = 7
+MIN_BLOOM_BYTES = 1 << 16
+
+_NON_DIGIT = re.compile(r"\D")
+_NON_ALNUM = re.compile(r"[^0-9a-z]")
+
+
+def default_index_dir(team_id):
+    """Per-team index shared across sectors and runs"""
+    base = os.getenv("NEXTIER_DEDUP_DIR", os.path.join(os.path.expanduser("~"), ".nextier", "dedup"))
+    return os.path.join(base, team_id)
+
+
+def record_keys(record, kinds=KEY_KINDS):
+    """Normalized dedup keys for a record (only kinds with usable values)"""
+    keys = []
+    if "phone" in kinds:
+        digits = _NON_DIGIT.sub("", record.get("phone", ""))
+        if len(digits) == 11 and digits.startswith("1"):
+            digits = digits[1:]
+        if len(digits) == 10:
+            keys.append("p:" + digits)
+    if "email" in kinds:
+        email = record.get("email", "").strip().lower()
+        if "@" in email:
+            keys.append("e:" + email)
+    if "company_zip" in kinds:
+        company = _NON_ALNUM.sub("", record.get("company", "").lower())
+        zip5 = _NON_DIGIT.sub("", record.get("zip", ""))[:5]
+        if company and len(zip5) == 5:
+            keys.append(f"c:{company}|{zip5}")
+    return keys
+
+
+def digest(key):
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter in a memory-mapped file"""
+
+    def __init__(self, path, size_bytes, hashes=BLOOM_HASHES):
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.truncate(size_bytes)
+        # An existing filter keeps its original size
+        self._file = open(path, "r+b")
+        self.size = os.path.getsize(path)
+        self.bits = self.size * 8
+        self.hashes = hashes
+        self._mm = mmap.mmap(self._file.fileno(), self.size)
+
+    def _positions(self, key_digest):
+        h1 = int.from_bytes(key_digest[:8], "little")
+        h2 = int.from_bytes(key_digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def __contains__(self, key_digest):
+        mm = self._mm
+        return all(mm[p >> 3] & (1 << (p & 7)) for p in self._positions(key_digest))
+
+    def add(self, key_digest):
+        mm = self._mm
+        for p in self._positions(key_digest):
+            mm[p >> 3] |= 1 << (p & 7)
+
+    def close(self):
+        self._mm.flush()
+        self._mm.close()
+        self._file.close()
+
+
+class DedupIndex:
+    """Bloom filter + exact SQLite store of uploaded record keys"""
+
+    def __init__(self, directory, memory_mb=DEFAULT_MEMORY_MB, kinds=KEY_KINDS):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.kinds = tuple(kinds)
+        budget = int(memory_mb * 1024 * 1024)
+
+        self.bloom = BloomFilter(os.path.join(directory, "bloom.bin"), max(MIN_BLOOM_BYTES, int(budget * BLOOM_SHARE)))
+        self.db = sqlite3.connect(os.path.join(directory, "keys.sqlite"))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(f"PRAGMA cache_size=-{max(1024, int(budget * (1 - BLOOM_SHARE)) // 1024)}")
+        self.db.execute("CREATE TABLE IF NOT EXISTS keys (k BLOB PRIMARY KEY) WITHOUT ROWID")
+
+        # Keys of batches that were filtered but not yet committed (in flight)
+        self._pending = set()
+
+    def _seen(self, key_digest):
+        if key_digest in self._pending:
+            return True
+        if key_digest not in self.bloom:
+            return False
+        row = self.db.execute("SELECT 1 FROM keys WHERE k = ?", (key_digest,)).fetchone()
+        return row is not None
+
+    def filter(self, records):
+        """Split records into (kept, dropped_count, token); pass token to commit() or discard()"""
+        kept = []
+        token = []
+        dropped = 0
+        for record in records:
+            digests = [digest(k) for k in record_keys(record, self.kinds)]
+            if any(self._seen(d) for d in digests):
+                dropped += 1
+                continue
+            kept.append(record)
+            for d in digests:
+                self._pending.add(d)
+                token.append(d)
+        return kept, dropped, token
+
+    def commit(self, token):
+        """Persist the keys of a batch the server accepted"""
+        with self.db:
+            self.db.executemany("INSERT OR IGNORE INTO keys (k) VALUES (?)", ((d,) for d in token))
+        for d in token:
+            self.bloom.add(d)
+            self._pending.discard(d)
+
+    def token_of(self, records):
+        """The entries filter() put in its token for these (kept) records"""
+        return [digest(k) for record in records for k in record_keys(record, self.kinds)]
+
+    def discard(self, token):
+        """Forget the keys of a batch that failed, so a retry is not treated as duplicate"""
+        for d in token:
+            self._pending.discard(d)
+
+    def close(self):
+        self.bloom.close()
+        self.db.close()
@@ -0,0 +1,163 @@
+"""
+Fingerprint store for incremental imports between USBizData releases
+
+USBizData re-ships full lists every quarter, but most rows are unchanged.
+Each normalized record is reduced to a fingerprint:
+  key  - stable identity: company + contact + zip5, else phone, else email
+         (else the content hash, so such rows only ever add/remove)
+  hash - 16-byte blake2b of the record's content
+
+An import writes the fingerprints of the release it sends to a SQLite store
+next to the data (.fingerprints-<sector>-<team>.sqlite). With --since, the
+previous release's store is attached read-only and every record is
+classified as added, changed or unchanged; only added and changed rows are
+uploaded. At the end, keys present in the previous release but not in this
+one are written to a tombstone file (one JSON object per line).
+
+Like the dedup index, fingerprints of a batch are only committed once the
+server accepted it. Rows of a failed batch are stored with an empty hash, so
+they are neither tombstoned nor skipped: the next delta sends them again.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+
+from usbiz.dedup import record_keys
+
+UNSENT = b""  # hash stored for rows whose upload failed
+LOOKUP_BATCH = 500  # keys per IN (...) query against the previous release
+
+_NON_DIGIT = re.compile(r"\D")
+_NON_ALNUM = re.compile(r"[^0-9a-z]")
+
+
+def default_store_path(directory, *parts):
+    """Fingerprint store for a release, e.g. <folder>/.fingerprints-realtors-tm_x.sqlite"""
+    name = "-".join([".fingerprints", *[str(p) for p in parts if p]])
+    return os.path.join(directory, f"{name}.sqlite")
+
+
+def default_tombstone_path(directory, *parts):
+    """Removed-keys file for a release, e.g. <folder>/tombstones-realtors-tm_x.jsonl"""
+    name = "-".join(["tombstones", *[str(p) for p in parts if p]])
+    return os.path.join(directory, f"{name}.jsonl")
+
+
+def content_hash(record):
+    body = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=16).digest()
+
+
+def stable_key(record, digest=None):
+    """Identity of a record across releases"""
+    company = _NON_ALNUM.sub("", record.get("company", "").lower())
+    contact = _NON_ALNUM.sub("", record.get("contact_name", "").lower())
+    zip5 = _NON_DIGIT.sub("", record.get("zip", ""))[:5]
+    if (company or contact) and len(zip5) == 5:
+        return f"n:{company}|{contact}|{zip5}"
+    keys = record_keys(record, ("phone", "email"))
+    if keys:
+        return keys[0]
+    return "h:" + (digest or content_hash(record)).hex()
+
+
+class FingerprintStore:
+    """Fingerprints of the release being imported, compared against an earlier one"""
+
+    def __init__(self, path, since=None):
+        self.path = str(path)
+        self.since = str(since) if since else None
+        self.db = sqlite3.connect(self.path, uri=True)  # for the read-only ATTACH below
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS fp (k TEXT PRIMARY KEY, h BLOB) WITHOUT ROWID")
+        if self.since:
+            if not os.path.exists(self.since):
+                raise FileNotFoundError(self.since)
+            uri = "file:" + os.path.abspath(self.since).replace("?", "%3f") + "?mode=ro"
+            self.db.execute("ATTACH DATABASE ? AS prev", (uri,))
+            self.db.execute("SELECT 1 FROM prev.fp LIMIT 1")  # fail early if it isn't a store
+        self.counts = {"added": 0, "changed": 0, "unchanged": 0}
+
+    def _previous(self, keys):
+        found = {}
+        keys = list(set(keys))
+        for i in range(0, len(keys), LOOKUP_BATCH):
+            batch = keys[i:i + LOOKUP_BATCH]
+            marks = ",".join("?" * len(batch))
+            found.update(self.db.execute(f"SELECT k, h FROM prev.fp WHERE k IN ({marks})", batch))
+        return found
+
+    def filter(self, records):
+        """Split records into (added, changed, unchanged_count, token); pass token to commit() or discard()
+
+        Without a previous release every record counts as added.
+        """
+        fingerprints = []
+        for record in records:
+            h = content_hash(record)
+            fingerprints.append((stable_key(record, h), h))
+        previous = self._previous([k for k, _ in fingerprints]) if self.since else {}
+
+        added = []
+        changed = []
+        unchanged = []
+        token = []
+        for record, (k, h) in zip(records, fingerprints):
+            old = previous.get(k)
+            if old is None:
+                added.append(record)
+                token.append((k, h))
+            elif old != h:
+                changed.append(record)
+                token.append((k, h))
+            else:
+                unchanged.append((k, h))
+
+        # Unchanged rows need no upload, so they belong to this release already
+        if unchanged:
+            with self.db:
+                self.db.executemany("INSERT OR REPLACE INTO fp (k, h) VALUES (?, ?)", unchanged)
+        self.counts["added"] += len(added)
+        self.counts["changed"] += len(changed)
+        self.counts["unchanged"] += len(unchanged)
+        return added, changed, len(unchanged), token
+
+    def commit(self, token):
+        """Record the fingerprints of a batch the server accepted"""
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO fp (k, h) VALUES (?, ?)", token)
+
+    def token_of(self, records):
+        """The entries filter() put in its token for these (added or changed) records"""
+        token = []
+        for record in records:
+            h = content_hash(record)
+            token.append((stable_key(record, h), h))
+        return token
+
+    def discard(self, token):
+        """Keep the keys of a failed batch (not removed) but make the next delta re-send them"""
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO fp (k, h) VALUES (?, ?)", ((k, UNSENT) for k, _ in token))
+
+    def removed(self):
+        """Keys of the previous release that are missing from this one"""
+        if not self.since:
+            return
+        yield from (k for (k,) in self.db.execute(
+            "SELECT k FROM prev.fp WHERE k NOT IN (SELECT k FROM main.fp) ORDER BY k"))
+
+    def write_tombstones(self, path):
+        """Write removed keys as JSONL; returns how many were written"""
+        count = 0
+        with open(path, "w", encoding="utf-8") as f:
+            for k in self.removed():
+                f.write(json.dumps({"key": k}) + "\n")
+                count += 1
+        return count
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,198 @@
+"""
+Sending blocks and chunks to /api/sectors/import
+
+Both JSON importers hand each unit of records (a block of import-blocks.py,
+a chunk of import-usbizdata.py) to an Importer. It cuts the unit into
+requests of about sizer.target bytes (usbiz/sizing.py), re-cuts the rest
+smaller after a request timed out or was too large, and with --bisect
+splits a rejected request to isolate the records the route rejects
+(usbiz/deadletter.py).
+
+A unit is not all-or-nothing on the server: when a later request fails, the
+earlier ones were imported. The failed result lists those records under
+"accepted"; settle() commits their dedup keys and fingerprints, and the
+importers journal their digests with the failure (journal.record_digest),
+so --resume sends only the records that did not go through.
+"""
+
+import requests
+
+from usbiz import columnar, deadletter, metrics, transport
+from usbiz.sizing import MAX_RESPLITS, SHRINK_STATUSES
+
+# Statuses a sized request retries as is: a 413 or 504 is re-cut smaller instead
+SIZED_RETRY_STATUSES = transport.RETRY_STATUSES - SHRINK_STATUSES
+
+
+class Importer:
+    """POSTs units of records for one sector and team; safe to share across threads"""
+
+    def __init__(self, api_base, api_key, sector_id, team_id, source, timeout, compression=None, stream=True,
+                 sizer=None, bisect=0):
+        self.endpoint = f"{api_base}/api/sectors/import"
+        self.api_key = api_key
+        self.sector_id = sector_id
+        self.team_id = team_id
+        self.source = source
+        self.timeout = timeout
+        self.compression = compression
+        self.stream = stream
+        self.sizer = sizer
+        self.bisect = bisect
+
+    def import_unit(self, records, unit_num, total_units):
+        """Import a unit of records, split into requests of about sizer.target bytes
+
+        Parts are sent in order and numbered as they are sent. A part that
+        timed out or was too large shrinks the target and the rest of the
+        unit is re-cut (up to MAX_RESPLITS times); any other failure stops
+        the unit, and the result's accepted lists the records the parts
+        before it (and the halves of it bisect got through) imported. With
+        bisect (a request budget), a part rejected with a 400/413/422/500 is
+        split to isolate the records the route rejects; the result's
+        dead_letters lists them and the rest of the unit is imported.
+        """
+        sizer = self.sizer
+        if sizer is None:
+            return self.import_part(records, unit_num, total_units)
+
+        imported = 0
+        dead = []
+        accepted = []
+        start = 0
+        part = 0
+        resplits = 0
+
+        def send(batch, single):
+            nonlocal part
+            part += 1
+            return self.import_part(batch, unit_num, total_units, part,
+                                    retry_statuses=None if single else deadletter.SPLIT_RETRY_STATUSES)
+
+        while start < len(records):
+            end, nbytes = sizer.take(records, start)
+            whole = start == 0 and end == len(records) and not resplits
+            if not whole:
+                part += 1
+            # A fixed-size request can't be re-cut, so it retries a 504 like any other
+            result = self.import_part(records[start:end], unit_num, total_units, None if whole else part,
+                                      sized=True, nbytes=nbytes,
+                                      retry_statuses=SIZED_RETRY_STATUSES if sizer.adaptive else None)
+            if not result["success"]:
+                if result.get("too_large") and sizer.adaptive and end - start > 1 and resplits < MAX_RESPLITS:
+                    resplits += 1
+                    metrics.get_metrics().add("resplits")
+                    continue
+                failed = part
+                if self.bisect and result.get("status") in deadletter.BISECT_STATUSES:
+                    isolated = deadletter.isolate(send, records[start:end], result["status"], result["error"],
+                                                  self.bisect)
+                    stats = metrics.get_metrics()
+                    stats.add("bisect_requests", isolated["requests"])
+                    stats.add("dead_letters", len(isolated["dead"]))
+                    imported += isolated["imported"]
+                    if isolated["success"]:
+                        dead += isolated["dead"]
+                        start = end
+                        continue
+                    result["error"] = isolated["error"]
+                    # Halves bisect got through before it stopped were imported too
+                    accepted += isolated["accepted"]
+                if not whole:
+                    result["error"] = f"part {failed}: {result['error']}"
+                result["imported"] = imported
+                # Everything before this part went through
+                result["accepted"] = list(records[:start]) + accepted
+                return result
+            imported += result["imported"]
+            start = end
+        result = {"success": True, "imported": imported, "response": result.get("response")}
+        if dead:
+            result["dead_letters"] = dead
+        return result
+
+    def import_part(self, records, unit_num, total_units, part=None, sized=False, nbytes=0, retry_statuses=None):
+        """POST one request of records; a sized request feeds its size and latency to the sizer"""
+        headers = {
+            "x-team-id": self.team_id,
+            # Retries of this request reuse the key, so the route imports its records once
+            transport.IDEMPOTENCY_HEADER: transport.idempotency_key(),
+        }
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        payload = {
+            "sectorId": self.sector_id,
+            "source": self.source,
+            "chunk": unit_num,
+            "totalChunks": total_units,
+        }
+        if part:
+            payload["part"] = part
+
+        sizer = self.sizer if sized else None
+        stats = metrics.get_metrics()
+        key = "records"
+        if isinstance(records, columnar.Table):
+            # --wire columnar: columns/dicts/rows instead of an array of record objects
+            with stats.stage("columnar"):
+                payload.update(records.encode())
+            key = "rows"
+        else:
+            payload["records"] = records
+        try:
+            if self.stream:
+                body, body_headers = transport.json_stream(payload, self.compression, key)
+            else:
+                with stats.stage("serialize"):
+                    body, body_headers = transport.json_body(payload, self.compression)
+                stats.add("bytes_sent", len(body))
+            headers.update(body_headers)
+            # With a sizer, a timed-out body is re-sent smaller rather than retried as is
+            response = transport.post(self.endpoint, data=body, headers=headers, retry_timeouts=not sizer,
+                                      retry_statuses=retry_statuses, timeout=self.timeout)
+            if self.stream and body.size is not None:
+                # Encoded while sending: this time is also inside "network"
+                stats.time("serialize", body.seconds)
+                stats.add("bytes_sent", body.size)
+            if sizer:
+                sizer.observe(nbytes, response.elapsed.total_seconds(), response.status_code)
+
+            if response.status_code == 200:
+                data = response.json()
+                stats.add("records_sent", len(records))
+                return {"success": True, "imported": data.get("imported", len(records)), "response": data}
+            else:
+                return {"success": False, "error": f"HTTP {response.status_code}: {response.text[:200]}",
+                        "status": response.status_code, "too_large": response.status_code in SHRINK_STATUSES}
+
+        except requests.exceptions.Timeout:
+            if sizer:
+                sizer.observe(nbytes, None, None)
+            return {"success": False, "too_large": True, "error": f"Request timeout ({self.timeout}s)"}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+
+def settle(result, index=None, keys=None, delta=None, fingerprints=None):
+    """Commit the dedup keys/fingerprints of the records a unit's result imported, discard the rest
+
+    keys and fingerprints are the tokens of index.filter() and delta.filter()
+    for the unit. A successful unit imported everything but its dead letters;
+    a failed one only its accepted records.
+    """
+    dead = [d["record"] for d in result.get("dead_letters", [])]
+    accepted = result.get("accepted", [])
+    for store, token in ((index, keys), (delta, fingerprints)):
+        if not store:
+            continue
+        if result["success"]:
+            # Rejected records weren't uploaded: keep them out of the dedup index and re-send them next release
+            dead_token = store.token_of(dead) if dead else []
+            store.commit(deadletter.without(token, dead_token))
+            store.discard(dead_token)
+        else:
+            # Only the accepted records were uploaded; the rest go again on --resume
+            accepted_token = store.token_of(accepted) if accepted else []
+            store.commit(accepted_token)
+            store.discard(deadletter.without(token, accepted_token))
@@ -0,0 +1,139 @@
+"""
+Append-only run journal for resumable imports
+
+Every block/chunk outcome is appended as one JSON line (content hash,
+status, record counts, server response) and flushed immediately, so the
+journal survives crashes and Ctrl-C. On --resume, a unit is skipped only if
+its latest entry is "ok" with the same content hash; missing, failed and
+changed units are sent again. A failed entry lists digests of the records
+its unit did import before failing ("accepted"); those are left out when
+the unchanged unit is sent again.
+
+Journals live next to the data, e.g.
+  <folder>/.journal-import-realtors-tm_nextiertech.jsonl
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+
+HASH_BUFFER = 1 << 20
+
+
+def file_hash(path):
+    """sha256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            buf = f.read(HASH_BUFFER)
+            if not buf:
+                break
+            digest.update(buf)
+    return digest.hexdigest()
+
+
+def safe_file_hash(path):
+    """file_hash, or None if the file can't be read (the caller reports the error)"""
+    try:
+        return file_hash(path)
+    except OSError:
+        return None
+
+
+def records_hash(records):
+    """sha256 of a list of record dicts, independent of key order"""
+    body = json.dumps(records, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def record_digest(record):
+    """Short sha256 of one record dict, independent of key order"""
+    body = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+
+
+def unsent(records, accepted):
+    """(records left to send, how many were skipped): records minus those whose digest is in accepted
+
+    Each accepted digest skips one record, so duplicate rows are sent as
+    often as they were not yet imported.
+    """
+    if not accepted:
+        return records, 0
+    left = Counter(accepted)
+    kept = []
+    for record in records:
+        d = record_digest(record)
+        if left[d]:
+            left[d] -= 1
+        else:
+            kept.append(record)
+    return kept, len(records) - len(kept)
+
+
+def journal_path(directory, kind, *parts):
+    """Default journal file for a run, e.g. .journal-import-<sector>-<team>.jsonl"""
+    name = "-".join([".journal", kind, *[str(p) for p in parts if p]])
+    return os.path.join(directory, f"{name}.jsonl")
+
+
+class Journal:
+    """Latest entry per unit, backed by an append-only JSONL file"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.entries = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line from a crash
+                    self.entries[entry["unit"]] = entry
+
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def completed(self, unit, digest):
+        """True if the unit's latest entry succeeded with this content hash"""
+        entry = self.entries.get(unit)
+        return bool(entry) and entry.get("status") == "ok" and entry.get("hash") == digest
+
+    def accepted(self, unit, digest):
+        """Record digests a failed unit already imported, if its latest entry has this content hash"""
+        entry = self.entries.get(unit)
+        if not entry or entry.get("status") != "failed" or entry.get("hash") != digest:
+            return []
+        return entry.get("accepted", [])
+
+    def record(self, unit, digest, status, **fields):
+        """Append an outcome for a unit (status: ok / failed / read_error)"""
+        entry = {
+            "unit": unit,
+            "hash": digest,
+            "status": status,
+            "at": datetime.now().isoformat(timespec="seconds"),
+            **fields,
+        }
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            self.entries[unit] = entry
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def counts(self):
+        """{status: count} over the latest entry per unit"""
+        counts = {}
+        for entry in self.entries.values():
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._file.close()
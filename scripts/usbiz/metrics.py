@@ -0,0 +1,252 @@
+"""
+Per-stage timers, counters and latency histograms for the uploaders
+
+Each script records where its time goes - CSV read, normalization, payload
+serialization, network wait, retry backoff and pacing delay - plus rows,
+bytes, responses by status and a request latency histogram. A Reporter
+thread writes the totals every --metrics-interval seconds and once more at
+the end of the run, as:
+  --metrics-jsonl  one JSON snapshot per line (appended)
+  --metrics-prom   a Prometheus textfile (rewritten atomically), for the
+                   node_exporter textfile collector
+
+Parse workers run in other processes, so they record into their own Metrics
+and hand back export(); the parent folds that in with merge().
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_INTERVAL = 15  # seconds between periodic writes
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, float("inf"))
+PREFIX = "usbiz"
+
+
+class Metrics:
+    """Thread-safe stage timers, counters and histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}  # name -> [seconds, count]
+        self.counters = {}  # (name, ((label, value), ...)) -> value
+        self.histograms = {}  # name -> [bucket counts, sum, count, bucket bounds]
+
+    def time(self, stage, seconds, count=1):
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += count
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.time(name, time.perf_counter() - start)
+
+    def add(self, name, value=1, **labels):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS):
+        with self._lock:
+            entry = self.histograms.get(name)
+            if entry is None:
+                entry = self.histograms[name] = [[0] * len(buckets), 0.0, 0, buckets]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def export(self):
+        """Plain-dict copy (picklable, for returning from worker processes)
+
+        Labelled counters nest as {"responses": {"status=200": 12, ...}}.
+        """
+        with self._lock:
+            counters = {}
+            for (name, labels), value in self.counters.items():
+                if labels:
+                    counters.setdefault(name, {})[",".join(f"{k}={v}" for k, v in labels)] = value
+                else:
+                    counters[name] = value
+            return {
+                "stages": {k: {"seconds": s, "count": c} for k, (s, c) in self.stages.items()},
+                "counters": counters,
+                "histograms": {k: {"buckets": list(b), "counts": list(n), "sum": s, "count": c}
+                               for k, (n, s, c, b) in self.histograms.items()},
+            }
+
+    def merge(self, exported):
+        """Add another Metrics' export() into this one"""
+        if not exported:
+            return
+        with self._lock:
+            for k, v in exported.get("stages", {}).items():
+                entry = self.stages.setdefault(k, [0.0, 0])
+                entry[0] += v["seconds"]
+                entry[1] += v["count"]
+            for name, v in exported.get("counters", {}).items():
+                values = v.items() if isinstance(v, dict) else [("", v)]
+                for label_text, value in values:
+                    labels = tuple(tuple(pair.split("=", 1)) for pair in label_text.split(",") if pair)
+                    key = (name, labels)
+                    self.counters[key] = self.counters.get(key, 0) + value
+            for k, h in exported.get("histograms", {}).items():
+                buckets = tuple(h["buckets"])
+                entry = self.histograms.setdefault(k, [[0] * len(buckets), 0.0, 0, buckets])
+                entry[0] = [a + b for a, b in zip(entry[0], h["counts"])]
+                entry[1] += h["sum"]
+                entry[2] += h["count"]
+
+    def summary(self):
+        """One-line stage breakdown for the end-of-run banner"""
+        stages = self.export()["stages"]
+        if not stages:
+            return "none recorded"
+        return ", ".join(f"{k} {v['seconds']:.1f}s" for k, v in sorted(stages.items(), key=lambda kv: -kv[1]["seconds"]))
+
+
+_default = Metrics()
+
+
+def get_metrics():
+    """Process-wide Metrics used by the scripts' main process"""
+    return _default
+
+
+def _labels(labels, **extra):
+    merged = dict(labels, **extra)
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(merged.items())) + "}" if merged else ""
+
+
+def prometheus_text(metrics, labels, started, done=False):
+    """Render metrics in the Prometheus text exposition format"""
+    data = metrics.export()
+    lines = [
+        f"# HELP {PREFIX}_stage_seconds_total Wall time spent per stage",
+        f"# TYPE {PREFIX}_stage_seconds_total counter",
+    ]
+    for stage, v in sorted(data["stages"].items()):
+        lines.append(f"{PREFIX}_stage_seconds_total{_labels(labels, stage=stage)} {v['seconds']:.6f}")
+    lines += [f"# TYPE {PREFIX}_stage_calls_total counter"]
+    for stage, v in sorted(data["stages"].items()):
+        lines.append(f"{PREFIX}_stage_calls_total{_labels(labels, stage=stage)} {v['count']}")
+
+    with metrics._lock:
+        counters = sorted(metrics.counters.items())
+    typed = set()
+    for (name, extra), value in counters:
+        metric = f"{PREFIX}_{name}_total"
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} counter")
+            typed.add(metric)
+        lines.append(f"{metric}{_labels(labels, **dict(extra))} {value}")
+
+    for name, h in sorted(data["histograms"].items()):
+        metric = f"{PREFIX}_{name}_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, count in zip(h["buckets"], h["counts"]):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else f"{bound:g}"
+            lines.append(f"{metric}_bucket{_labels(labels, le=le)} {cumulative}")
+        lines.append(f"{metric}_sum{_labels(labels)} {h['sum']:.6f}")
+        lines.append(f"{metric}_count{_labels(labels)} {h['count']}")
+
+    lines += [
+        f"# TYPE {PREFIX}_run_start_time_seconds gauge",
+        f"{PREFIX}_run_start_time_seconds{_labels(labels)} {started:.3f}",
+        f"# TYPE {PREFIX}_last_update_time_seconds gauge",
+        f"{PREFIX}_last_update_time_seconds{_labels(labels)} {time.time():.3f}",
+        f"# TYPE {PREFIX}_run_done gauge",
+        f"{PREFIX}_run_done{_labels(labels)} {1 if done else 0}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class Reporter:
+    """Writes metrics to JSON-lines and/or a Prometheus textfile periodically and at the end"""
+
+    def __init__(self, metrics, labels, jsonl_path=None, prom_path=None, interval=DEFAULT_INTERVAL):
+        self.metrics = metrics
+        self.labels = dict(labels, host=socket.gethostname(), pid=os.getpid())
+        self.jsonl_path = jsonl_path
+        self.prom_path = prom_path
+        self.interval = interval
+        self.started = time.time()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def enabled(self):
+        return bool(self.jsonl_path or self.prom_path)
+
+    def start(self):
+        if self.enabled and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self, final=False):
+        """Write one snapshot to every configured output"""
+        if self.jsonl_path:
+            line = {
+                "ts": time.time(),
+                "elapsed_s": time.time() - self.started,
+                "final": final,
+                "labels": self.labels,
+                **self.metrics.export(),
+            }
+            with open(self.jsonl_path, "a") as f:
+                f.write(json.dumps(line, default=str) + "\n")
+        if self.prom_path:
+            # node_exporter may read at any moment: write a temp file and rename it over
+            tmp = f"{self.prom_path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                f.write(prometheus_text(self.metrics, {k: v for k, v in self.labels.items() if k != "pid"},
+                                        self.started, done=final))
+            os.replace(tmp, self.prom_path)
+
+    def close(self):
+        """Stop the periodic writer and write the final snapshot"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self.enabled:
+            self.write(final=True)
+
+
+def add_arguments(parser):
+    """--metrics-jsonl / --metrics-prom / --metrics-interval, shared by the scripts"""
+    parser.add_argument("--metrics-jsonl", help="Append per-stage metrics snapshots to this JSON-lines file")
+    parser.add_argument("--metrics-prom", help="Write metrics as a Prometheus textfile (node_exporter textfile collector)")
+    parser.add_argument("--metrics-interval", type=float, default=DEFAULT_INTERVAL,
+                        help=f"Seconds between metrics writes during the run (default: {DEFAULT_INTERVAL}; 0 = only at the end)")
+
+
+def track_transport(metrics, transport):
+    """Feed a Transport's attempts (network time, latency histogram, statuses) and backoff sleeps into metrics"""
+    def on_attempt(latency, status):
+        metrics.time("network", latency)
+        metrics.observe("request_latency", latency)
+        metrics.add("responses", status="error" if status is None else status)
+
+    def on_backoff(seconds, attempt):
+        metrics.time("backoff", seconds)
+        metrics.add("retries")
+
+    transport.add_observer(on_attempt)
+    transport.add_backoff_observer(on_backoff)
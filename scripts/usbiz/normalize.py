@@ -0,0 +1,181 @@
+"""
+Column-wise value normalization of parsed records
+
+Runs over a whole chunk (a block or a row-index chunk) one field at a time
+instead of record by record: a field's values are pulled into a column,
+each distinct value is normalized once (lists repeat states, zips, domains
+and shared switchboard numbers), and the results are written back.
+
+  phone, direct_phone, mobile - E.164: +1 and 10 digits for NANP numbers
+                                (extensions dropped), + and 8-15 digits
+                                for numbers written with a country code
+  zip    - 5 digits; ZIP+4 cut, leading zeros Excel dropped put back
+  state  - two-letter USPS code, uppercased; full names are converted
+  email  - stripped, lowercased, mailto: removed; must be name@host.tld
+  website - lowercased host without scheme, www., credentials, port,
+            query or trailing slash (acme.com/contact)
+
+A value that can't be normalized is kept as parsed, so no data is lost,
+and counted per field as normalize_rejects{field=...} in the run's metrics
+(normalize_changed counts rewritten values). --no-normalize sends every
+value exactly as parsed.
+"""
+
+import re
+from contextlib import nullcontext
+from itertools import compress, repeat
+from operator import itemgetter, ne
+
+_NON_DIGIT = re.compile(r"\D")
+# The usual (NXX) NXX-XXXX / NXX.NXX.XXXX / 1-NXX-... spellings, matched in one step
+_NANP = re.compile(r"^\s*(?:\+?1[-.\s]?)?\(?([2-9]\d\d)\)?[-.\s]?([2-9]\d\d)[-.\s]?(\d{4})\s*$")
+_EXTENSION = re.compile(r"(?:\s*(?:#|x|ext\.?|extension)\s*\d+)$", re.IGNORECASE)
+_PHONE_CHARS = re.compile(r"^[\d\s().+\-/]+$")
+_ZIP = re.compile(r"^(\d{3,5})(?:[-\s]?\d{4})?$")
+_DOMAIN = r"[a-z0-9](?:[a-z0-9-]*[a-z0-9])?(?:\.[a-z0-9](?:[a-z0-9-]*[a-z0-9])?)*\.[a-z]{2,}"
+_EMAIL = re.compile(rf"^[^@\s]+@{_DOMAIN}$")
+_HOST = re.compile(rf"^{_DOMAIN}$")
+_SCHEME = re.compile(r"^[a-z][a-z0-9+.-]*://")
+_PLAIN_SITE = re.compile(rf"^(?:https?://)?(?:www\.)?({_DOMAIN})/?$")
+
+STATE_NAMES = {
+    "ALABAMA": "AL", "ALASKA": "AK", "ARIZONA": "AZ", "ARKANSAS": "AR", "CALIFORNIA": "CA",
+    "COLORADO": "CO", "CONNECTICUT": "CT", "DELAWARE": "DE", "DISTRICT OF COLUMBIA": "DC",
+    "FLORIDA": "FL", "GEORGIA": "GA", "HAWAII": "HI", "IDAHO": "ID", "ILLINOIS": "IL",
+    "INDIANA": "IN", "IOWA": "IA", "KANSAS": "KS", "KENTUCKY": "KY", "LOUISIANA": "LA",
+    "MAINE": "ME", "MARYLAND": "MD", "MASSACHUSETTS": "MA", "MICHIGAN": "MI", "MINNESOTA": "MN",
+    "MISSISSIPPI": "MS", "MISSOURI": "MO", "MONTANA": "MT", "NEBRASKA": "NE", "NEVADA": "NV",
+    "NEW HAMPSHIRE": "NH", "NEW JERSEY": "NJ", "NEW MEXICO": "NM", "NEW YORK": "NY",
+    "NORTH CAROLINA": "NC", "NORTH DAKOTA": "ND", "OHIO": "OH", "OKLAHOMA": "OK", "OREGON": "OR",
+    "PENNSYLVANIA": "PA", "RHODE ISLAND": "RI", "SOUTH CAROLINA": "SC", "SOUTH DAKOTA": "SD",
+    "TENNESSEE": "TN", "TEXAS": "TX", "UTAH": "UT", "VERMONT": "VT", "VIRGINIA": "VA",
+    "WASHINGTON": "WA", "WEST VIRGINIA": "WV", "WISCONSIN": "WI", "WYOMING": "WY",
+    "PUERTO RICO": "PR", "GUAM": "GU", "VIRGIN ISLANDS": "VI", "AMERICAN SAMOA": "AS",
+    "NORTHERN MARIANA ISLANDS": "MP",
+}
+STATE_CODES = frozenset(STATE_NAMES.values()) | {"AA", "AE", "AP"}  # + military mail
+
+
+def phone(value):
+    """+1XXXXXXXXXX (or +<country code>...) for a phone number, None if it isn't one"""
+    match = _NANP.match(value)
+    if match:
+        return "+1" + "".join(match.groups())
+    value = _EXTENSION.sub("", value.strip())
+    if not _PHONE_CHARS.match(value):
+        return None
+    digits = _NON_DIGIT.sub("", value)
+    if len(digits) == 11 and digits[0] == "1":
+        digits = digits[1:]
+    elif value.startswith("+") and 8 <= len(digits) <= 15:
+        return "+" + digits
+    # NANP: area code and exchange don't start with 0 or 1
+    if len(digits) != 10 or digits[0] in "01" or digits[3] in "01":
+        return None
+    return "+1" + digits
+
+
+def zip5(value):
+    """First five digits of a ZIP or ZIP+4, None if it isn't one"""
+    if len(value) == 5 and value.isdigit():
+        return value
+    match = _ZIP.match(value.strip())
+    return match.group(1).zfill(5) if match else None
+
+
+def state(value):
+    value = " ".join(value.replace(".", "").split()).upper()
+    value = STATE_NAMES.get(value, value)
+    return value if value in STATE_CODES else None
+
+
+def email(value):
+    value = value.strip().lower()
+    if value.startswith("mailto:"):
+        value = value[7:]
+    return value if _EMAIL.match(value) else None
+
+
+def website(value):
+    """Canonical host[/path] of a URL, None if there is no plausible host"""
+    value = value.strip().lower()
+    match = _PLAIN_SITE.match(value)
+    if match:
+        return match.group(1)
+    value = _SCHEME.sub("", value)
+    host, _, path = value.partition("/")
+    host = host.rpartition("@")[2].partition(":")[0].rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if not _HOST.match(host):
+        return None
+    path = path.partition("?")[0].partition("#")[0].rstrip("/")
+    return f"{host}/{path}" if path else host
+
+
+FIELDS = {
+    "phone": phone,
+    "direct_phone": phone,
+    "mobile": phone,
+    "zip": zip5,
+    "state": state,
+    "email": email,
+    "website": website,
+}
+
+
+def normalize_column(values, fn):
+    """fn over a column, once per distinct value when values repeat"""
+    distinct = dict.fromkeys(values)
+    if len(distinct) * 2 > len(values):
+        return list(map(fn, values))  # mostly unique (phones, emails): a lookup table costs more than it saves
+    return list(map(dict(zip(distinct, map(fn, distinct))).__getitem__, values))
+
+
+def normalize_records(records, stats=None, fields=FIELDS):
+    """Normalize records in place, column by column; returns {field: rejected values}
+
+    A rejected value stays in its record as parsed. stats (a Metrics) gets normalize_rejects and normalize_changed per field
+    and the time as the "normalize" stage.
+    """
+    rejects = {}
+    with stats.stage("normalize") if stats is not None else nullcontext():
+        for field, fn in fields.items():
+            has = list(map(dict.__contains__, records, repeat(field)))
+            rows = records if all(has) else list(compress(records, has))
+            if not rows:
+                continue
+            values = list(map(itemgetter(field), rows))
+            cleaned = normalize_column(values, fn)
+            changed = 0
+            rejected = 0
+            # Only values that came out different are written back
+            for record, new in compress(zip(rows, cleaned), map(ne, values, cleaned)):
+                if new is None:
+                    rejected += 1
+                else:
+                    record[field] = new
+                    changed += 1
+            if rejected:
+                rejects[field] = rejected
+            if stats is not None:
+                if rejected:
+                    stats.add("normalize_rejects", rejected, field=field)
+                if changed:
+                    stats.add("normalize_changed", changed, field=field)
+    return rejects
+
+
+def rejects_summary(stats):
+    """"phone 12, zip 3" from a Metrics' normalize_rejects counters"""
+    counts = stats.export()["counters"].get("normalize_rejects", {})
+    if not counts:
+        return "none"
+    return ", ".join(f"{label.partition('=')[2]} {n:,}" for label, n in sorted(counts.items(), key=lambda kv: -kv[1]))
+
+
+def add_arguments(parser):
+    """--no-normalize, shared by the importers"""
+    parser.add_argument("--no-normalize", action="store_true",
+                        help="Send phone/zip/state/email/website values as parsed (default: E.164, zip5, USPS state, "
+                             "lowercased email, canonical website; unusable values kept as parsed and counted)")
@@ -0,0 +1,246 @@
+"""
+Pluggable CSV parser backends for read_block / read_range
+
+parse(text, project, dialect) turns decoded CSV text into normalized record
+dicts. Three backends produce the same records:
+  pyarrow - pyarrow.csv reads the text into string columns; stripping,
+            empty-cell dropping and the first/last -> contact_name merge
+            run as Arrow compute kernels, one call per column
+  polars  - the same with a polars DataFrame and expressions
+  python  - csv.reader + the compiled Projection, row by row (stdlib only)
+The first installed of pyarrow, polars is used unless a backend is named
+(--parser); without either, python is the only one.
+
+The vectorized backends only take input they are known to read exactly
+like csv.reader: a plain dialect (no escapechar, skipinitialspace or
+QUOTE_NONE), every row as wide as the header, no ASCII separator
+characters (which str.strip() treats as whitespace and Arrow/polars don't)
+and no bare carriage return (a line break to csv.reader, text to polars).
+Anything else goes through the python backend for that chunk, counted as
+parse_fallbacks in the run's metrics, so output never depends on what is
+installed. bench/bench_parsers.py checks the backends against each other
+on generated data, tests/test_parsers.py on a fixed corpus of edge cases.
+"""
+
+import csv
+import inspect
+import io
+import re
+
+try:
+    import pyarrow
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:
+    pyarrow = None
+
+try:
+    import polars
+except ImportError:
+    polars = None
+
+if polars is not None:
+    # Empty cells read as "" rather than null; the option was renamed in polars 1.43
+    _POLARS_EMPTY = ({"empty_string_is_null": False}
+                     if "empty_string_is_null" in inspect.signature(polars.read_csv).parameters
+                     else {"missing_utf8_is_empty_string": True})
+
+BACKENDS = tuple(name for name, module in (("pyarrow", pyarrow), ("polars", polars)) if module) + ("python",)
+CHOICES = ("auto", "pyarrow", "polars", "python")
+
+# Whitespace to str.strip() but not to Arrow/polars trimming, and a \r that csv.reader reads as a line end
+_STRIP_MISMATCH = re.compile("[\x1c-\x1f]|\r(?!\n)")
+
+
+def backend_name(name=None):
+    """The backend `name` ("auto"/None = fastest installed) resolves to"""
+    if name in (None, "auto"):
+        return BACKENDS[0]
+    if name not in BACKENDS:
+        raise ValueError(f"{name} is not installed (available: {', '.join(BACKENDS)})")
+    return name
+
+
+def parse_python(text, project, dialect=csv.excel, first_column=None):
+    """(records, rows) with csv.reader: blank lines skipped, and the first row too if it repeats the header"""
+    rows = []
+    first = True
+    for row in csv.reader(io.StringIO(text, newline=''), dialect=dialect):
+        if not row:
+            continue
+        # Skip header row if present in block
+        if first:
+            first = False
+            if first_column is not None and row[0].strip() == first_column:
+                continue
+        rows.append(row)
+
+    records = []
+    for row in rows:
+        record = project(row)
+        if record:
+            records.append(record)
+    return records, len(rows)
+
+
+def _plain(dialect):
+    return (len(dialect.delimiter) == 1 and dialect.quotechar and dialect.doublequote
+            and not dialect.escapechar and not dialect.skipinitialspace and dialect.quoting != csv.QUOTE_NONE)
+
+
+def _drop_header(text, dialect, first_column):
+    """text without leading blank lines and its first row if that repeats the header; None if the first row spans lines"""
+    body = text.lstrip("\r\n")
+    line, _, rest = body.partition("\n")
+    if line.count(dialect.quotechar) % 2:
+        return None
+    row = next(csv.reader([line], dialect=dialect), [])
+    return rest if row and row[0].strip() == first_column else body
+
+
+def _assemble(keys, columns):
+    """Record dicts from per-key value lists (None = cell not in the record), empty records dropped"""
+    records = []
+    for values in zip(*columns):
+        record = {k: v for k, v in zip(keys, values) if v is not None}
+        if record:
+            records.append(record)
+    return records
+
+
+def _name_columns(keys):
+    """Positions of the contact_name, first_name and last_name columns"""
+    return ([n for n, k in enumerate(keys) if k == "contact_name"],
+            [n for n, k in enumerate(keys) if k == "first_name"],
+            [n for n, k in enumerate(keys) if k == "last_name"])
+
+
+def _parse_arrow(text, project, dialect):
+    names = [f"c{i}" for i in range(project.width)]
+    ragged = []
+
+    def invalid_row(row):
+        ragged.append(row)
+        return "skip"
+
+    try:
+        table = pacsv.read_csv(
+            io.BytesIO(text.encode("utf-8")),
+            read_options=pacsv.ReadOptions(column_names=names),
+            parse_options=pacsv.ParseOptions(delimiter=dialect.delimiter, quote_char=dialect.quotechar,
+                                              double_quote=True, newlines_in_values=True,
+                                              ignore_empty_lines=True, invalid_row_handler=invalid_row),
+            convert_options=pacsv.ConvertOptions(column_types={n: pyarrow.string() for n in names},
+                                                 strings_can_be_null=False, quoted_strings_can_be_null=False),
+        )
+    except pyarrow.ArrowInvalid:
+        if text.strip("\r\n"):
+            return None
+        return [], 0
+    if ragged:
+        return None
+
+    null = pyarrow.scalar(None, pyarrow.string())
+    keys = list(project.keys)
+    # Empty cell -> null (not in the record), anything else stripped like str.strip()
+    columns = [pc.if_else(pc.equal(table.column(i), ""), null, pc.utf8_trim_whitespace(table.column(i)))
+               for i in project.indexes]
+
+    if project.merge_names:
+        contact, first, last = _name_columns(keys)
+        has_contact = pyarrow.scalar(False)
+        for n in contact:
+            has_contact = pc.or_(has_contact, pc.is_valid(columns[n]))
+        # Duplicate columns: the last non-empty one wins, like record[key] = value
+        first_name = pc.coalesce(*[columns[n] for n in reversed(first)], "") if first else ""
+        last_name = pc.coalesce(*[columns[n] for n in reversed(last)], "") if last else ""
+        joined = pc.utf8_trim(pc.binary_join_element_wise(first_name, last_name, " "), " ")
+        merged = pc.if_else(pc.or_(has_contact, pc.equal(joined, "")), null, joined)
+        if not project.keep_name_parts:
+            for n in first + last:
+                columns[n] = pc.if_else(has_contact, columns[n], null)
+        keys.append("contact_name")
+        columns.append(merged)
+
+    return _assemble(keys, [c.to_pylist() for c in columns]), table.num_rows
+
+
+def _blank_lines(text, quote):
+    """Empty lines outside quoted fields: csv.reader skips them, polars reads them as rows of empty cells"""
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    blank = 0
+    inside = False
+    for line in lines:
+        if not inside and not line.rstrip("\r"):
+            blank += 1
+        inside ^= line.count(quote) & 1
+    return blank
+
+
+def _parse_polars(text, project, dialect):
+    names = [f"c{i}" for i in range(project.width)]
+    try:
+        frame = polars.read_csv(
+            io.BytesIO(text.encode("utf-8")), has_header=False, new_columns=names,
+            separator=dialect.delimiter, quote_char=dialect.quotechar, infer_schema_length=0,
+            raise_if_empty=False, **_POLARS_EMPTY,
+        )
+    except Exception:
+        return None  # rows wider than the header and other input polars rejects
+    if frame.width != project.width:
+        return None
+    if frame.height == 0:
+        return [], 0
+
+    keys = list(project.keys)
+    col = polars.col
+    exprs = [polars.when(col(names[i]).is_null() | (col(names[i]) == "")).then(None)
+             .otherwise(col(names[i]).str.strip_chars()).alias(f"k{n}")
+             for n, i in enumerate(project.indexes)]
+    columns = frame.select(exprs)
+
+    if project.merge_names:
+        contact, first, last = _name_columns(keys)
+        has_contact = polars.any_horizontal([col(f"k{n}").is_not_null() for n in contact]) if contact else polars.lit(False)
+        first_name = polars.coalesce([col(f"k{n}") for n in reversed(first)] + [polars.lit("")])
+        last_name = polars.coalesce([col(f"k{n}") for n in reversed(last)] + [polars.lit("")])
+        joined = polars.concat_str([first_name, last_name], separator=" ").str.strip_chars(" ")
+        merged = [polars.when(has_contact | (joined == "")).then(None).otherwise(joined).alias("merged")]
+        if not project.keep_name_parts:
+            merged += [polars.when(has_contact).then(col(f"k{n}")).otherwise(None).alias(f"k{n}") for n in first + last]
+        columns = columns.with_columns(merged)
+        keys.append("contact_name")
+
+    series = [columns.get_column(f"k{n}").to_list() for n in range(len(project.keys))]
+    if project.merge_names:
+        series.append(columns.get_column("merged").to_list())
+    return _assemble(keys, series), frame.height - _blank_lines(text, dialect.quotechar)
+
+
+_VECTORIZED = {"pyarrow": _parse_arrow, "polars": _parse_polars}
+
+
+def parse(text, project, dialect=csv.excel, first_column=None, backend=None, stats=None):
+    """(records, rows) of CSV text with the given backend, falling back to python where needed
+
+    first_column: skip the first row if its first cell is this (a header
+    repeated at the top of a block). stats: a Metrics for parse_fallbacks.
+    """
+    name = backend_name(backend)
+    if name != "python" and project.width and _plain(dialect) and not _STRIP_MISMATCH.search(text):
+        # Leading blank lines would make Arrow/polars take the first row as one column wide
+        body = text.lstrip("\r\n") if first_column is None else _drop_header(text, dialect, first_column)
+        result = _VECTORIZED[name](body, project, dialect) if body is not None else None
+        if result is not None:
+            return result
+    if name != "python" and stats is not None:
+        stats.add("parse_fallbacks", 1)
+    return parse_python(text, project, dialect, first_column)
+
+
+def add_arguments(parser):
+    """--parser, shared by the importers"""
+    parser.add_argument("--parser", choices=CHOICES, default="auto",
+                        help=f"CSV parser backend (default: auto = {BACKENDS[0]} here; installed: {', '.join(BACKENDS)})")
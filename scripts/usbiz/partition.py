@@ -0,0 +1,308 @@
+"""
+Re-sharding of a block folder into state / SIC / zip3 partitions
+
+LUCI scans filter by state (POST /api/luci/scan {"sector", "state"}), but
+blocks are cut in export order, so every scan used to read every block.
+reshard() rewrites the rows of a block folder into one directory per
+partition value:
+
+  <out>/header.csv
+  <out>/state=TX/part_0001.csv            --partition-by state
+  <out>/state=TX/sic=6531/part_0001.csv   --partition-by state,sic
+  <out>/state=TX/zip3=750/part_0001.csv   --partition-by state,zip3
+  <out>/partitions.json
+
+Partition values are read from the header's state / SIC code / zip columns
+through usbiz.normalize; a row without a usable value goes to state=_ (or
+sic=_, zip3=_). Rows are copied byte for byte (read and written as
+latin-1, so cp1252 bytes survive), and each partition is cut into files of
+at most rows_per_file rows so objects stay block-sized.
+
+partitions.json lists every partition with its values, files and row
+counts. upload-datalake.py --partition-by uploads it after the files; the
+datalake route stores it next to the objects and the scan route reads only
+the partitions matching its filters. It also records a fingerprint of the
+source blocks (names, sizes, mtimes), so an unchanged folder isn't
+re-sharded on the next run.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from operator import itemgetter
+
+from usbiz import normalize
+from usbiz.journal import safe_file_hash
+from usbiz.preflight import header_columns
+
+VERSION = 1
+MANIFEST_NAME = "partitions.json"
+LAYOUTS = ("state", "state,sic", "state,zip3")
+ROWS_PER_FILE = 10000
+FLUSH_ROWS = 200000  # rows buffered across partitions before they are appended to their files
+UNKNOWN = "_"
+QUOTE = '"'
+BOM = "\xef\xbb\xbf"  # as read in latin-1
+
+# Header spellings (lowercased, "_" as " ") of the columns partitions are keyed on
+COLUMNS = {
+    "state": ("state", "st", "state code", "mailing state"),
+    "sic": ("sic code", "sic", "primary sic", "primary sic code", "sic code 1", "sic4"),
+    "zip3": ("zip", "zip code", "zipcode", "postal code", "zip5", "mailing zip"),
+}
+
+
+def default_dir(folder, by):
+    """<folder>/.partitions-state-sic for --partition-by state,sic"""
+    return os.path.join(str(folder), ".partitions-" + "-".join(by))
+
+
+def _sic(value):
+    digits = "".join(c for c in value if c.isdigit())
+    return digits[:4] if len(digits) >= 4 else None
+
+
+def _zip3(value):
+    zip5 = normalize.zip5(value)
+    return zip5[:3] if zip5 else None
+
+
+VALUES = {"state": normalize.state, "sic": _sic, "zip3": _zip3}
+
+
+def key_columns(headers, by):
+    """Column index of each partition dimension; ValueError naming a missing one"""
+    names = [h.strip().lower().replace("_", " ") for h in headers]
+    indexes = []
+    for dim in by:
+        index = next((names.index(n) for n in COLUMNS[dim] if n in names), None)
+        if index is None:
+            raise ValueError(f"header.csv has no {dim} column (looked for: {', '.join(COLUMNS[dim])})")
+        indexes.append(index)
+    return indexes
+
+
+def partition_key(by, values):
+    """'state=TX/sic=6531' - also the partition's directory and object prefix"""
+    return "/".join(f"{dim}={value}" for dim, value in zip(by, values))
+
+
+def records(lines):
+    """(text, cells) of each CSV record in lines, text exactly as read plus a final newline
+
+    Lines without a quote are split on commas directly; a quoted record
+    (possibly spanning lines, until its quotes pair up) goes through
+    csv.reader. Blank lines are skipped.
+    """
+    pending = None
+    for line in lines:
+        if pending is not None:
+            pending += line
+            if pending.count(QUOTE) % 2:
+                continue
+            text, pending = pending, None
+        elif QUOTE in line:
+            if line.count(QUOTE) % 2:
+                pending = line
+                continue
+            text = line
+        else:
+            if line.strip("\r\n"):
+                yield (line if line.endswith("\n") else line + "\n"), line.rstrip("\r\n").split(",")
+            continue
+        yield (text if text.endswith("\n") else text + "\n"), next(csv.reader([text]))
+    if pending is not None:
+        # Unterminated quote: csv reads the rest of the file as one record
+        yield (pending if pending.endswith("\n") else pending + "\n"), next(csv.reader([pending]), [""])
+
+
+def source_fingerprint(blocks):
+    """Digest of the block names, sizes and mtimes a re-shard was made from"""
+    h = hashlib.sha256()
+    for path in blocks:
+        st = os.stat(path)
+        h.update(f"{os.path.basename(path)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+class PartitionWriter:
+    """Appends record text to per-partition part files, buffering across partitions"""
+
+    def __init__(self, out_dir, by, rows_per_file=ROWS_PER_FILE):
+        self.out_dir = out_dir
+        self.by = by
+        self.rows_per_file = rows_per_file
+        self.buffers = {}
+        self.buffered = 0
+        self.partitions = {}
+
+    def add(self, values, text):
+        rows = self.buffers.get(values)
+        if rows is None:
+            rows = self.buffers[values] = []
+        rows.append(text)
+        self.buffered += 1
+        if self.buffered >= FLUSH_ROWS:
+            self.flush()
+
+    def flush(self):
+        for values, rows in self.buffers.items():
+            self._write(values, rows)
+        self.buffers = {}
+        self.buffered = 0
+
+    def _write(self, values, rows):
+        key = partition_key(self.by, values)
+        files = self.partitions.setdefault(values, [])
+        directory = os.path.join(self.out_dir, *key.split("/"))
+        os.makedirs(directory, exist_ok=True)
+        start = 0
+        while start < len(rows):
+            # Fill the current part file, then start the next one
+            if not files or files[-1]["rows"] >= self.rows_per_file:
+                files.append({"name": f"part_{len(files) + 1:04d}.csv", "rows": 0})
+            current = files[-1]
+            end = start + self.rows_per_file - current["rows"]
+            with open(os.path.join(directory, current["name"]), "a", encoding="latin-1", newline="") as f:
+                f.write("".join(rows[start:end]))
+            current["rows"] += len(rows[start:end])
+            start = end
+
+    def close(self):
+        self.flush()
+        entries = []
+        for values in sorted(self.partitions):
+            key = partition_key(self.by, values)
+            files = self.partitions[values]
+            for f in files:
+                path = os.path.join(self.out_dir, *key.split("/"), f["name"])
+                f["bytes"] = os.path.getsize(path)
+                f["hash"] = safe_file_hash(path)
+            entries.append({
+                "key": key,
+                "values": dict(zip(self.by, values)),
+                "rows": sum(f["rows"] for f in files),
+                "files": files,
+            })
+        return entries
+
+
+def reshard(folder, blocks, by, out_dir, rows_per_file=ROWS_PER_FILE):
+    """Rewrite blocks into partitions under out_dir; returns the partitions.json dict"""
+    header_path = os.path.join(str(folder), "header.csv")
+    headers = header_columns(header_path)
+    indexes = key_columns(headers, by)
+    extract = [VALUES[dim] for dim in by]
+    cells = itemgetter(*indexes)
+    single = len(indexes) == 1
+
+    tmp_dir = f"{out_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    shutil.copyfile(header_path, os.path.join(tmp_dir, "header.csv"))
+
+    writer = PartitionWriter(tmp_dir, by, rows_per_file)
+    # Partition values per distinct raw cells: a column of states or SIC codes repeats a few dozen values
+    keys = {}
+    short = 0
+    for block in blocks:
+        with open(block, "r", encoding="latin-1", newline="") as f:
+            first = True
+            for text, row in records(f):
+                if first:
+                    first = False
+                    if text.startswith(BOM):
+                        text = text[len(BOM):]
+                        row[0] = row[0][len(BOM):]
+                    # A header row repeated at the top of the block
+                    if headers and row[0].strip() == headers[0]:
+                        continue
+                try:
+                    raw = cells(row)
+                except IndexError:
+                    short += 1
+                    raw = tuple(row[i] if i < len(row) else "" for i in indexes)
+                    raw = raw[0] if single else raw
+                key = keys.get(raw)
+                if key is None:
+                    key = keys[raw] = tuple(fn(v) or UNKNOWN for fn, v in zip(extract, (raw,) if single else raw))
+                writer.add(key, text)
+    entries = writer.close()
+
+    manifest = {
+        "version": VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "by": list(by),
+        "rowsPerFile": rows_per_file,
+        "columns": headers,
+        "source": {"blocks": len(blocks), "fingerprint": source_fingerprint(blocks)},
+        "partitions": entries,
+        "totals": {
+            "partitions": len(entries),
+            "files": sum(len(e["files"]) for e in entries),
+            "rows": sum(e["rows"] for e in entries),
+            "bytes": sum(f["bytes"] for e in entries for f in e["files"]),
+            "short_rows": short,
+        },
+    }
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=1)
+
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    os.replace(tmp_dir, out_dir)
+    return manifest
+
+
+def load(out_dir):
+    """partitions.json of a re-shard directory, None if missing or unreadable"""
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == VERSION else None
+
+
+def prepare(folder, blocks, by, out_dir, rows_per_file=ROWS_PER_FILE):
+    """(manifest, reused): the existing re-shard if it was made from these blocks, else a new one
+
+    Raises ValueError if out_dir exists but isn't a re-shard directory (it is
+    replaced wholesale, so anything else there is left alone).
+    """
+    existing = load(out_dir)
+    if (existing and existing["by"] == list(by) and existing["rowsPerFile"] == rows_per_file
+            and existing["source"]["fingerprint"] == source_fingerprint(blocks)):
+        return existing, True
+    if existing is None and os.path.isdir(out_dir) and os.listdir(out_dir):
+        raise ValueError(f"{out_dir} exists and has no {MANIFEST_NAME}; not overwriting it")
+    return reshard(folder, blocks, by, out_dir, rows_per_file), False
+
+
+def files(manifest, out_dir):
+    """(path, name, partition key, hash) of every part file, in partition order"""
+    return [(os.path.join(out_dir, *e["key"].split("/"), f["name"]), f"{e['key']}/{f['name']}", e["key"], f["hash"])
+            for e in manifest["partitions"] for f in e["files"]]
+
+
+def print_summary(manifest, top=5):
+    t = manifest["totals"]
+    print(f"Partitions:   {t['partitions']} ({'/'.join(manifest['by'])}), {t['files']} files, "
+          f"{t['rows']:,} rows, {t['bytes'] / 1e6:,.1f} MB")
+    for e in sorted(manifest["partitions"], key=lambda e: -e["rows"])[:top]:
+        share = e["rows"] / t["rows"] * 100 if t["rows"] else 0
+        print(f"              {e['key']}: {e['rows']:,} rows in {len(e['files'])} files ({share:.1f}%)")
+    if t["short_rows"]:
+        print(f"              {t['short_rows']:,} rows too short for a key column went to {UNKNOWN}")
+
+
+def add_arguments(parser):
+    """--partition-by/--partition-dir/--partition-rows for upload-datalake.py"""
+    parser.add_argument("--partition-by", choices=LAYOUTS, default=None,
+                        help="Re-shard blocks into partitions by state (and SIC code or zip3) before uploading")
+    parser.add_argument("--partition-dir", help="Where the partitions are written (default: .partitions-<by> in the folder)")
+    parser.add_argument("--partition-rows", type=int, default=ROWS_PER_FILE,
+                        help=f"Rows per partition file (default: {ROWS_PER_FILE})")
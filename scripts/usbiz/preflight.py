@@ -0,0 +1,250 @@
+"""
+Preflight for a block folder: row counts and column checks without parsing
+
+Scans each block_*.csv as raw bytes (mmap) instead of running it through
+csv and the header map, in parallel across blocks:
+  rows    - CSV records: quoted fields are collapsed first (one regex pass),
+            so a newline or delimiter inside quotes doesn't count
+  columns - delimiters per collapsed record, compared with header.csv
+  hash    - sha256 of the file, the same digest the run journals use
+Blank lines and a repeated header row at the top of a block are reported
+but not counted, like read_block skips them.
+
+The result is written as a manifest in the folder (.manifest.json). Later
+runs take block hashes from it instead of re-reading every file, as long as
+a block's size and mtime are unchanged.
+"""
+
+import csv
+import hashlib
+import json
+import mmap
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import compress, repeat
+
+from usbiz.journal import safe_file_hash
+from usbiz.split import BOM, NEWLINE, QUOTE
+from usbiz.watch import block_number
+
+VERSION = 1
+MANIFEST_NAME = ".manifest.json"
+BAD_SAMPLES = 5  # mismatched records listed per block
+DELIMITER = b","
+QUOTED = re.compile(rb'"[^"]*"')
+
+
+def manifest_path(folder):
+    return os.path.join(str(folder), MANIFEST_NAME)
+
+
+def header_columns(header_path):
+    """Column names from header.csv"""
+    with open(header_path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def _is_blank(line):
+    return not line or line == b"\r"
+
+
+def scan_block(path, columns, first_column=None):
+    """Rows, bytes, hash and column-count problems of one block"""
+    st = os.stat(path)
+    entry = {
+        "name": os.path.basename(path),
+        "bytes": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "rows": 0,
+        "blank_lines": 0,
+        "header_row": False,
+        "bad_rows": 0,
+        "bad_samples": [],
+    }
+    if st.st_size == 0:
+        entry["hash"] = hashlib.sha256().hexdigest()
+        return entry
+
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            entry["hash"] = hashlib.sha256(mm).hexdigest()
+            # Quoted fields -> one placeholder byte: delimiters and newlines inside them are
+            # gone, so each remaining line is one record ("" escapes collapse the same way)
+            text = QUOTED.sub(b"_", mm[len(BOM):] if mm[:len(BOM)] == BOM else mm)
+        finally:
+            mm.close()
+
+    unterminated = text.find(QUOTE)
+    if unterminated >= 0:
+        # An opening quote never closed: csv reads the rest of the file as one last record
+        text = text[:text.rfind(NEWLINE, 0, unterminated) + 1] + b"_"
+
+    lines = text.split(NEWLINE)
+    if text.endswith(NEWLINE):
+        lines.pop()  # nothing after the final newline
+    blank = lines.count(b"") + lines.count(b"\r")
+    first = next((i for i, line in enumerate(lines) if not _is_blank(line)), None)
+    if first is not None and first_column:
+        with open(path, "rb") as f:
+            head = f.read(64 * 1024).removeprefix(BOM).lstrip(b"\r\n")
+        entry["header_row"] = head.split(DELIMITER, 1)[0].strip(b'" \r').decode("utf-8", "replace") == first_column
+
+    # Delimiter counts run in C; only mismatched lines are looked at one by one
+    want = columns - 1
+    suspects = compress(range(len(lines)), map(want.__ne__, map(bytes.count, lines, repeat(DELIMITER))))
+    bad = [i for i in suspects if not _is_blank(lines[i]) and not (entry["header_row"] and i == first)]
+    if unterminated >= 0 and (not bad or bad[-1] != len(lines) - 1):
+        bad.append(len(lines) - 1)
+    entry["bad_rows"] = len(bad)
+
+    for i in bad[:BAD_SAMPLES]:
+        # Row number as read_block counts them: records before this one, minus blanks and the header
+        before = lines[:i]
+        row = i + 1 - before.count(b"") - before.count(b"\r") - (1 if entry["header_row"] else 0)
+        sample = {"row": row, "columns": lines[i].count(DELIMITER) + 1}
+        if unterminated >= 0 and i == len(lines) - 1:
+            sample["error"] = "unterminated quote"
+        entry["bad_samples"].append(sample)
+
+    entry["blank_lines"] = blank
+    entry["rows"] = len(lines) - blank - (1 if entry["header_row"] else 0)
+    return entry
+
+
+def _scan(args):
+    return scan_block(*args)
+
+
+def preflight(folder, blocks, workers=None):
+    """Scan header.csv and the given blocks; returns the manifest dict"""
+    header_path = os.path.join(str(folder), "header.csv")
+    headers = header_columns(header_path)
+    jobs = [(path, len(headers), headers[0] if headers else None) for path in blocks]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    if workers == 1:
+        entries = [_scan(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            entries = list(pool.map(_scan, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+    return {
+        "version": VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "header": {"columns": len(headers), "names": headers, "hash": safe_file_hash(header_path)},
+        "blocks": entries,
+        "totals": totals(entries),
+    }
+
+
+def totals(entries):
+    return {
+        "blocks": len(entries),
+        "rows": sum(e["rows"] for e in entries),
+        "bytes": sum(e["bytes"] for e in entries),
+        "bad_rows": sum(e["bad_rows"] for e in entries),
+        "bad_blocks": sum(1 for e in entries if e["bad_rows"]),
+    }
+
+
+def write_manifest(folder, manifest):
+    """Write .manifest.json atomically; returns its path (None if the folder isn't writable)"""
+    path = manifest_path(folder)
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp, path)
+    except OSError:
+        return None
+    return path
+
+
+class Manifest:
+    """Block entries of a folder's manifest, trusted only while a file's size and mtime match"""
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, folder):
+        try:
+            with open(manifest_path(folder)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls()
+        if data.get("version") != VERSION:
+            return cls()
+        return cls({e["name"]: e for e in data.get("blocks", [])})
+
+    def get(self, path):
+        """The block's entry if the file is unchanged since the preflight, else None"""
+        entry = self.entries.get(os.path.basename(str(path)))
+        if not entry:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if st.st_size != entry["bytes"] or st.st_mtime_ns != entry["mtime_ns"]:
+            return None
+        return entry
+
+    def file_hash(self, path):
+        """Journal digest of a block: from the manifest when still valid, else read the file"""
+        entry = self.get(path)
+        return entry["hash"] if entry else safe_file_hash(path)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def print_report(manifest, path=None):
+    """Per-block problems plus a totals line"""
+    header = manifest["header"]
+    for e in manifest["blocks"]:
+        notes = []
+        if e["bad_rows"]:
+            samples = ", ".join(f"row {s['row']}: " + (s.get("error") or f"{s['columns']} columns")
+                                for s in e["bad_samples"])
+            notes.append(f"{e['bad_rows']:,} rows without {header['columns']} columns ({samples})")
+        if e["header_row"]:
+            notes.append("repeats the header row")
+        if e["rows"] == 0:
+            notes.append("no data rows")
+        if notes:
+            print(f"  {e['name']}: {e['rows']:,} rows - {'; '.join(notes)}")
+    t = manifest["totals"]
+    print(f"\n[PREFLIGHT] {t['blocks']} blocks, {t['rows']:,} rows, {t['bytes'] / 1e6:,.1f} MB, "
+          f"{header['columns']} columns in header.csv")
+    if t["bad_rows"]:
+        print(f"[PREFLIGHT] {t['bad_rows']:,} rows in {t['bad_blocks']} blocks don't match the header's column count")
+    else:
+        print("[PREFLIGHT] Every row matches the header's column count")
+    if path:
+        print(f"[PREFLIGHT] Manifest: {path}")
+
+
+def run(folder, blocks, workers=None):
+    """--preflight: scan, merge into the folder manifest, print the report; returns the exit code"""
+    start = time.perf_counter()
+    manifest = preflight(folder, blocks, workers)
+    elapsed = time.perf_counter() - start
+
+    # Keep still-valid entries of blocks outside --start/--end so the manifest covers the folder
+    scanned = {e["name"] for e in manifest["blocks"]}
+    previous = Manifest.load(folder)
+    kept = [e for name, e in previous.entries.items()
+            if name not in scanned and previous.get(os.path.join(str(folder), name))]
+    report = dict(manifest)
+    manifest["blocks"] = sorted(manifest["blocks"] + kept, key=lambda e: (block_number(e["name"]) or 0, e["name"]))
+    manifest["totals"] = totals(manifest["blocks"])
+    path = write_manifest(folder, manifest)
+
+    print_report(report, path)
+    t = report["totals"]
+    print(f"[PREFLIGHT] {elapsed:.2f}s ({t['bytes'] / 1e6 / max(elapsed, 1e-9):,.0f} MB/s)")
+    return 1 if t["bad_rows"] else 0
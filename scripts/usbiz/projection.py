@@ -0,0 +1,59 @@
+"""
+Compiled CSV row projection
+
+normalize_headers() gives a {original header: field name} map. Instead of
+going through csv.DictReader and re-walking that map for every row, compile
+it once into a straight-line function that reads each column by index
+(the same exec-based trick namedtuple and dataclasses use), with the
+first/last-name merge folded in.
+
+Output matches the DictReader path: empty cells are skipped, values are
+stripped, duplicate header names resolve to the last column, and short rows
+only yield the columns they have.
+"""
+
+
+class Projection:
+    """Maps csv.reader rows (lists) to normalized record dicts"""
+
+    def __init__(self, headers, header_map, keep_name_parts=True):
+        # Last occurrence wins for duplicate header names, like DictReader
+        positions = {}
+        for i, h in enumerate(headers):
+            positions[h] = i
+
+        columns = [(positions[h], key) for h, key in header_map.items() if h in positions]
+        self.indexes = tuple(i for i, _ in columns)
+        self.keys = tuple(key for _, key in columns)
+        self.width = max(self.indexes) + 1 if self.indexes else 0
+
+        # first/last -> contact_name merge, only if those columns exist at all
+        self.merge_names = "first_name" in self.keys or "last_name" in self.keys
+        self.keep_name_parts = keep_name_parts
+        self._project = self._compile()
+
+    def _compile(self):
+        lines = ["def project(row):", "    record = {}"]
+        for i, key in zip(self.indexes, self.keys):
+            lines.append(f"    value = row[{i}]")
+            lines.append(f"    if value: record[{key!r}] = value.strip()")
+
+        if self.merge_names:
+            take = "get" if self.keep_name_parts else "pop"
+            lines += [
+                "    if 'contact_name' not in record:",
+                f"        first = record.{take}('first_name', '')",
+                f"        last = record.{take}('last_name', '')",
+                "        if first or last:",
+                "            record['contact_name'] = f'{first} {last}'.strip()",
+            ]
+        lines.append("    return record")
+
+        namespace = {}
+        exec("\n".join(lines), namespace)
+        return namespace["project"]
+
+    def __call__(self, row):
+        if len(row) < self.width:
+            row = row + [""] * (self.width - len(row))
+        return self._project(row)
@@ -0,0 +1,125 @@
+"""
+Request pacing for the block uploaders
+
+FixedRate reproduces the old `--delay` behaviour. AdaptiveRate is an AIMD
+controller fed by the shared transport: every fast, successful response
+widens the in-flight window (+1 per window of successes) and trims the
+inter-request delay, while a 429/502/503/504, a timeout or a response
+slower than the latency target halves the window and doubles the delay.
+Other errors (a 400, 401, 413, ...) say nothing about load and leave the
+pacing as it is. At most one cut is applied per round trip so a burst of
+failures from the same window only counts once.
+
+The window only grows up to --concurrency, which defaults to 1: several
+requests in flight is opt-in.
+"""
+
+import threading
+import time
+from collections import deque
+
+# Fraction of the request timeout above which the route is treated as saturated
+TARGET_FRACTION = 0.25
+DELAY_STEP = 0.05  # seconds added/removed per signal
+MAX_DELAY = 30.0
+CONGESTION_STATUSES = {429, 502, 503, 504}
+
+
+class FixedRate:
+    """Constant delay and concurrency (the pre-adaptive behaviour)"""
+
+    def __init__(self, delay, concurrency=1):
+        self.delay = delay
+        self.concurrency = concurrency
+        self.max_concurrency = concurrency
+
+    def observe(self, latency, status):
+        pass
+
+    def pause(self):
+        if self.delay > 0:
+            time.sleep(self.delay)
+
+    def describe(self):
+        return f"fixed (concurrency {self.concurrency}, delay {self.delay:.2f}s)"
+
+    def summary(self):
+        return self.describe()
+
+
+class AdaptiveRate:
+    """AIMD controller over request concurrency and inter-request delay"""
+
+    def __init__(self, timeout, start_delay=0.5, max_concurrency=1, min_delay=0.0):
+        self.target_latency = timeout * TARGET_FRACTION
+        self.delay = start_delay
+        self.min_delay = min_delay
+        self.max_concurrency = max_concurrency
+        self.window = 1.0
+        self.cuts = 0
+
+        self._lock = threading.Lock()
+        self._last_cut = 0.0
+        self._completions = deque(maxlen=50)
+
+    @property
+    def concurrency(self):
+        return max(1, int(self.window))
+
+    def observe(self, latency, status):
+        """Feed one request outcome (status None = timeout/connection error)"""
+        congested = (
+            status is None
+            or status in CONGESTION_STATUSES
+            or latency > self.target_latency
+        )
+        now = time.monotonic()
+        with self._lock:
+            if status is not None and status < 400:
+                self._completions.append(now)
+            if not congested and status is not None and status >= 400:
+                return  # a rejected request: neither a capacity signal nor a success
+            if congested:
+                # One multiplicative cut per round trip
+                if now - self._last_cut < max(latency, 1.0):
+                    return
+                self._last_cut = now
+                self.cuts += 1
+                self.window = max(1.0, self.window / 2)
+                self.delay = min(MAX_DELAY, max(self.delay * 2, DELAY_STEP))
+            else:
+                self.window = min(float(self.max_concurrency), self.window + 1.0 / self.window)
+                self.delay = max(self.min_delay, self.delay - DELAY_STEP)
+
+    def pause(self):
+        with self._lock:
+            delay = self.delay
+        if delay > 0:
+            time.sleep(delay)
+
+    def rate(self):
+        """Recent successful requests per second"""
+        with self._lock:
+            times = list(self._completions)
+        if len(times) < 2 or times[-1] <= times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def describe(self):
+        return (f"adaptive (start delay {self.delay:.2f}s, up to {self.max_concurrency} in flight, "
+                f"latency target {self.target_latency:.0f}s)")
+
+    def summary(self):
+        return (f"adaptive, settled at {self.rate():.2f} req/s "
+                f"(concurrency {self.concurrency}, delay {self.delay:.2f}s, {self.cuts} backoffs)")
+
+
+def from_args(delay, concurrency, timeout, default_delay, default_max_concurrency=1):
+    """Build a controller from CLI flags: an explicit --delay pins the old fixed pacing"""
+    if delay is not None:
+        return FixedRate(delay, concurrency or 1)
+    return AdaptiveRate(
+        timeout,
+        start_delay=default_delay,
+        max_concurrency=concurrency or default_max_concurrency,
+    )
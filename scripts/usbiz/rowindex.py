@@ -0,0 +1,186 @@
+"""
+Byte-offset row index for a single large CSV
+
+Records the byte offset of every Nth CSV record so a chunk can be read by
+seeking straight to it instead of re-parsing the file from byte 0. The index
+is built in one mmap pass (bulk newline counts, with a per-line quote parity
+check only where the text contains quotes, so quoted newlines never split a
+record) and cached next to the CSV as .rowindex-<file>-<N>.json. Blank lines
+are not records (the parsers skip them), so the row count and every chunk's
+size match what is parsed. A cached index is reused only while the CSV's size
+and mtime are unchanged.
+
+Records are found by quote parity on `quote` (the quote character the CSV
+was sniffed with) and "\n" line endings; a file that ends its lines with a
+bare "\r" can't be indexed (build raises ValueError), and neither can a
+dialect with an escape character or without quoting.
+
+Chunk k (1-based) covers bytes offsets[k-1]:offsets[k]; chunks are disjoint,
+so several processes can read different chunks of the same file at once.
+"""
+
+import csv
+import json
+import mmap
+import os
+from pathlib import Path
+
+from usbiz.split import NEWLINE, QUOTE, data_start, nth_line_end
+
+VERSION = 2
+
+
+def index_path(csv_path, every):
+    """Default sidecar location for a CSV's index"""
+    csv_path = Path(csv_path)
+    return csv_path.parent / f".rowindex-{csv_path.stem}-{every}.json"
+
+
+def has_blank_line(chunk):
+    """Whether chunk (starting at a line start) may hold an empty line"""
+    return chunk[:1] in (b"\n", b"\r") or b"\n\n" in chunk or b"\n\r" in chunk
+
+
+def skip_records(mm, pos, n, end, avg_line, quote=QUOTE):
+    """Offset just past the n-th CSV record starting at pos (or end); blank lines don't count"""
+    parity = 0
+    while n > 0:
+        scan = nth_line_end(mm, pos, n, end, avg_line)
+        if scan >= end:
+            return end
+        chunk = mm[pos:scan]
+        if not parity and quote not in chunk and not has_blank_line(chunk):
+            return scan
+        # chunk holds exactly n lines; only non-blank ones closing a record count
+        for line in chunk.split(NEWLINE)[:-1]:
+            if not parity and not line.rstrip(b"\r"):
+                continue
+            parity ^= line.count(quote) & 1
+            if not parity:
+                n -= 1
+        pos = scan
+    return pos
+
+
+def count_records(mm, pos, end, quote=QUOTE):
+    """Number of CSV records in mm[pos:end] (end must be a record boundary), blank lines left out"""
+    chunk = mm[pos:end]
+    if quote not in chunk and not has_blank_line(chunk):
+        return chunk.count(NEWLINE) + (bool(chunk) and not chunk.endswith(NEWLINE))
+    rows = 0
+    parity = 0
+    for line in chunk.split(NEWLINE):
+        if not parity and not line.rstrip(b"\r"):
+            continue
+        parity ^= line.count(quote) & 1
+        if not parity:
+            rows += 1
+    # A quote left open at the end of the file still makes a record
+    return rows + parity
+
+
+class RowIndex:
+    """Offsets of every `every`-th record of a CSV, plus its total record count"""
+
+    def __init__(self, every, offsets, rows, size, mtime_ns, quote=QUOTE):
+        self.every = every
+        self.quote = quote
+        self.offsets = offsets
+        self.rows = rows
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    @property
+    def chunks(self):
+        return len(self.offsets) - 1
+
+    def chunk_range(self, chunk):
+        """(start, end) byte offsets of 1-based chunk `chunk`"""
+        return self.offsets[chunk - 1], self.offsets[chunk]
+
+    @classmethod
+    def build(cls, csv_path, every, quote=QUOTE):
+        """Scan csv_path once and index every `every`-th record after the header"""
+        stat = os.stat(csv_path)
+        offsets = []
+        rows = 0
+        if stat.st_size == 0:
+            return cls(every, [0], 0, stat.st_size, stat.st_mtime_ns, quote)
+
+        with open(csv_path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                end = len(mm)
+                head = mm[:1 << 20]
+                if b"\r" in head.rstrip(b"\r") and NEWLINE not in head:
+                    raise ValueError("lines end in a bare \\r, the row index needs \\n line endings")
+                pos, _ = data_start(mm, quote)
+                sample = mm[pos:min(end, pos + (1 << 20))]
+                avg_line = len(sample) / max(1, sample.count(NEWLINE))
+                offsets.append(pos)
+                while pos < end:
+                    nxt = skip_records(mm, pos, every, end, avg_line, quote)
+                    if nxt >= end:
+                        last = count_records(mm, pos, end, quote)
+                        if not last:
+                            # Only blank lines left: they go with the previous chunk
+                            offsets[-1] = end
+                            break
+                        rows += last
+                    else:
+                        rows += every
+                        avg_line = max(1.0, (nxt - pos) / every)
+                    offsets.append(nxt)
+                    pos = nxt
+            finally:
+                mm.close()
+        return cls(every, offsets, rows, stat.st_size, stat.st_mtime_ns, quote)
+
+    @classmethod
+    def load(cls, path, csv_path, every, quote=QUOTE):
+        """Cached index at `path`, or None if missing, unreadable, or stale"""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            stat = os.stat(csv_path)
+        except (OSError, ValueError):
+            return None
+        if (data.get("version") != VERSION or data.get("every") != every
+                or data.get("quote") != quote.decode("latin-1")
+                or data.get("size") != stat.st_size or data.get("mtime_ns") != stat.st_mtime_ns):
+            return None
+        return cls(every, data["offsets"], data["rows"], data["size"], data["mtime_ns"], quote)
+
+    def save(self, path):
+        """Write the index atomically; returns False if the directory is not writable"""
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"version": VERSION, "every": self.every, "quote": self.quote.decode("latin-1"),
+                           "size": self.size, "mtime_ns": self.mtime_ns, "rows": self.rows,
+                           "offsets": self.offsets}, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError:
+            return False
+        return True
+
+
+def quote_of(dialect):
+    """The quote byte the index splits records on for a csv dialect; ValueError if it can't follow it"""
+    if dialect.quoting == csv.QUOTE_NONE or not dialect.quotechar or dialect.escapechar:
+        raise ValueError("the row index needs a quoted CSV dialect without an escape character")
+    quote = dialect.quotechar.encode("utf-8")
+    if len(quote) != 1 or quote in b"\r\n":
+        raise ValueError(f"the row index can't split on quote character {dialect.quotechar!r}")
+    return quote
+
+
+def load_or_build(csv_path, every, path=None, quote=QUOTE):
+    """(index, built) for csv_path, reusing the cached sidecar when it is still valid"""
+    path = path or index_path(csv_path, every)
+    index = RowIndex.load(path, csv_path, every, quote)
+    if index:
+        return index, False
+    index = RowIndex.build(csv_path, every, quote)
+    index.save(path)
+    return index, True
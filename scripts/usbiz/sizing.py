@@ -0,0 +1,111 @@
+"""
+Byte-size-aware request sizing for /api/sectors/import
+
+A fixed record count per request ignores how wide the records are: a chunk
+of a sparse list is a few hundred KB, the same count of rows with long SIC
+descriptions and websites is many MB and can run into the request timeout,
+failing the whole chunk. RequestSizer instead cuts each chunk's records into
+requests of about `target` bytes of JSON, and tunes the target from the
+server latency of the requests it sent:
+  - a fast response grows the target towards bytes/sec * goal latency
+    (at most GROWTH per response)
+  - a slow one shrinks it the same way
+  - a timeout, 413 or 504 halves it below the size that failed, and the
+    importers re-cut the rest of the chunk at the new size instead of
+    re-sending the same oversized body (MAX_RESPLITS times per chunk)
+The goal latency is a fraction of the request timeout, so requests stay well
+inside it whatever the list looks like. Chunk/block boundaries (journal,
+dedup and --since units) are unchanged; only the requests inside them vary.
+"""
+
+import threading
+
+DEFAULT_TARGET_KB = 2048
+MIN_BYTES = 64 * 1024
+MAX_BYTES = 16 * 1024 * 1024
+GOAL_FRACTION = 0.1  # of the request timeout
+GROWTH = 1.5  # max factor the target grows per response
+SHRINK_STATUSES = {413, 504}  # payload too large / upstream gave up
+MAX_RESPLITS = 4  # per chunk, after a request timed out or was too large
+
+
+def record_bytes(record):
+    """Approximate compact-JSON size of a flat str->str record"""
+    size = 1
+    for k, v in record.items():
+        size += len(k) + len(v) + 6 if isinstance(v, str) else len(k) + len(str(v)) + 4
+    return size
+
+
+class RequestSizer:
+    """Target request payload size, tuned from observed latency; safe to share across threads"""
+
+    def __init__(self, timeout, target_kb=DEFAULT_TARGET_KB, adaptive=True,
+                 min_bytes=MIN_BYTES, max_bytes=MAX_BYTES):
+        self.goal_latency = timeout * GOAL_FRACTION
+        self.min_bytes = min_bytes
+        self.max_bytes = max(max_bytes, target_kb * 1024)
+        self.target = max(min_bytes, target_kb * 1024)
+        self.adaptive = adaptive
+        self.requests = 0
+        self.shrinks = 0
+        self._lock = threading.Lock()
+
+    def take(self, records, start=0):
+        """(end, bytes): records[start:end] is the next request of about `target` bytes (at least one record)
+
+        A columnar.Table carries its rows' encoded sizes; plain record dicts are measured here.
+        """
+        with self._lock:
+            target = self.target
+        sizes = getattr(records, "sizes", None)
+        size = 2  # []
+        end = start
+        while end < len(records):
+            nbytes = (sizes[end] if sizes is not None else record_bytes(records[end])) + 1
+            if end > start and size + nbytes > target:
+                break
+            size += nbytes
+            end += 1
+        return end, size
+
+    def observe(self, nbytes, latency, status):
+        """Feed one request's payload size, server latency and status (None = timeout/connection error)"""
+        if not self.adaptive:
+            return
+        with self._lock:
+            self.requests += 1
+            if status is None or status in SHRINK_STATUSES:
+                self.target = max(self.min_bytes, min(self.target, nbytes) // 2)
+                self.shrinks += 1
+                return
+            if status >= 400 or latency <= 0:
+                return  # says nothing about size
+            # Tail requests smaller than the target are too short to extrapolate from
+            if nbytes < self.target / 2 and latency < self.goal_latency:
+                return
+            ideal = nbytes / latency * self.goal_latency
+            target = min(ideal, self.target * GROWTH) if ideal > self.target else max(ideal, self.target / 2)
+            if target < self.target:
+                self.shrinks += 1
+            self.target = int(min(self.max_bytes, max(self.min_bytes, target)))
+
+    def describe(self):
+        if not self.adaptive:
+            return f"fixed {self.target // 1024:,} KB per request"
+        return (f"adaptive from {self.target // 1024:,} KB per request "
+                f"(latency goal {self.goal_latency:.0f}s, {self.min_bytes // 1024:,} KB - {self.max_bytes // 1024:,} KB)")
+
+    def summary(self):
+        with self._lock:
+            if not self.adaptive:
+                return self.describe()
+            return f"settled at {self.target // 1024:,} KB per request ({self.shrinks} shrinks over {self.requests} requests)"
+
+
+def add_arguments(parser):
+    """--request-kb / --fixed-request-size, shared by the JSON importers"""
+    parser.add_argument("--request-kb", type=int, default=DEFAULT_TARGET_KB,
+                        help=f"Target JSON payload per request in KB; chunks are split to fit (default: {DEFAULT_TARGET_KB})")
+    parser.add_argument("--fixed-request-size", action="store_true",
+                        help="Keep --request-kb fixed instead of tuning it from server latency")
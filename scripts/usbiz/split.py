@@ -0,0 +1,191 @@
+"""
+Fast splitter for raw USBizData exports
+
+Cuts a CSV into header.csv + block_0001.csv ... on byte offsets without
+going through the csv module. The file is memory-mapped; newlines are found
+with mmap.find and quote parity is checked with bytes.count, both of which
+run at memory speed, so a newline inside a quoted field is never used as a
+cut point. The file is divided into one segment per worker (each aligned to
+a record boundary), workers write their blocks in parallel, and the parts
+are renamed into one block_NNNN sequence at the end. Files under 16 MB are
+split by a single worker; otherwise the last block of each worker's segment
+may be short.
+
+Blocks are cut to a target size in rows or bytes. In row mode a newline
+inside a quoted field counts towards the target, so such blocks may hold
+slightly fewer records than asked for; cut points are always exact. Quote
+parity is counted on `quote` (default '"'), the same as the row index.
+"""
+
+import glob
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+QUOTE = b'"'
+NEWLINE = b"\n"
+BOM = b"\xef\xbb\xbf"
+DEFAULT_ROWS = 10000
+COUNT_WINDOW = 16 << 20  # bytes copied at a time when counting quotes
+MIN_SEGMENT = 16 << 20  # smaller files are split by a single worker
+
+
+def count_quotes(mm, start, end, quote=QUOTE):
+    """Number of quote characters in mm[start:end], without copying it all at once"""
+    total = 0
+    for pos in range(start, end, COUNT_WINDOW):
+        total += mm[pos:min(end, pos + COUNT_WINDOW)].count(quote)
+    return total
+
+
+def next_record_end(mm, record_start, pos, end=None, quote=QUOTE):
+    """Offset just past the first newline at/after pos that ends a record starting at record_start.
+
+    A newline ends a record only if the quotes between record_start and it
+    are balanced. Returns `end` (default: file size) if there is none.
+    """
+    end = len(mm) if end is None else end
+    parity = count_quotes(mm, record_start, pos, quote) & 1 if pos > record_start else 0
+    while pos < end:
+        nl = mm.find(NEWLINE, pos, end)
+        if nl < 0:
+            return end
+        parity ^= count_quotes(mm, pos, nl, quote) & 1
+        if not parity:
+            return nl + 1
+        pos = nl + 1
+    return end
+
+
+def nth_line_end(mm, pos, n, end, avg_line):
+    """Offset just past the n-th newline at/after pos (or end), found with bulk counts.
+
+    Guesses a window from the average line length, counts newlines in it at C
+    speed, widens if short, then steps back with rfind over the overshoot.
+    """
+    step = int(n * avg_line * 1.05) + 4096
+    hi = min(end, pos + step)
+    found = mm[pos:hi].count(NEWLINE)
+    while found < n and hi < end:
+        nxt = min(end, hi + max(step // 4, 4096))
+        found += mm[hi:nxt].count(NEWLINE)
+        hi = nxt
+    if found < n:
+        return end
+    nl = hi
+    for _ in range(found - n + 1):
+        nl = mm.rfind(NEWLINE, pos, nl)
+    return nl + 1
+
+
+def data_start(mm, quote=QUOTE):
+    """(offset where data rows begin, header bytes without BOM or line ending)"""
+    start = len(BOM) if mm[:len(BOM)] == BOM else 0
+    header_end = next_record_end(mm, start, start, quote=quote)
+    return header_end, bytes(mm[start:header_end]).rstrip(b"\r\n")
+
+
+def segment_starts(mm, start, parts, quote=QUOTE):
+    """Split [start, EOF) into `parts` ranges, each beginning on a record boundary"""
+    size = len(mm)
+    starts = [start]
+    parity = 0
+    prev = start
+    for k in range(1, parts):
+        nominal = start + (size - start) * k // parts
+        if nominal <= starts[-1]:
+            continue
+        parity ^= count_quotes(mm, prev, nominal, quote) & 1
+        prev = nominal
+        # Walk forward from the nominal offset to a newline outside quotes
+        pos = nominal
+        p = parity
+        while pos < size:
+            nl = mm.find(NEWLINE, pos)
+            if nl < 0:
+                pos = size
+                break
+            p ^= count_quotes(mm, pos, nl, quote) & 1
+            pos = nl + 1
+            if not p:
+                break
+        if starts[-1] < pos < size:
+            starts.append(pos)
+    return starts
+
+
+def split_segment(path, start, end, out_dir, tag, rows=None, size=None, quote=QUOTE):
+    """Write [start, end) as part files of ~rows rows or ~size bytes; returns [(part path, bytes)]"""
+    parts = []
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mm)
+        try:
+            pos = start
+            sample = mm[start:min(end, start + (1 << 20))]
+            avg_line = len(sample) / max(1, sample.count(NEWLINE))
+            while pos < end:
+                if size:
+                    target = min(end, pos + size)
+                    cut = next_record_end(mm, pos, max(pos, target - 1), end, quote) if target < end else end
+                else:
+                    scan = nth_line_end(mm, pos, rows, end, avg_line)
+                    cut = next_record_end(mm, pos, scan - 1, end, quote) if scan < end else end
+                    avg_line = max(1.0, (scan - pos) / rows)
+
+                if mm[pos:cut].strip():
+                    part = os.path.join(out_dir, f".part-{tag:04d}-{len(parts):06d}.csv")
+                    with open(part, "wb") as out:
+                        out.write(view[pos:cut])
+                    parts.append((part, cut - pos))
+                pos = cut
+        finally:
+            view.release()
+            mm.close()
+    return parts
+
+
+def split_file(path, out_dir, rows=None, size=None, workers=None, quote=QUOTE):
+    """Split `path` into out_dir/header.csv + block_NNNN.csv; returns the block paths"""
+    if not rows and not size:
+        rows = DEFAULT_ROWS
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(out_dir, exist_ok=True)
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"{path} is empty")
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            start, header = data_start(mm, quote)
+            file_size = len(mm)
+            parts = max(1, min(workers, (file_size - start) // MIN_SEGMENT))
+            starts = segment_starts(mm, start, parts, quote)
+        finally:
+            mm.close()
+
+    with open(os.path.join(out_dir, "header.csv"), "wb") as out:
+        out.write(header + b"\n")
+
+    ranges = list(zip(starts, starts[1:] + [file_size]))
+    if len(ranges) == 1:
+        results = [split_segment(path, ranges[0][0], ranges[0][1], out_dir, 0, rows, size, quote)]
+    else:
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [pool.submit(split_segment, path, s, e, out_dir, tag, rows, size, quote)
+                       for tag, (s, e) in enumerate(ranges)]
+            results = [future.result() for future in futures]
+
+    part_files = [part for segment in results for part, _ in segment]
+    width = max(4, len(str(len(part_files))))
+    blocks = []
+    for n, part in enumerate(part_files, start=1):
+        block = os.path.join(out_dir, f"block_{n:0{width}d}.csv")
+        os.replace(part, block)
+        blocks.append(block)
+    return blocks
+
+
+def existing_blocks(out_dir):
+    """block_*.csv files already in a folder"""
+    return sorted(glob.glob(os.path.join(out_dir, "block_*.csv")))
@@ -0,0 +1,349 @@
+"""
+Pooled HTTP transport shared by the USBizData uploaders
+
+One keep-alive requests.Session per process, so long runs reuse TCP/TLS
+connections instead of handshaking for every block. POSTs are retried with
+jittered exponential backoff, honouring Retry-After, and every attempt's
+latency is recorded for the end-of-run summary.
+
+A POST the server may already have acted on (a 500/502/504, a timeout, a
+connection dropped mid-request) is only repeated when repeating it is
+harmless: the request carries an Idempotency-Key header, which every retry
+re-sends and /api/sectors/import answers from the first attempt, or the
+caller says it is idempotent. Anything else is retried only on 429/503 and
+on connections that failed before the request was sent.
+
+Bodies can optionally be gzip-encoded (Content-Encoding: gzip); the
+/api/sectors/import and /api/luci/datalake routes decode them.
+
+JSON record payloads can be streamed (json_stream): the records are encoded
+a few hundred at a time while the request is being sent with chunked
+transfer encoding, so the full JSON text never exists in memory. orjson is
+used for encoding when it is installed, stdlib json otherwise.
+"""
+
+import gzip
+import json
+import math
+import os
+import random
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+try:
+    import orjson
+except ImportError:  # optional, only faster
+    orjson = None
+
+# Configuration
+MAX_RETRIES = int(os.getenv("NEXTIER_MAX_RETRIES", "4"))
+BACKOFF_BASE = float(os.getenv("NEXTIER_BACKOFF_BASE", "1.0"))  # seconds
+BACKOFF_CAP = float(os.getenv("NEXTIER_BACKOFF_CAP", "60"))  # seconds
+RETRY_AFTER_CAP = 300  # never honour a Retry-After longer than this
+POOL_SIZE = 16
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Statuses that mean the request was turned away before it was processed
+UNPROCESSED_STATUSES = {429, 503}
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+# Request body encodings the Next.js routes can decode (Node 20 zlib has no zstd)
+COMPRESSIONS = ("gzip",)
+GZIP_LEVEL = 6
+STREAM_BATCH = 256  # list items encoded per chunk of a streamed body (~100 KB of records)
+JSON_ENCODERS = ("orjson", "json") if orjson else ("json",)
+
+
+def json_encoder(name=None):
+    """dumps(obj) -> compact UTF-8 JSON bytes; orjson when installed unless name says otherwise"""
+    name = name or JSON_ENCODERS[0]
+    if name == "orjson":
+        if orjson is None:
+            raise ValueError("orjson is not installed")
+        return orjson.dumps
+    if name == "json":
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+        return lambda obj: encode(obj).encode("utf-8")
+    raise ValueError(f"Unknown JSON encoder: {name}")
+
+
+def compress(body, encoding):
+    """Encode a request body; returns (bytes, extra headers). encoding None = identity."""
+    if not encoding:
+        return body, {}
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0), {"Content-Encoding": "gzip"}
+    raise ValueError(f"Unsupported body encoding: {encoding}")
+
+
+def json_body(payload, encoding=None):
+    """Serialize a JSON payload for transport.post(data=...); returns (bytes, headers)"""
+    body = json_encoder()(payload)
+    body, headers = compress(body, encoding)
+    return body, {"Content-Type": "application/json", **headers}
+
+
+class JSONStream:
+    """A JSON payload whose `key` list is encoded item by item as it is sent
+
+    Iterating yields the body STREAM_BATCH items at a time (gzip-compressed with
+    encoding="gzip"). requests sends an iterable without a length using
+    Transfer-Encoding: chunked. Each iteration starts over, so a retry
+    re-sends the whole body; `size` and `seconds` are the byte count and the
+    encode/compress time (excluding time spent sending) of the last complete
+    iteration.
+    """
+
+    def __init__(self, payload, key="records", encoding=None, encoder=None):
+        if encoding and encoding not in COMPRESSIONS:
+            raise ValueError(f"Unsupported body encoding: {encoding}")
+        self.items = payload[key]
+        self.encoding = encoding
+        self.dumps = json_encoder(encoder)
+        # Everything but the list is small: encode it once, the list goes last
+        head = self.dumps({k: v for k, v in payload.items() if k != key})
+        self.head = head[:-1] + (b"," if len(head) > 2 else b"") + self.dumps(key) + b":["
+        self.size = None
+        self.seconds = None
+
+    def _json(self):
+        # One encoder call per batch (not per item) keeps orjson near its buffered speed
+        items = self.items
+        piece = self.head
+        for i in range(0, len(items), STREAM_BATCH):
+            encoded = self.dumps(items[i:i + STREAM_BATCH])
+            yield piece + (b"," if i else b"") + encoded[1:-1]
+            piece = b""
+        yield piece + b"]}"
+
+    def _encoded(self):
+        if self.encoding != "gzip":
+            yield from self._json()
+            return
+        # wbits=31: gzip container; mtime is written as 0 like compress()
+        gz = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        for piece in self._json():
+            out = gz.compress(piece)
+            if out:
+                yield out
+        yield gz.flush()
+
+    def __iter__(self):
+        size = 0
+        seconds = 0.0
+        pieces = self._encoded()
+        while True:
+            start = time.perf_counter()
+            piece = next(pieces, None)
+            seconds += time.perf_counter() - start
+            if piece is None:
+                break
+            size += len(piece)
+            yield piece
+        self.size = size
+        self.seconds = seconds
+
+
+def json_stream(payload, encoding=None, key="records"):
+    """Streamed counterpart of json_body for transport.post(data=...); returns (JSONStream, headers)"""
+    body = JSONStream(payload, key, encoding)
+    headers = {"Content-Type": "application/json"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return body, headers
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds, or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (0 if empty)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def idempotency_key():
+    """A new Idempotency-Key value; build it once per logical request, not per attempt"""
+    return uuid.uuid4().hex
+
+
+def _has_idempotency_key(headers):
+    return any(k.lower() == IDEMPOTENCY_HEADER.lower() for k in headers or ())
+
+
+def _unsent(error):
+    """Whether a connection error happened before any of the request reached the server"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _rewind(files):
+    """Seek multipart file objects back to 0 so a retry re-sends the whole body"""
+    if not files:
+        return
+    values = files.values() if isinstance(files, dict) else (v for _, v in files)
+    for value in values:
+        fileobj = value[1] if isinstance(value, tuple) else value
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+
+
+class Transport:
+    """Keep-alive session with retry/backoff; safe to share across threads"""
+
+    def __init__(self, pool_size=POOL_SIZE, max_retries=MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE, backoff_cap=BACKOFF_CAP):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        self._lock = threading.Lock()
+        self.latencies = []  # seconds, one per attempt
+        self.requests = 0
+        self.retries = 0
+        self.observers = []
+        self.backoff_observers = []
+
+    def add_observer(self, callback):
+        """Register callback(latency, status) for every attempt; status is None on timeout/connection error"""
+        self.observers.append(callback)
+
+    def add_backoff_observer(self, callback):
+        """Register callback(seconds, attempt) for every sleep before a retry"""
+        self.backoff_observers.append(callback)
+
+    def _sleep(self, delay, attempt):
+        for callback in self.backoff_observers:
+            callback(delay, attempt)
+        time.sleep(delay)
+
+    def _record(self, latency, retried, status):
+        with self._lock:
+            self.latencies.append(latency)
+            self.requests += 1
+            if retried:
+                self.retries += 1
+        for callback in self.observers:
+            callback(latency, status)
+
+    def backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential delay for the given attempt, at least Retry-After"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, RETRY_AFTER_CAP))
+        return delay
+
+    def post(self, url, retry_timeouts=True, retry_statuses=None, idempotent=None, **kwargs):
+        """POST with retries. Returns the final response, or raises the last network error.
+
+        retry_timeouts=False raises a Timeout straight away, for callers that
+        would rather re-send the data differently (e.g. in smaller requests).
+        retry_statuses overrides RETRY_STATUSES for this call. idempotent
+        (default: the headers have an Idempotency-Key) allows repeating a
+        request the server may have processed; without it only 429/503 and
+        connections that never reached the server are retried.
+        """
+        if idempotent is None:
+            idempotent = _has_idempotency_key(kwargs.get("headers"))
+        retry_statuses = set(RETRY_STATUSES if retry_statuses is None else retry_statuses)
+        if not idempotent:
+            retry_statuses &= UNPROCESSED_STATUSES
+        files = kwargs.get("files")
+        attempt = 0
+        while True:
+            _rewind(files)
+            start = time.perf_counter()
+            try:
+                response = self.session.post(url, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                self._record(time.perf_counter() - start, attempt > 0, None)
+                if (attempt >= self.max_retries or not (idempotent or _unsent(e))
+                        or (not retry_timeouts and isinstance(e, requests.exceptions.Timeout))):
+                    raise
+                self._sleep(self.backoff(attempt), attempt)
+                attempt += 1
+                continue
+
+            self._record(time.perf_counter() - start, attempt > 0, response.status_code)
+            if response.status_code not in retry_statuses or attempt >= self.max_retries:
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            response.close()
+            self._sleep(self.backoff(attempt, retry_after), attempt)
+            attempt += 1
+
+    def keepalive(self, url, timeout=10):
+        """Cheap HEAD request so an idle pooled connection isn't dropped; errors are ignored
+
+        Not recorded as a request: any status (even 404/405) keeps the connection warm.
+        """
+        try:
+            self.session.head(url, timeout=timeout).close()
+        except requests.exceptions.RequestException:
+            pass
+
+    def stats(self):
+        """Snapshot of request counts and latency percentiles"""
+        with self._lock:
+            latencies = list(self.latencies)
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "p50": percentile(latencies, 50),
+                "p99": percentile(latencies, 99),
+            }
+
+    def summary(self):
+        """One-line summary for the end-of-run banner"""
+        s = self.stats()
+        return (f"{s['requests']} requests, {s['retries']} retries, "
+                f"latency p50 {s['p50']:.2f}s / p99 {s['p99']:.2f}s")
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_transport(pool_size=None):
+    """Process-wide shared Transport (pool_size only applies on first call)"""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Transport(pool_size=max(pool_size or 0, POOL_SIZE))
+        return _default
+
+
+def post(url, **kwargs):
+    """POST through the shared transport"""
+    return get_transport().post(url, **kwargs)
@@ -0,0 +1,139 @@
+"""
+Watch a block folder and hand over blocks once they are completely written
+
+The export job writes block_*.csv files into a CampaignBlocks/<Sector>
+folder over tens of minutes. BlockWatcher polls the folder (stdlib only, so
+it behaves the same on Windows, macOS and Linux, local disks and shares)
+and yields a block once its size and mtime have not changed for `settle`
+seconds - or straight away if it was already that old when first seen, so
+blocks that landed before the watcher started go out immediately.
+
+While nothing is ready the watcher calls on_idle() every poll, which the
+scripts use to report finished uploads (so the journal is current while the
+daemon waits) and to keep their pooled connection warm. It stops when
+stop() is called (SIGINT/SIGTERM in the scripts) or after `idle_exit`
+seconds without a new block.
+"""
+
+import glob
+import os
+import re
+import signal
+import threading
+import time
+
+POLL_INTERVAL = 2.0  # seconds between folder scans
+SETTLE_SECONDS = 10.0  # unchanged size/mtime for this long = finished
+KEEPALIVE_INTERVAL = 30.0  # seconds between keep-alive requests while idle
+
+_BLOCK_NUMBER = re.compile(r"block_(\d+)\.csv$", re.IGNORECASE)
+
+
+def block_number(path):
+    """1234 for .../block_1234.csv (None if the name has no number)"""
+    match = _BLOCK_NUMBER.search(os.path.basename(str(path)))
+    return int(match.group(1)) if match else None
+
+
+class BlockWatcher:
+    """Yields block paths in block-number order as they finish being written"""
+
+    def __init__(self, folder, pattern="block_*.csv", settle=SETTLE_SECONDS, poll=POLL_INTERVAL,
+                 idle_exit=0, on_idle=None):
+        self.folder = str(folder)
+        self.pattern = pattern
+        self.settle = settle
+        self.poll = poll
+        self.idle_exit = idle_exit
+        self.on_idle = on_idle
+        self.seen = set()
+        self._pending = {}  # path -> ((size, mtime_ns), monotonic time that signature was first seen)
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def _stable(self, path, now):
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._pending.pop(path, None)  # renamed or deleted under us
+            return False
+        signature = (st.st_size, st.st_mtime_ns)
+        previous = self._pending.get(path)
+        if previous is None or previous[0] != signature:
+            # Already untouched for `settle` seconds when first seen: written before we looked
+            first_seen = now - self.settle if time.time() - st.st_mtime >= self.settle else now
+            self._pending[path] = previous = (signature, first_seen)
+        return st.st_size > 0 and now - previous[1] >= self.settle
+
+    def scan(self):
+        """Blocks that became ready since the last scan, in block-number order"""
+        now = time.monotonic()
+        ready = []
+        for path in glob.glob(os.path.join(self.folder, self.pattern)):
+            if path in self.seen:
+                continue
+            if self._stable(path, now):
+                self.seen.add(path)
+                self._pending.pop(path, None)
+                ready.append(path)
+        return sorted(ready, key=lambda p: (block_number(p) or 0, p))
+
+    def wait_for(self, path):
+        """Block until a single file (e.g. header.csv) exists and is finished; False if stopped first"""
+        path = str(path)
+        while not self._stop.is_set():
+            if os.path.exists(path) and self._stable(path, time.monotonic()):
+                self._pending.pop(path, None)
+                return True
+            if self.on_idle:
+                self.on_idle()
+            self._stop.wait(self.poll)
+        return False
+
+    def __iter__(self):
+        last_new = time.monotonic()
+        while not self._stop.is_set():
+            ready = self.scan()
+            for path in ready:
+                yield path
+                if self._stop.is_set():
+                    return
+            if ready:
+                last_new = time.monotonic()
+                continue
+            if self.idle_exit and time.monotonic() - last_new >= self.idle_exit:
+                return
+            if self.on_idle:
+                self.on_idle()
+            self._stop.wait(self.poll)
+
+
+def stop_on_signals(watcher):
+    """First SIGINT/SIGTERM stops the watcher after the current block; a second Ctrl-C interrupts"""
+    def handler(signum, frame):
+        print(f"\n{signal.Signals(signum).name}: finishing the current block, then stopping (Ctrl-C again to abort)",
+              flush=True)
+        watcher.stop()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    signal.signal(signal.SIGINT, handler)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, handler)
+
+
+def add_arguments(parser):
+    """--watch and its tuning flags, shared by import-blocks.py and upload-datalake.py"""
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and send each block as soon as the export finishes writing it")
+    parser.add_argument("--settle", type=float, default=SETTLE_SECONDS,
+                        help=f"--watch: seconds a block's size must stay unchanged to count as finished (default: {SETTLE_SECONDS:g})")
+    parser.add_argument("--poll", type=float, default=POLL_INTERVAL,
+                        help=f"--watch: seconds between folder scans (default: {POLL_INTERVAL:g})")
+    parser.add_argument("--idle-exit", type=float, default=0,
+                        help="--watch: exit after this many seconds without a new block (default: 0 = until Ctrl-C)")